@@ -2,33 +2,48 @@
 """
 USD File Analysis Tool for Technical Artists
 """
-from pxr import Usd, UsdGeom
 from pathlib import Path
 
+from src.instrumentation import phase
+
 def analyze_usd_file(filepath: Path):
     """Analyze USD file structure"""
+    from pxr import Usd, UsdGeom
+    from src.analysis.buffers import (
+        array_length, face_size_histogram, mesh_bounds, read_array,
+    )
     print(f"🔍 Analyzing: {filepath.name}")
     print("=" * 50)
     
-    stage = Usd.Stage.Open(str(filepath))
+    with phase("open_stage"):
+        stage = Usd.Stage.Open(str(filepath))
     if not stage:
         print("❌ Could not open file")
         return
     
     # Traverse hierarchy
     print("📁 Scene Hierarchy:")
-    for prim in stage.Traverse():
-        indent = "  " * (len(prim.GetPath().pathString.split('/')) - 2)
-        prim_type = prim.GetTypeName()
-        print(f"{indent}{prim.GetName()} ({prim_type})")
-        
-        # Show mesh details
-        if prim_type == "Mesh":
-            mesh = UsdGeom.Mesh(prim)
-            points = mesh.GetPointsAttr().Get()
-            faces = mesh.GetFaceVertexCountsAttr().Get()
-            if points and faces:
-                print(f"{indent}  └─ Vertices: {len(points)}, Faces: {len(faces)}")
+    with phase("traverse", file=filepath.name) as timer:
+        timer.count(files=1)
+        for prim in stage.Traverse():
+            indent = "  " * (len(prim.GetPath().pathString.split('/')) - 2)
+            prim_type = prim.GetTypeName()
+            print(f"{indent}{prim.GetName()} ({prim_type})")
+            
+            # Show mesh details
+            if prim_type == "Mesh":
+                # NumPy views of the Vt arrays: no per-element conversion
+                mesh = UsdGeom.Mesh(prim)
+                vertices = array_length(mesh.GetPointsAttr())
+                counts = read_array(mesh.GetFaceVertexCountsAttr())
+                if vertices and counts is not None and len(counts):
+                    print(f"{indent}  └─ Vertices: {vertices}, Faces: {len(counts)}")
+                    box = mesh_bounds(mesh)
+                    print(f"{indent}     Bounds: {box[0].tolist()} - {box[1].tolist()}")
+                    sizes = ", ".join(f"{size}-gons: {faces}" for size, faces
+                                      in face_size_histogram(counts).items())
+                    print(f"{indent}     Faces by size: {sizes}")
+                    timer.count(vertices=vertices, faces=len(counts))
     
     # Show layer info
     print(f"\n💾 File Info:")
@@ -40,15 +55,129 @@ def analyze_usd_file(filepath: Path):
     if custom_data:
         print(f"  Metadata: {custom_data}")
 
+def parse_args():
+    import argparse
+    parser = argparse.ArgumentParser(description="Analyze USD files")
+    parser.add_argument("directory", nargs="?", default="my_usd_files")
+    parser.add_argument("--stream", action="store_true",
+                        help="emit one JSON line per file, recursively and concurrently")
+    parser.add_argument("--stats", action="store_true",
+                        help="emit one JSON document of mesh statistics (area, volume, "
+                             "bounds, edge lengths, valence) per file, per directory "
+                             "and in total")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes for --stream/--stats (default: all cores)")
+    parser.add_argument("--output", "-o", default=None,
+                        help="destination for --stream/--stats output (default: stdout)")
+    parser.add_argument("--load-payloads", action="store_true",
+                        help="load payloads instead of opening with LoadNone")
+    parser.add_argument("--mask", nargs="+", default=None,
+                        help="population mask prim paths, e.g. /World")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="DB",
+                        help="incremental SQLite cache (default: <directory>/.usd_analysis.sqlite)")
+    parser.add_argument("--hash", action="store_true",
+                        help="with --cache, compare content hashes when mtime changes")
+    query = parser.add_argument_group("spatial queries (index saved as .<file>.bvh.npz)")
+    query.add_argument("--box", type=float, nargs=6, default=None,
+                       metavar=("X0", "Y0", "Z0", "X1", "Y1", "Z1"),
+                       help="list prims whose world bounds intersect this box")
+    query.add_argument("--ray", type=float, nargs=6, default=None,
+                       metavar=("OX", "OY", "OZ", "DX", "DY", "DZ"),
+                       help="list prims hit by this ray, nearest first")
+    query.add_argument("--nearest", type=float, nargs=3, default=None,
+                       metavar=("X", "Y", "Z"), help="list the prims closest to a point")
+    query.add_argument("-k", type=int, default=5, help="result count for --nearest")
+    return parser.parse_args()
+
+def cached_scan(usd_dir: Path, args):
+    """Refresh the analysis cache and print library-wide aggregates"""
+    from src.analysis.cache import AnalysisCache
+    if args.cache:
+        cache = AnalysisCache(args.cache, args.hash)
+    else:
+        cache = AnalysisCache.for_directory(usd_dir, args.hash)
+    
+    with cache:
+        result = cache.scan(usd_dir, args.jobs, args.load_payloads)
+        totals = cache.totals()
+        print(f"🔍 Scanned {usd_dir}: {result.analyzed} analyzed, "
+              f"{result.unchanged} unchanged, {result.removed} removed "
+              f"({result.seconds:.2f}s)")
+        print(f"📊 {totals['files']} files, {totals['meshes']} meshes, "
+              f"{totals['vertices']} vertices, {totals['faces']} faces, "
+              f"{totals['size_bytes']} bytes")
+        for type_name, count in cache.prim_type_counts().items():
+            print(f"  {type_name}: {count}")
+        if result.failed:
+            print(f"❌ {result.failed} files could not be opened; "
+                  f"they are retried on the next scan")
+
+def spatial_queries(usd_dir: Path, args):
+    """Answer --box/--ray/--nearest for every USD file from its spatial index"""
+    from src.analysis.spatial import load_or_build_index
+    from src.analysis.streaming import iter_usd_files
+    
+    for usd_file in sorted(iter_usd_files(usd_dir)):
+        index = load_or_build_index(usd_file, mask=args.mask)
+        print(f"🔍 {usd_file} ({len(index)} prims indexed)")
+        if args.box:
+            for path in index.query_box(args.box[:3], args.box[3:]):
+                print(f"  box: {path}")
+        if args.ray:
+            for path, distance in index.query_ray(args.ray[:3], args.ray[3:]):
+                print(f"  ray: {path} at {distance:.3f}")
+        if args.nearest:
+            for path, distance in index.nearest(args.nearest, args.k):
+                print(f"  nearest: {path} at {distance:.3f}")
+
+def write_statistics(usd_dir: Path, args):
+    """Library-wide mesh statistics as one JSON document for dashboards"""
+    import json
+    import sys
+    from src.analysis.mesh_stats import library_statistics
+    report = library_statistics(usd_dir, args.jobs, args.load_payloads, args.mask)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        total = report["total"]
+        print(f"📊 {len(report['files'])} files, {total['meshes']} meshes, "
+              f"area {total['area']:.3f}, volume {total['volume']:.3f} -> {args.output}")
+    else:
+        sys.stdout.write(text + "\n")
+
 def main():
     """Analyze all USD files in project"""
-    usd_dir = Path("my_usd_files")
+    args = parse_args()
+    usd_dir = Path(args.directory)
     
     if not usd_dir.exists():
         print("No USD files found. Run create_geometry.py first!")
         return
     
-    usd_files = list(usd_dir.glob("*.usd*"))
+    if args.cache is not None:
+        cached_scan(usd_dir, args)
+        return
+    
+    if args.box or args.ray or args.nearest:
+        spatial_queries(usd_dir, args)
+        return
+    
+    if args.stats:
+        write_statistics(usd_dir, args)
+        return
+    
+    if args.stream:
+        from src.analysis.streaming import stream_analysis
+        if args.output:
+            with open(args.output, "w") as output:
+                stream_analysis(usd_dir, output, args.jobs, args.load_payloads, args.mask)
+        else:
+            stream_analysis(usd_dir, None, args.jobs, args.load_payloads, args.mask)
+        return
+    
+    # Suffix filter skips sidecars such as .usd_analysis.sqlite and *.bvh.npz
+    from src.analysis.streaming import iter_usd_files
+    usd_files = list(iter_usd_files(usd_dir, recursive=False))
     
     for usd_file in usd_files:
         analyze_usd_file(usd_file)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for primitive generation and USD export
+
+Examples:
+    python benchmark_usd.py --output results.json
+    python benchmark_usd.py --save-baseline benchmark_baseline.json
+    python benchmark_usd.py --compare benchmark_baseline.json --threshold 1.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_RESOLUTIONS = [16, 64, 256, 1024, 4096]
+# UV spheres have resolution^2 points; 4096 means 16.8M vertices
+DEFAULT_MAX_SPHERE_RESOLUTION = 1024
+
+def measure(func: Callable[[], object], min_time: float = 0.2,
+            max_repeats: int = 50) -> Dict:
+    """Run ``func`` until ``min_time`` has elapsed (at least 3 times)"""
+    timings = []
+    total = 0.0
+    while len(timings) < 3 or (total < min_time and len(timings) < max_repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+    return {
+        "repeats": len(timings),
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+    }
+
+def quietly(func: Callable[[], object]) -> Callable[[], object]:
+    """Swallow the emoji progress output of the scripts under test"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+def build_cases(resolutions: List[int], max_sphere_resolution: int, workdir: Path,
+                pattern: Optional[str] = None) -> Dict[str, Callable[[], object]]:
+    """Map ``case[resolution]`` names to zero-argument callables
+
+    Only cases whose name contains ``pattern`` are set up, so a filtered run
+    never builds the large spheres and files that the other cases time.
+    """
+    from pxr import Usd, UsdGeom
+    from analyze_usd import analyze_usd_file
+    from create_geometry import TechArtistGeometry
+    from src.exporters.formats import export_layer
+    from src.primitives.basic_shapes import GeometryData, create_cone
+    from src.primitives.vectorized import uv_sphere_arrays
+
+    def wanted(name: str) -> bool:
+        return not pattern or pattern in name
+
+    artist = TechArtistGeometry(str(workdir / "artist"))
+    cases = {}
+    for resolution in resolutions:
+        names = {case: f"{case}[{resolution}]" for case in (
+            "basic_shapes.create_cone", "TechArtistGeometry.create_cone",
+            "TechArtistGeometry.create_sphere", "points.Set.vt", "points.Set.tuples",
+            "save.usda", "save.usdc", "analyze_usd_file.usda", "analyze_usd_file.usdc")}
+        cases[names["basic_shapes.create_cone"]] = (
+            lambda r=resolution: create_cone(r))
+        cases[names["TechArtistGeometry.create_cone"]] = quietly(
+            lambda r=resolution: artist.create_cone(resolution=r, name=f"cone_{r}"))
+        if resolution > max_sphere_resolution:
+            continue
+
+        cases[names["TechArtistGeometry.create_sphere"]] = quietly(
+            lambda r=resolution: artist.create_sphere(resolution=r, name=f"sphere_{r}"))
+
+        # Everything below shares one in-memory sphere; skip it when unused
+        if not any(wanted(name) for case, name in names.items()
+                   if case.startswith(("points.", "save.", "analyze_usd_file."))):
+            continue
+        geometry = GeometryData(*uv_sphere_arrays(resolution))
+        stage = Usd.Stage.CreateInMemory()
+        mesh = UsdGeom.Mesh.Define(stage, "/Sphere")
+        points_attr = mesh.GetPointsAttr()
+        cases[names["points.Set.vt"]] = (
+            lambda g=geometry, a=points_attr, s=stage: a.Set(g.to_vt()[0]))
+        if resolution <= 256 and wanted(names["points.Set.tuples"]):
+            # The pre-vectorization path; too slow to be worth timing above this
+            tuples = [tuple(point) for point in geometry.points.tolist()]
+            cases[names["points.Set.tuples"]] = (
+                lambda t=tuples, a=points_attr, s=stage: a.Set(t))
+
+        points, counts, indices = geometry.to_vt()
+        mesh.GetPointsAttr().Set(points)
+        mesh.GetFaceVertexCountsAttr().Set(counts)
+        mesh.GetFaceVertexIndicesAttr().Set(indices)
+        layer = stage.GetRootLayer()
+        for fmt in ("usda", "usdc"):
+            target = workdir / f"save_{resolution}.{fmt}"
+            cases[names[f"save.{fmt}"]] = (
+                lambda l=layer, t=target, s=stage: export_layer(l, t))
+            if wanted(names[f"analyze_usd_file.{fmt}"]):
+                export_layer(layer, target)
+                cases[names[f"analyze_usd_file.{fmt}"]] = quietly(
+                    lambda t=target: analyze_usd_file(t))
+    return {name: func for name, func in cases.items() if wanted(name)}
+
+def environment() -> Dict:
+    import numpy
+    from pxr import Usd
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "usd": ".".join(str(part) for part in Usd.GetVersion()),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def run_benchmarks(resolutions: List[int], max_sphere_resolution: int,
+                   pattern: Optional[str] = None, min_time: float = 0.2) -> Dict:
+    """Time every case and return a JSON-ready result document"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = build_cases(resolutions, max_sphere_resolution, Path(tmp), pattern)
+        for name, func in cases.items():
+            results[name] = measure(func, min_time)
+            print(f"  {name:<48} {results[name]['median_s'] * 1000:>10.3f} ms",
+                  file=sys.stderr)
+    return {"environment": environment(), "results": results}
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Cases whose median grew by more than ``threshold`` times"""
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if not reference:
+            continue
+        ratio = result["median_s"] / reference["median_s"]
+        if ratio > threshold:
+            regressions.append({"case": name, "ratio": ratio,
+                                "baseline_s": reference["median_s"],
+                                "current_s": result["median_s"]})
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="USD geometry benchmarks")
+    parser.add_argument("--resolutions", type=int, nargs="+", default=DEFAULT_RESOLUTIONS)
+    parser.add_argument("--max-sphere-resolution", type=int,
+                        default=DEFAULT_MAX_SPHERE_RESOLUTION)
+    parser.add_argument("--filter", default=None, help="only run cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds to spend per case")
+    parser.add_argument("--output", "-o", default=None, help="write results JSON here")
+    parser.add_argument("--save-baseline", default=None, metavar="PATH")
+    parser.add_argument("--compare", default=None, metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="fail when median time exceeds baseline by this factor")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+    print("⏱️  USD geometry benchmarks", file=sys.stderr)
+    document = run_benchmarks(args.resolutions, args.max_sphere_resolution,
+                              args.filter, args.min_time)
+
+    for target in (args.output, args.save_baseline):
+        if target:
+            Path(target).write_text(json.dumps(document, indent=2))
+            print(f"💾 Results written to {target}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(document, baseline, args.threshold)
+        for item in regressions:
+            print(f"❌ {item['case']}: {item['ratio']:.2f}x slower "
+                  f"({item['baseline_s'] * 1000:.3f} ms -> "
+                  f"{item['current_s'] * 1000:.3f} ms)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✅ No regressions beyond {args.threshold:.2f}x", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Build a parametric geometry library on every core
+
+Example:
+    python build_library.py cone --resolution 8 16 32 --height 1 2 3 \\
+        --radius 0.5 1.0 --jobs 8
+"""
+import argparse
+from pathlib import Path
+
+from src.exporters.formats import FORMATS, GENERIC, AUTO
+from src.exporters.parallel import PRIMITIVES, export_library, parameter_grid
+from src.primitives.vectorized import SPHERE_TOPOLOGIES
+
+# Primitive kind -> the command-line axes its generator takes
+KIND_AXES = {
+    "cone": ("radius", "height"),
+    "sphere": ("radius", "topology"),
+    "cylinder": ("radius", "height"),
+    "capsule": ("radius", "height"),
+    "disc": ("radius",),
+    "torus": ("major_radius", "minor_radius"),
+    "plane": ("width",),
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("kind", choices=sorted(PRIMITIVES))
+    parser.add_argument("--resolution", type=int, nargs="+", default=[16])
+    parser.add_argument("--radius", type=float, nargs="+", default=[1.0],
+                        help="cone, sphere, cylinder, capsule and disc")
+    parser.add_argument("--height", type=float, nargs="+", default=[2.0],
+                        help="cone, cylinder and capsule")
+    parser.add_argument("--major-radius", type=float, nargs="+", default=[1.0],
+                        help="torus only")
+    parser.add_argument("--minor-radius", type=float, nargs="+", default=[0.25],
+                        help="torus only")
+    parser.add_argument("--width", type=float, nargs="+", default=[2.0], help="plane only")
+    parser.add_argument("--topology", nargs="+", default=["uv"],
+                        choices=SPHERE_TOPOLOGIES, help="sphere only")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=256,
+                        help="variants per output file")
+    parser.add_argument("--format", default="usdc", choices=FORMATS + (GENERIC, AUTO))
+    parser.add_argument("--output-dir", default="my_usd_files/library")
+    parser.add_argument("--no-merge", action="store_true",
+                        help="skip the referencing library asset")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    axes = {"resolution": args.resolution}
+    for name in KIND_AXES[args.kind]:
+        axes[name] = getattr(args, name)
+    grid = parameter_grid(**axes)
+
+    print(f"🏭 Building {len(grid)} {args.kind} variants")
+    result = export_library(args.kind, grid, Path(args.output_dir), jobs=args.jobs,
+                            chunk_size=args.chunk_size, output_format=args.format,
+                            merge=not args.no_merge)
+
+    print(f"✅ {result.variants} variants in {len(result.files)} files "
+          f"({result.seconds:.2f}s on {result.jobs} workers, "
+          f"{result.variants / result.seconds:.0f} variants/s)")
+    if result.merged:
+        print(f"📦 Library asset: {result.merged}")
+
+if __name__ == "__main__":
+    main()
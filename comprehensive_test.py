@@ -2,10 +2,14 @@
 """
 Comprehensive USD geometry workflow test
 """
+import os
 import sys
 from pathlib import Path
 import subprocess
 
+# usda, usdc or usdz for every file these checks write
+OUTPUT_FORMAT = os.environ.get("USD_OUTPUT_FORMAT", "usda")
+
 def test_usd_imports():
     """Test all USD module imports"""
     print("🔧 USD Import Test")
@@ -33,13 +37,14 @@ def test_geometry_creation():
     
     try:
         from pxr import Usd, UsdGeom
-        import math
+        from src.exporters.formats import save_stage
+        from src.primitives.vectorized import icosphere_arrays, to_vt
         
         # Test 1: Cone creation
         output_dir = Path("test_output")
         output_dir.mkdir(exist_ok=True)
         
-        stage = Usd.Stage.CreateNew(str(output_dir / "test_cone.usda"))
+        stage = Usd.Stage.CreateInMemory()
         mesh = UsdGeom.Mesh.Define(stage, '/TestCone')
         
         # Create simple cone
@@ -51,38 +56,22 @@ def test_geometry_creation():
         mesh.GetFaceVertexCountsAttr().Set(face_counts)
         mesh.GetFaceVertexIndicesAttr().Set(face_indices)
         
-        stage.GetRootLayer().Save()
+        save_stage(stage, output_dir / f"test_cone.{OUTPUT_FORMAT}")
         print("✅ Cone geometry: Created and saved")
         
         # Test 2: Sphere approximation
-        stage2 = Usd.Stage.CreateNew(str(output_dir / "test_sphere.usda"))
+        stage2 = Usd.Stage.CreateInMemory()
         sphere_mesh = UsdGeom.Mesh.Define(stage2, '/TestSphere')
         
-        # Create icosahedron (simple sphere approximation)
-        # Golden ratio
-        phi = (1 + math.sqrt(5)) / 2
-        
-        # Icosahedron vertices
-        ico_points = [
-            (-1, phi, 0), (1, phi, 0), (-1, -phi, 0), (1, -phi, 0),
-            (0, -1, phi), (0, 1, phi), (0, -1, -phi), (0, 1, -phi),
-            (phi, 0, -1), (phi, 0, 1), (-phi, 0, -1), (-phi, 0, 1)
-        ]
-        
-        # Normalize vertices to unit sphere
-        ico_points = [(x/math.sqrt(x*x + y*y + z*z), 
-                       y/math.sqrt(x*x + y*y + z*z), 
-                       z/math.sqrt(x*x + y*y + z*z)) for x, y, z in ico_points]
-        
-        # Simple triangular faces (subset for demo)
-        ico_face_counts = [3, 3, 3, 3]
-        ico_face_indices = [0,5,11, 0,1,5, 0,7,1, 0,10,7]
+        # Create icosahedron (all 20 faces, unit sphere)
+        ico_points, ico_face_counts, ico_face_indices = to_vt(*icosphere_arrays(0))
         
         sphere_mesh.GetPointsAttr().Set(ico_points)
         sphere_mesh.GetFaceVertexCountsAttr().Set(ico_face_counts)
         sphere_mesh.GetFaceVertexIndicesAttr().Set(ico_face_indices)
+        sphere_mesh.CreateOrientationAttr().Set("leftHanded")
         
-        stage2.GetRootLayer().Save()
+        save_stage(stage2, output_dir / f"test_sphere.{OUTPUT_FORMAT}")
         print("✅ Sphere geometry: Created and saved")
         
         return True
@@ -98,12 +87,13 @@ def test_file_operations():
     
     try:
         from pxr import Usd
+        from src.exporters.formats import save_stage
         
         output_dir = Path("test_output")
-        test_file = output_dir / "file_ops_test.usda"
+        test_file = output_dir / f"file_ops_test.{OUTPUT_FORMAT}"
         
         # Create stage
-        stage = Usd.Stage.CreateNew(str(test_file))
+        stage = Usd.Stage.CreateInMemory()
         
         # Add some hierarchy
         from pxr import UsdGeom
@@ -111,8 +101,8 @@ def test_file_operations():
         group1 = UsdGeom.Xform.Define(stage, '/World/Group1')
         
         # Save
-        stage.GetRootLayer().Save()
-        print(f"✅ File creation: {test_file}")
+        report = save_stage(stage, test_file)
+        print(f"✅ File creation: {report.summary()}")
         
         # Test reopening
         stage2 = Usd.Stage.Open(str(test_file))
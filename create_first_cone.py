@@ -2,19 +2,21 @@
 """
 Your first USD geometry creation - working immediately!
 """
-from pxr import Usd, UsdGeom
 import math
 from pathlib import Path
 
-def create_cone_usd():
-    """Create a cone and export to USD"""
+from src.exporters.formats import AUTO, resolve_path, save_stage
+
+def create_cone_usd(output_format: str = AUTO):
+    """Create a cone and export to USD (usda, usdc, usdz or auto)"""
+    from pxr import Usd, UsdGeom
     
     # Create output directory
     output_dir = Path("my_usd_files")
     output_dir.mkdir(exist_ok=True)
     
     # Create USD stage
-    stage = Usd.Stage.CreateNew(str(output_dir / "cone.usda"))
+    stage = Usd.Stage.CreateInMemory()
     
     # Create cone geometry
     cone_mesh = UsdGeom.Mesh.Define(stage, '/Cone')
@@ -52,11 +54,15 @@ def create_cone_usd():
     cone_mesh.CreateOrientationAttr().Set("leftHanded")
     
     # Save the stage
-    stage.GetRootLayer().Save()
+    filepath = resolve_path(output_dir / "cone", output_format, len(points))
+    report = save_stage(stage, filepath)
     
-    print(f"✅ Cone created: {output_dir / 'cone.usda'}")
+    print(f"✅ Cone created: {filepath}")
+    print(f"💾 Size: {report.size_bytes} bytes, written in "
+          f"{report.write_seconds * 1000:.1f} ms")
     print(f"📊 Vertices: {len(points)}")
     print(f"📐 Faces: {len(face_vertex_counts)}")
 
 if __name__ == "__main__":
-    create_cone_usd()
+    import sys
+    create_cone_usd(sys.argv[1] if len(sys.argv) > 1 else AUTO)
@@ -1,124 +1,256 @@
 #!/usr/bin/env python3
 """
 Technical Artist USD Geometry Creation Suite
+
+pxr and the USD exporters are imported where a stage is built, so the
+geometry math (and --help) loads without the plugin registry
 """
-from pxr import Usd, UsdGeom, Gf
 from pathlib import Path
-import math
-from typing import List, Tuple, Dict
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional
+
+from src.exporters.formats import (
+    AUTO, USDC_POINT_THRESHOLD, ExportReport, resolve_format, resolve_path, save_stage,
+)
+from src.instrumentation import phase
+from src.primitives.derived import extent, mesh_normals, sphere_normals
+from src.primitives.vectorized import (
+    GENERATORS, SUBDIVISION_SCHEMES, cone_arrays, sphere_arrays, to_vt,
+)
+
+if TYPE_CHECKING:
+    from pxr import Usd, UsdGeom
 
 class TechArtistGeometry:
     """Professional geometry creation for technical artists"""
     
-    def __init__(self, output_dir: str = "my_usd_files"):
+    def __init__(self, output_dir: str = "my_usd_files", output_format: str = AUTO,
+                 usdc_threshold: int = USDC_POINT_THRESHOLD, payloads: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        # usda / usdc / usdz, or "auto": usdc above usdc_threshold points
+        self.output_format = output_format
+        self.usdc_threshold = usdc_threshold
+        # Meshes go to per-asset payload layers under a light interface layer
+        self.payloads = payloads
+        self.reports: List[ExportReport] = []
         
-    def create_cone(self, resolution: int = 16, height: float = 2.0, 
-                   radius: float = 1.0, name: str = "cone") -> Path:
-        """Create professional cone geometry"""
-        filepath = self.output_dir / f"{name}.usda"
-        stage = Usd.Stage.CreateNew(str(filepath))
-        
-        # Create hierarchy
-        world = UsdGeom.Xform.Define(stage, '/World')
-        mesh = UsdGeom.Mesh.Define(stage, f'/World/{name.title()}')
-        
-        # Generate vertices
-        points = []
-        # Base circle
-        for i in range(resolution):
-            angle = 2 * math.pi * i / resolution
-            x = radius * math.cos(angle)
-            z = radius * math.sin(angle)
-            points.append((x, 0, z))
-        
-        # Apex
-        points.append((0, height, 0))
-        
-        # Generate faces
-        face_vertex_counts = []
-        face_vertex_indices = []
-        
-        # Side faces
-        for i in range(resolution):
-            next_i = (i + 1) % resolution
-            face_vertex_indices.extend([i, next_i, resolution])
-            face_vertex_counts.append(3)
-        
-        # Base face (optional)
-        base_indices = list(reversed(range(resolution)))
-        face_vertex_indices.extend(base_indices)
-        face_vertex_counts.append(resolution)
-        
-        # Apply to mesh
-        mesh.GetPointsAttr().Set(points)
-        mesh.GetFaceVertexCountsAttr().Set(face_vertex_counts)
-        mesh.GetFaceVertexIndicesAttr().Set(face_vertex_indices)
-        
-        # Professional USD attributes
-        mesh.CreateOrientationAttr().Set("leftHanded")
-        mesh.CreateSubdivisionSchemeAttr().Set("none")
-        
-        # Add metadata for technical artists
-        stage.GetRootLayer().customLayerData = {
-            'creator': 'Technical Artist USD Toolkit',
-            'geometry_type': 'cone',
-            'parameters': {
-                'resolution': resolution,
-                'height': height,
-                'radius': radius
-            }
-        }
-        
-        stage.GetRootLayer().Save()
-        print(f"✅ Created: {filepath}")
+    def _save(self, stage: "Usd.Stage", name: str, num_points: int) -> Path:
+        """Write the stage in the configured format and record the cost"""
+        if self.payloads:
+            return self._save_with_payloads(stage, name, num_points)
+        filepath = resolve_path(self.output_dir / name, self.output_format,
+                                num_points, self.usdc_threshold)
+        report = save_stage(stage, filepath)
+        self.reports.append(report)
+        print(f"✅ Created: {filepath} ({report.size_bytes / 1024:.1f} KB, "
+              f"{report.write_seconds * 1000:.1f} ms)")
         return filepath
     
-    def create_sphere(self, resolution: int = 20, radius: float = 1.0, 
-                     name: str = "sphere") -> Path:
-        """Create UV sphere geometry"""
-        filepath = self.output_dir / f"{name}.usda"
-        stage = Usd.Stage.CreateNew(str(filepath))
-        
-        mesh = UsdGeom.Mesh.Define(stage, f'/World/{name.title()}')
+    def _save_with_payloads(self, stage: "Usd.Stage", name: str, num_points: int) -> Path:
+        """Interface layer sized by its own content, payloads by the mesh size"""
+        from src.exporters.payload import export_with_payloads
+        filepath = resolve_path(self.output_dir / name, self.output_format, 0,
+                                self.usdc_threshold)
+        payload_format = resolve_format(self.output_format, num_points,
+                                        self.usdc_threshold)
+        report = export_with_payloads(stage.GetRootLayer(), filepath, payload_format)
+        self.reports.extend([report.interface] + report.payloads)
+        print(f"✅ Created: {filepath} ({report.summary()})")
+        return filepath
+    
+    def _author_bounds_and_normals(self, mesh: "UsdGeom.Mesh", points,
+                                   normals: Optional[Tuple] = None):
+        """Precomputed extent and optional (normals, interpolation), so
+        readers skip point scans"""
+        from pxr import Vt
+        mesh.CreateExtentAttr().Set(Vt.Vec3fArray.FromNumpy(extent(points)))
+        if normals is not None:
+            values, interpolation = normals
+            mesh.CreateNormalsAttr().Set(Vt.Vec3fArray.FromNumpy(values))
+            mesh.SetNormalsInterpolation(interpolation)
+    
+    def _author_extents_hint(self, world: "UsdGeom.Xform"):
+        """extentsHint on /World from the authored child extents"""
+        from pxr import Usd, UsdGeom
+        bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_])
+        model = UsdGeom.ModelAPI.Apply(world.GetPrim())
+        model.SetExtentsHint(model.ComputeExtentsHint(bbox_cache))
         
-        points = []
-        face_vertex_counts = []
-        face_vertex_indices = []
+    def create_cone(self, resolution: int = 16, height: float = 2.0, 
+                   radius: float = 1.0, name: str = "cone",
+                   normals: Optional[str] = "faceted") -> Path:
+        """Create professional cone geometry
         
-        # Generate sphere vertices
-        for v in range(resolution + 1):  # Vertical
-            for u in range(resolution):  # Horizontal
-                theta = math.pi * v / resolution  # 0 to pi
-                phi = 2 * math.pi * u / resolution  # 0 to 2pi
+        normals: "faceted" (per face), "smooth" (per vertex) or None
+        """
+        from pxr import Usd, UsdGeom
+        with phase("create_cone", resolution=resolution) as timer:
+            stage = Usd.Stage.CreateInMemory()
+            
+            # Create hierarchy
+            world = UsdGeom.Xform.Define(stage, '/World')
+            mesh = UsdGeom.Mesh.Define(stage, f'/World/{name.title()}')
+            
+            # Generate vertices and faces (side triangles plus base N-gon)
+            with phase("generate"):
+                arrays = cone_arrays(resolution, height, radius)
+                # Non-uniform scale changes cone normals, so they are not cached
+                normal_data = mesh_normals(*arrays, mode=normals) if normals else None
+            with phase("convert"):
+                points, face_vertex_counts, face_vertex_indices = to_vt(*arrays)
+            timer.count(vertices=len(points), faces=len(face_vertex_counts))
+            
+            # Apply to mesh
+            with phase("author"):
+                mesh.GetPointsAttr().Set(points)
+                mesh.GetFaceVertexCountsAttr().Set(face_vertex_counts)
+                mesh.GetFaceVertexIndicesAttr().Set(face_vertex_indices)
                 
-                x = radius * math.sin(theta) * math.cos(phi)
-                y = radius * math.cos(theta)
-                z = radius * math.sin(theta) * math.sin(phi)
-                points.append((x, y, z))
-        
-        # Generate faces
-        for v in range(resolution):
-            for u in range(resolution):
-                # Current vertex indices
-                current = v * resolution + u
-                next_u = v * resolution + (u + 1) % resolution
-                next_v = (v + 1) * resolution + u
-                next_both = (v + 1) * resolution + (u + 1) % resolution
+                # Professional USD attributes
+                mesh.CreateOrientationAttr().Set("leftHanded")
+                mesh.CreateSubdivisionSchemeAttr().Set("none")
+                self._author_bounds_and_normals(mesh, arrays[0], normal_data)
+                self._author_extents_hint(world)
                 
-                # Create quad as two triangles
-                face_vertex_indices.extend([current, next_v, next_both, next_u])
-                face_vertex_counts.append(4)
+                # Add metadata for technical artists
+                stage.GetRootLayer().customLayerData = {
+                    'creator': 'Technical Artist USD Toolkit',
+                    'geometry_type': 'cone',
+                    'parameters': {
+                        'resolution': resolution,
+                        'height': height,
+                        'radius': radius
+                    }
+                }
+            
+            return self._save(stage, name, len(points))
+    
+    def create_sphere(self, resolution: int = 20, radius: float = 1.0, 
+                     name: str = "sphere", topology: str = "uv",
+                     normals: Optional[str] = "smooth") -> Path:
+        """Create sphere geometry
         
-        mesh.GetPointsAttr().Set(points)
-        mesh.GetFaceVertexCountsAttr().Set(face_vertex_counts)
-        mesh.GetFaceVertexIndicesAttr().Set(face_vertex_indices)
-        mesh.CreateOrientationAttr().Set("leftHanded")
+        topology: "uv" (original grid), "poles" (single pole vertices with
+        triangle-fan caps), "ico" (geodesic) or "cube" (quad sphere);
+        normals: "smooth" (per vertex), "faceted" (per face) or None
+        """
+        from pxr import Usd, UsdGeom
+        with phase("create_sphere", resolution=resolution, topology=topology) as timer:
+            stage = Usd.Stage.CreateInMemory()
+            
+            world = UsdGeom.Xform.Define(stage, '/World')
+            mesh = UsdGeom.Mesh.Define(stage, f'/World/{name.title()}')
+            
+            # Generate sphere vertices and faces
+            with phase("generate"):
+                arrays = sphere_arrays(resolution, radius, topology)
+                normal_data = (sphere_normals(resolution, topology, normals)
+                               if normals else None)
+            with phase("convert"):
+                points, face_vertex_counts, face_vertex_indices = to_vt(*arrays)
+            timer.count(vertices=len(points), faces=len(face_vertex_counts))
+            
+            with phase("author"):
+                mesh.GetPointsAttr().Set(points)
+                mesh.GetFaceVertexCountsAttr().Set(face_vertex_counts)
+                mesh.GetFaceVertexIndicesAttr().Set(face_vertex_indices)
+                mesh.CreateOrientationAttr().Set("leftHanded")
+                self._author_bounds_and_normals(mesh, arrays[0], normal_data)
+                self._author_extents_hint(world)
+            
+            return self._save(stage, name, len(points))
+
+    def create_surface(self, kind: str = "torus", resolution: int = 32,
+                       name: Optional[str] = None, normals: Optional[str] = "smooth",
+                       **params) -> Path:
+        """Create any primitive from the shared generators
         
-        stage.GetRootLayer().Save()
-        print(f"✅ Created: {filepath}")
-        return filepath
+        kind: cylinder, torus, capsule, disc, plane (or cone, sphere);
+        params go to the generator, e.g. major_radius=2.0 for a torus
+        """
+        from pxr import Usd, UsdGeom
+        if kind not in GENERATORS:
+            raise ValueError(f"Unknown primitive {kind!r}; expected one of {sorted(GENERATORS)}")
+        name = name or kind
+        with phase("create_surface", kind=kind, resolution=resolution) as timer:
+            stage = Usd.Stage.CreateInMemory()
+            world = UsdGeom.Xform.Define(stage, '/World')
+            mesh = UsdGeom.Mesh.Define(stage, f'/World/{name.title()}')
+            
+            with phase("generate"):
+                arrays = GENERATORS[kind](resolution, **params)
+                normal_data = mesh_normals(*arrays, mode=normals) if normals else None
+            with phase("convert"):
+                points, face_vertex_counts, face_vertex_indices = to_vt(*arrays)
+            timer.count(vertices=len(points), faces=len(face_vertex_counts))
+            
+            with phase("author"):
+                mesh.GetPointsAttr().Set(points)
+                mesh.GetFaceVertexCountsAttr().Set(face_vertex_counts)
+                mesh.GetFaceVertexIndicesAttr().Set(face_vertex_indices)
+                mesh.CreateOrientationAttr().Set("leftHanded")
+                if SUBDIVISION_SCHEMES[kind] is not None:
+                    mesh.CreateSubdivisionSchemeAttr().Set(SUBDIVISION_SCHEMES[kind])
+                self._author_bounds_and_normals(mesh, arrays[0], normal_data)
+                self._author_extents_hint(world)
+                stage.GetRootLayer().customLayerData = {
+                    'creator': 'Technical Artist USD Toolkit',
+                    'geometry_type': kind,
+                    'parameters': dict(params, resolution=resolution),
+                }
+            
+            return self._save(stage, name, len(points))
+    
+    def create_lod(self, kind: str = "sphere", resolution: int = 64, levels: int = 4,
+                   ratio: float = 0.5, name: str = "lod", mode: str = "variants",
+                   **params) -> Path:
+        """Create a level-of-detail chain on one prim
+        
+        mode "variants" authors a `lod` variant set (lod0 = finest);
+        mode "purpose" authors render and proxy children
+        """
+        from pxr import Usd, UsdGeom
+        from src.exporters.lod import author_lod
+        with phase("create_lod", kind=kind, resolution=resolution) as timer:
+            stage = Usd.Stage.CreateInMemory()
+            world = UsdGeom.Xform.Define(stage, '/World')
+            stage.SetDefaultPrim(world.GetPrim())
+            
+            with phase("author"):
+                prim = author_lod(stage, f'/World/{name.title()}', kind, resolution,
+                                  levels, ratio, mode, **params)
+                self._author_extents_hint(world)
+            points = prim.GetCustomDataByKey("lod")["points"]
+            timer.count(vertices=sum(points))
+            
+            stage.GetRootLayer().customLayerData = {
+                'creator': 'Technical Artist USD Toolkit',
+                'geometry_type': kind,
+                'parameters': dict(params, resolution=resolution, levels=levels,
+                                   ratio=ratio, mode=mode),
+            }
+            return self._save(stage, name, max(points))
+    
+    def create_animated(self, kind: str = "sphere", frames: int = 100,
+                        resolution: int = 16, name: str = "animated",
+                        clip_frames: Optional[int] = None, fps: float = 24.0,
+                        **curves) -> Path:
+        """Create a deforming primitive from per-frame parameter curves
+        
+        curves: e.g. radius=[...] with one value per frame (or a scalar);
+        clip_frames splits the samples into value clips of that many frames
+        """
+        from src.exporters.animation import export_animation
+        with phase("create_animated", kind=kind, resolution=resolution) as timer:
+            report = export_animation(self.output_dir / name, kind, frames, resolution,
+                                      fps=fps, clip_frames=clip_frames,
+                                      output_format=self.output_format,
+                                      name=name.title(), **curves)
+            timer.count(frames=frames, samples=report.samples)
+        self.reports.extend(report.exports)
+        print(f"✅ Created: {report.path} ({report.frames} frames, "
+              f"{report.size_bytes / 1024:.1f} KB, {report.seconds * 1000:.1f} ms)")
+        return report.path
 
 def main():
     """Demo for technical artists"""
@@ -130,6 +262,7 @@ def main():
     # Create various geometries
     cone_file = artist.create_cone(resolution=24, height=3.0, name="detailed_cone")
     sphere_file = artist.create_sphere(resolution=16, name="smooth_sphere")
+    torus_file = artist.create_surface("torus", resolution=48, minor_radius=0.3)
     
     print(f"\n📁 Geometry created in: {artist.output_dir}")
     print("🔧 Ready for Maya/Houdini import!")
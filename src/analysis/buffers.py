@@ -0,0 +1,129 @@
+"""
+Memory-flat mesh buffer readers
+Array attributes go straight from Vt into NumPy through the buffer protocol:
+no per-element Python objects, and crate (.usdc) float arrays such as points
+stay read-only views of the memory-mapped file. Crate stores integer arrays
+compressed, so counts and indices are decompressed once, still without a copy
+"""
+from pxr import Usd, UsdGeom
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+# Rows per block when a statistic needs temporaries the size of its input
+CHUNK_ROWS = 1 << 18
+
+# The first time sample if any are authored (samples win over a default at
+# every time), otherwise the default value
+FIRST_VALUE = Usd.TimeCode.EarliestTime()
+
+
+@dataclass
+class MeshBuffers:
+    """Read-only NumPy views of one mesh's points, counts and indices"""
+    path: str
+    points: np.ndarray
+    counts: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def num_points(self) -> int:
+        return len(self.points)
+
+    @property
+    def num_faces(self) -> int:
+        return len(self.counts)
+
+
+def read_array(attr: Usd.Attribute, time=FIRST_VALUE) -> Optional[np.ndarray]:
+    """Attribute value as a read-only NumPy view, or None if unauthored"""
+    if not attr or not attr.HasAuthoredValue():
+        return None
+    value = attr.Get(time)
+    if value is None:
+        return None
+    array = np.asarray(value)
+    # The view aliases the Vt array (and for crate, the mapped file)
+    array.flags.writeable = False
+    return array
+
+
+def array_length(attr: Usd.Attribute, time=FIRST_VALUE) -> int:
+    """Length of an array attribute, 0 if unauthored
+
+    USD has no size-only query, so this is a full Get(): crate integer
+    arrays are decompressed, but no per-element Python objects are made.
+    """
+    if not attr or not attr.HasAuthoredValue():
+        return 0
+    value = attr.Get(time)
+    return 0 if value is None else len(value)
+
+
+def mesh_buffers(mesh: UsdGeom.Mesh, time=FIRST_VALUE) -> MeshBuffers:
+    """Points, counts and indices of ``mesh``; missing arrays come back empty"""
+    def read(attr, shape, dtype):
+        array = read_array(attr, time)
+        return np.empty(shape, dtype) if array is None else array
+
+    return MeshBuffers(str(mesh.GetPath()),
+                       read(mesh.GetPointsAttr(), (0, 3), np.float32),
+                       read(mesh.GetFaceVertexCountsAttr(), 0, np.int32),
+                       read(mesh.GetFaceVertexIndicesAttr(), 0, np.int32))
+
+
+def iter_mesh_buffers(stage: Usd.Stage, time=FIRST_VALUE) -> Iterator[MeshBuffers]:
+    """Buffers of every Mesh, one at a time so only one mesh is paged in"""
+    for prim in stage.Traverse():
+        if prim.IsA(UsdGeom.Mesh):
+            yield mesh_buffers(UsdGeom.Mesh(prim), time)
+
+
+def iter_chunks(array: np.ndarray, rows: int = CHUNK_ROWS) -> Iterator[np.ndarray]:
+    """Consecutive row blocks of ``array`` as views"""
+    for start in range(0, len(array), rows):
+        yield array[start:start + rows]
+
+
+def bounds(points: np.ndarray) -> Optional[np.ndarray]:
+    """``[min, max]`` rows of ``points``; reductions allocate nothing per point"""
+    if not len(points):
+        return None
+    return np.stack([points.min(axis=0), points.max(axis=0)])
+
+
+def mesh_bounds(mesh: UsdGeom.Mesh, time=FIRST_VALUE) -> Optional[np.ndarray]:
+    """Authored extent if there is one, otherwise the bounds of the points
+
+    The extent is two points, so most meshes never page their points in.
+    """
+    extent = read_array(mesh.GetExtentAttr(), time)
+    if extent is not None and len(extent) == 2:
+        return extent
+    points = read_array(mesh.GetPointsAttr(), time)
+    return None if points is None else bounds(points)
+
+
+def axis_histogram(points: np.ndarray, axis: int = 1, bins: int = 32,
+                   rows: int = CHUNK_ROWS) -> Dict[str, list]:
+    """Point distribution along one axis, accumulated block by block"""
+    box = bounds(points)
+    if box is None:
+        return {"edges": [], "counts": []}
+    lower, upper = float(box[0, axis]), float(box[1, axis])
+    if upper <= lower:
+        upper = lower + 1.0
+    counts = np.zeros(bins, dtype=np.int64)
+    for block in iter_chunks(points, rows):
+        counts += np.histogram(block[:, axis], bins, (lower, upper))[0]
+    return {"edges": np.linspace(lower, upper, bins + 1).tolist(), "counts": counts.tolist()}
+
+
+def face_size_histogram(counts: np.ndarray) -> Dict[int, int]:
+    """``{corners: faces}``, e.g. ``{3: 24, 24: 1}`` for a capped cone"""
+    if not len(counts):
+        return {}
+    tally = np.bincount(counts)
+    sizes = np.flatnonzero(tally)
+    return dict(zip(sizes.tolist(), tally[sizes].tolist()))
@@ -0,0 +1,228 @@
+"""
+Incremental analysis cache backed by SQLite
+Per-file stats are keyed by path, size, mtime and an optional content hash,
+so repeated scans only re-open files that actually changed
+"""
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .streaming import iter_summaries, iter_usd_files
+
+DEFAULT_DB_NAME = ".usd_analysis.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT,
+    analyzed_at REAL NOT NULL,
+    prims INTEGER NOT NULL DEFAULT 0,
+    vertices INTEGER NOT NULL DEFAULT 0,
+    faces INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    custom_layer_data TEXT
+);
+CREATE TABLE IF NOT EXISTS prims (
+    file TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    prim_path TEXT NOT NULL,
+    type_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meshes (
+    file TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    prim_path TEXT NOT NULL,
+    vertices INTEGER NOT NULL,
+    faces INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prims_by_file ON prims(file);
+CREATE INDEX IF NOT EXISTS meshes_by_file ON meshes(file);
+"""
+
+
+@dataclass
+class ScanResult:
+    """What a cached scan had to do; ``failed`` files were analyzed but not cached"""
+    analyzed: int
+    unchanged: int
+    removed: int
+    seconds: float
+    failed: int = 0
+
+
+def file_sha256(filepath, chunk_size: int = 1 << 20) -> str:
+    """Content hash read in chunks so large crate files stay out of memory"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Persistent per-file analysis results with aggregate queries
+
+    ``hash_contents=True`` additionally checks a SHA-256 when size or mtime
+    changed, so files that were merely touched are not re-analyzed.
+    """
+
+    def __init__(self, db_path, hash_contents: bool = False):
+        self.db_path = Path(db_path)
+        self.hash_contents = hash_contents
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def for_directory(cls, directory, hash_contents: bool = False) -> "AnalysisCache":
+        """Cache stored alongside the files it describes"""
+        return cls(Path(directory) / DEFAULT_DB_NAME, hash_contents)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "AnalysisCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _check(self, filepath: Path) -> Tuple[bool, os.stat_result, Optional[str]]:
+        """``(current, stat, sha256)`` taken before any analysis of the file
+
+        Storing this key rather than one taken afterwards means a file that
+        changes mid-scan is picked up again by the next scan. The hash is
+        computed at most once per file and is None without ``hash_contents``.
+        """
+        stat = filepath.stat()
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, sha256 FROM files WHERE path = ?",
+            (str(filepath),)).fetchone()
+        if row is not None and (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns):
+            return True, stat, row[2]
+        digest = file_sha256(filepath) if self.hash_contents else None
+        if row is not None and digest and row[2] == digest:
+            # Touched but identical: refresh the key, keep the stats
+            self.connection.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                (stat.st_size, stat.st_mtime_ns, str(filepath)))
+            return True, stat, digest
+        return False, stat, digest
+
+    def store(self, summary: Dict, stat: Optional[os.stat_result] = None,
+              digest: Optional[str] = None):
+        """Insert or replace the cached stats for one summarized file
+
+        ``stat`` and ``digest`` should be taken before the file was analyzed
+        (see scan()); without them the file is read again now. A summary
+        carrying an ``error`` only drops the file's old row, so the next
+        scan retries it instead of trusting a cached failure.
+        """
+        filepath = Path(summary["path"])
+        if summary.get("error"):
+            with self.connection:
+                self.connection.execute("DELETE FROM files WHERE path = ?",
+                                        (str(filepath),))
+            return
+        if stat is None:
+            stat = filepath.stat()
+        if digest is None and self.hash_contents:
+            digest = file_sha256(filepath)
+        with self.connection:
+            self.connection.execute("DELETE FROM files WHERE path = ?", (str(filepath),))
+            self.connection.execute(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(filepath), stat.st_size, stat.st_mtime_ns, digest, time.time(),
+                 summary.get("prims", 0), summary.get("vertices", 0),
+                 summary.get("faces", 0), summary.get("error"),
+                 json.dumps(summary.get("custom_layer_data", {}), default=str)))
+            self.connection.executemany(
+                "INSERT INTO prims VALUES (?, ?, ?)",
+                [(str(filepath), path, type_name)
+                 for path, type_name in summary.get("hierarchy", [])])
+            self.connection.executemany(
+                "INSERT INTO meshes VALUES (?, ?, ?, ?)",
+                [(str(filepath), mesh["path"], mesh["vertices"], mesh["faces"])
+                 for mesh in summary.get("meshes", [])])
+
+    def scan(self, directory, jobs: Optional[int] = None,
+             load_payloads: bool = False) -> ScanResult:
+        """Bring the cache up to date with every USD file under ``directory``"""
+        start = time.perf_counter()
+        directory = Path(directory).resolve()
+        seen = set()
+        stale: List[Path] = []
+        keys: Dict[str, Tuple[os.stat_result, Optional[str]]] = {}
+        for filepath in iter_usd_files(directory):
+            try:
+                current, stat, digest = self._check(filepath)
+            except FileNotFoundError:
+                continue  # deleted since the walk; forgotten below
+            seen.add(str(filepath))
+            if not current:
+                stale.append(filepath)
+                keys[str(filepath)] = (stat, digest)
+        self.connection.commit()
+
+        failed = 0
+        for summary in iter_summaries(stale, jobs, load_payloads=load_payloads,
+                                      hierarchy=True):
+            self.store(summary, *keys[summary["path"]])
+            failed += bool(summary.get("error"))
+
+        removed = self._forget_missing(directory, seen)
+        return ScanResult(len(stale), len(seen) - len(stale), removed,
+                          time.perf_counter() - start, failed)
+
+    def _forget_missing(self, directory: Path, seen: Iterable[str]) -> int:
+        prefix = str(directory).rstrip("/") + "/"
+        cached = [row[0] for row in self.connection.execute(
+            "SELECT path FROM files WHERE substr(path, 1, ?) = ?",
+            (len(prefix), prefix))]
+        missing = [(path,) for path in cached if path not in seen]
+        with self.connection:
+            self.connection.executemany("DELETE FROM files WHERE path = ?", missing)
+        return len(missing)
+
+    def totals(self) -> Dict[str, int]:
+        """Library-wide file, prim, mesh, vertex and face counts"""
+        files, size, prims, vertices, faces = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(prims), 0), "
+            "COALESCE(SUM(vertices), 0), COALESCE(SUM(faces), 0) FROM files").fetchone()
+        meshes = self.connection.execute("SELECT COUNT(*) FROM meshes").fetchone()[0]
+        return {"files": files, "size_bytes": size, "prims": prims, "meshes": meshes,
+                "vertices": vertices, "faces": faces}
+
+    def prim_type_counts(self) -> Dict[str, int]:
+        """How many prims of each type exist across the library"""
+        return dict(self.connection.execute(
+            "SELECT type_name, COUNT(*) FROM prims GROUP BY type_name "
+            "ORDER BY COUNT(*) DESC"))
+
+    def largest_meshes(self, limit: int = 10) -> List[Dict]:
+        """Meshes with the most vertices across the library"""
+        rows = self.connection.execute(
+            "SELECT file, prim_path, vertices, faces FROM meshes "
+            "ORDER BY vertices DESC LIMIT ?", (limit,))
+        return [{"file": file, "path": path, "vertices": vertices, "faces": faces}
+                for file, path, vertices, faces in rows]
+
+    def file_stats(self, filepath) -> Optional[Dict]:
+        """Cached stats for one file, or None if it has not been scanned"""
+        # Rows are keyed by the absolute paths scan() walked
+        filepath = Path(filepath).resolve()
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, prims, vertices, faces, error, custom_layer_data "
+            "FROM files WHERE path = ?", (str(filepath),)).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, prims, vertices, faces, error, custom = row
+        return {"path": str(filepath), "size_bytes": size, "mtime_ns": mtime_ns,
+                "prims": prims, "vertices": vertices, "faces": faces, "error": error,
+                "custom_layer_data": json.loads(custom or "{}")}
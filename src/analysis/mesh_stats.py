@@ -0,0 +1,316 @@
+"""
+Mesh statistics for QA gates: area, volume, bounds, edge lengths, valence
+Every metric is computed over whole point/index buffers in NumPy, and every
+result is mergeable, so per-mesh numbers roll up into per-file, per-directory
+and library totals without revisiting geometry
+"""
+from pxr import UsdGeom
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..instrumentation import phase
+from ..primitives.derived import face_normals
+from ..primitives.processing import face_starts
+from .buffers import FIRST_VALUE, mesh_buffers
+from .streaming import iter_summaries, iter_usd_files, open_stage
+
+# Edge lengths are binned per 1/20 decade from 1e-6 to 1e6 scene units, so
+# histograms of different meshes add up; percentiles are read from the bins
+EDGE_BINS_PER_DECADE = 20
+EDGE_LENGTH_BINS = np.logspace(-6, 6, 12 * EDGE_BINS_PER_DECADE + 1)
+
+EDGE_PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class MeshStatistics:
+    """Metrics of one mesh, or the merged metrics of several
+
+    Meshes with border or non-manifold edges count as ``open_meshes``; their
+    ``volume`` is still reported, and is exact when the openings are only
+    unwelded seams such as a UV sphere's. Values are in the mesh's own
+    (object) space. Meshes whose faces cannot be walked (counts that do not
+    add up, indices out of range) count as ``invalid_meshes``, carry an
+    ``error`` and contribute only their vertex and face counts.
+    """
+    path: str
+    meshes: int = 1
+    vertices: int = 0
+    faces: int = 0
+    area: float = 0.0
+    volume: float = 0.0
+    open_meshes: int = 0
+    invalid_meshes: int = 0
+    error: Optional[str] = None
+    bounds: Optional[np.ndarray] = None
+    edges: int = 0
+    boundary_edges: int = 0
+    non_manifold_edges: int = 0
+    edge_length_min: float = float("inf")
+    edge_length_max: float = 0.0
+    edge_length_sum: float = 0.0
+    edge_histogram: np.ndarray = field(
+        default_factory=lambda: np.zeros(len(EDGE_LENGTH_BINS) + 1, dtype=np.int64))
+    # valence_histogram[k] = number of points with k edges; [0] counts unused points
+    valence_histogram: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def merge(cls, path: str, items: Iterable["MeshStatistics"]) -> "MeshStatistics":
+        """Sum counts and histograms, union bounds, widen min/max"""
+        total = cls(path, meshes=0)
+        for item in items:
+            for name in ("meshes", "vertices", "faces", "area", "volume", "open_meshes",
+                         "invalid_meshes", "edges", "boundary_edges", "non_manifold_edges",
+                         "edge_length_sum"):
+                setattr(total, name, getattr(total, name) + getattr(item, name))
+            total.edge_length_min = min(total.edge_length_min, item.edge_length_min)
+            total.edge_length_max = max(total.edge_length_max, item.edge_length_max)
+            total.edge_histogram = total.edge_histogram + item.edge_histogram
+            total.valence_histogram = _add_padded(total.valence_histogram,
+                                                  item.valence_histogram)
+            if item.bounds is not None:
+                total.bounds = item.bounds.copy() if total.bounds is None else np.stack([
+                    np.minimum(total.bounds[0], item.bounds[0]),
+                    np.maximum(total.bounds[1], item.bounds[1])])
+        return total
+
+    def edge_percentile(self, percent: float) -> Optional[float]:
+        """Approximate percentile: geometric middle of the bin it falls in"""
+        if not self.edges:
+            return None
+        rank = np.searchsorted(np.cumsum(self.edge_histogram), percent / 100 * self.edges)
+        lower = EDGE_LENGTH_BINS[max(rank - 1, 0)]
+        upper = EDGE_LENGTH_BINS[min(rank, len(EDGE_LENGTH_BINS) - 1)]
+        middle = float(np.sqrt(lower * upper))
+        return min(max(middle, self.edge_length_min), self.edge_length_max)
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly metrics, histograms reduced to their non-empty bins"""
+        used = self.valence_histogram[1:]
+        valences = np.flatnonzero(used) + 1
+        edge_bins = np.flatnonzero(self.edge_histogram)
+        edges = np.concatenate([[0.0], EDGE_LENGTH_BINS,
+                                [max(self.edge_length_max, EDGE_LENGTH_BINS[-1])]])
+        result = {
+            "path": self.path,
+            "meshes": self.meshes,
+            "vertices": self.vertices,
+            "faces": self.faces,
+            "area": self.area,
+            "volume": self.volume,
+            "open_meshes": self.open_meshes,
+            "invalid_meshes": self.invalid_meshes,
+            "bounds": None if self.bounds is None else self.bounds.tolist(),
+            "edges": {
+                "count": self.edges,
+                "boundary": self.boundary_edges,
+                "non_manifold": self.non_manifold_edges,
+                "length": {
+                    "min": self.edge_length_min if self.edges else None,
+                    "max": self.edge_length_max if self.edges else None,
+                    "mean": self.edge_length_sum / self.edges if self.edges else None,
+                    **{f"p{percent:02d}": self.edge_percentile(percent)
+                       for percent in EDGE_PERCENTILES},
+                    # [lower, upper, edges] rows
+                    "histogram": [[float(edges[b]), float(edges[b + 1]),
+                                   int(self.edge_histogram[b])] for b in edge_bins],
+                },
+            },
+            "valence": {
+                "min": int(valences[0]) if len(valences) else None,
+                "max": int(valences[-1]) if len(valences) else None,
+                "mean": float((valences * used[valences - 1]).sum() / used.sum())
+                        if used.sum() else None,
+                "unused_points": int(self.valence_histogram[0])
+                                 if len(self.valence_histogram) else 0,
+                "histogram": dict(zip(valences.tolist(), used[valences - 1].tolist())),
+            },
+        }
+        return dict(result, error=self.error) if self.error else result
+
+
+def _add_padded(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    if len(first) < len(second):
+        first, second = second, first
+    total = first.copy()
+    total[:len(second)] += second
+    return total
+
+
+def _topology_error(num_points: int, counts: np.ndarray,
+                    indices: np.ndarray) -> Optional[str]:
+    """Why the faces cannot be walked, or None; the cheap half of validate_mesh()"""
+    if len(counts) and counts.min() < 3:
+        return f"faces under 3 vertices: {int((counts < 3).sum())}"
+    mismatch = len(indices) - int(counts.sum())
+    if mismatch:
+        return f"count mismatch: {mismatch}"
+    if len(indices) and (indices.min() < 0 or indices.max() >= num_points):
+        outside = int(((indices < 0) | (indices >= num_points)).sum())
+        return f"indices out of range: {outside}"
+    return None
+
+
+def mesh_statistics(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                    orientation: str = "rightHanded", path: str = "") -> MeshStatistics:
+    """All metrics of one polygon mesh in a single batched pass per metric"""
+    points = np.asarray(points)
+    counts = np.asarray(counts, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    stats = MeshStatistics(path, vertices=len(points), faces=len(counts))
+    stats.error = _topology_error(len(points), counts, indices)
+    if stats.error:
+        stats.invalid_meshes = 1
+        return stats
+    if not len(points) or not len(counts):
+        return stats
+
+    stats.bounds = np.stack([points.min(axis=0), points.max(axis=0)]).astype(np.float64)
+    # Newell sums cancel badly far from the origin; area and volume do not
+    # depend on where the mesh sits
+    centered = points - ((stats.bounds[0] + stats.bounds[1]) / 2).astype(points.dtype)
+    doubled = face_normals(centered, counts, indices, orientation,
+                           normalize=False).astype(np.float64)
+    stats.area = float(np.sqrt(np.einsum("ij,ij->i", doubled, doubled)).sum() / 2)
+
+    # Undirected edges, keyed by their sorted endpoints
+    starts = face_starts(counts)
+    following = np.arange(1, len(indices) + 1)
+    following[starts + counts - 1] = starts
+    ends = indices[following]
+    keys = np.minimum(indices, ends) * len(points) + np.maximum(indices, ends)
+    keys, uses = np.unique(keys, return_counts=True)
+    first, second = keys // len(points), keys % len(points)
+    stats.edges = len(keys)
+    stats.boundary_edges = int((uses == 1).sum())
+    stats.non_manifold_edges = int((uses > 2).sum())
+
+    stats.open_meshes = int(bool(stats.boundary_edges or stats.non_manifold_edges))
+    # Divergence theorem: each planar face adds (corner . 2A) / 6
+    corners = centered[indices[starts]].astype(np.float64)
+    stats.volume = float(np.einsum("ij,ij->", corners, doubled) / 6)
+
+    delta = centered[first].astype(np.float64) - centered[second]
+    lengths = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    stats.edge_length_min = float(lengths.min())
+    stats.edge_length_max = float(lengths.max())
+    stats.edge_length_sum = float(lengths.sum())
+    stats.edge_histogram = np.bincount(np.searchsorted(EDGE_LENGTH_BINS, lengths),
+                                       minlength=len(EDGE_LENGTH_BINS) + 1)
+
+    valence = (np.bincount(first, minlength=len(points))
+               + np.bincount(second, minlength=len(points)))
+    stats.valence_histogram = np.bincount(valence)
+    return stats
+
+
+@dataclass
+class FileStatistics:
+    """Per-mesh metrics of one USD file plus their merged total
+
+    ``bounds`` is the stage's world-space box (transforms and instancing
+    applied); it replaces the union of object-space mesh bounds in ``total``,
+    so directory and library roll-ups are world-space too.
+    """
+    path: str
+    format: str
+    size_bytes: int = 0
+    meshes: List[MeshStatistics] = field(default_factory=list)
+    bounds: Optional[np.ndarray] = None
+    error: Optional[str] = None
+
+    @property
+    def total(self) -> MeshStatistics:
+        total = MeshStatistics.merge(self.path, self.meshes)
+        total.bounds = None if self.bounds is None else self.bounds.copy()
+        return total
+
+    def to_dict(self) -> Dict:
+        result = {"path": self.path, "format": self.format, "size_bytes": self.size_bytes}
+        if self.error:
+            return dict(result, error=self.error)
+        return dict(result, total=self.total.to_dict(),
+                    meshes=[mesh.to_dict() for mesh in self.meshes])
+
+
+def _world_bounds(stage) -> Optional[np.ndarray]:
+    """Aligned world box of everything renderable, from one BBoxCache"""
+    cache = UsdGeom.BBoxCache(FIRST_VALUE, [UsdGeom.Tokens.default_, UsdGeom.Tokens.render],
+                              useExtentsHint=True)
+    box = cache.ComputeWorldBound(stage.GetPseudoRoot()).ComputeAlignedRange()
+    if box.IsEmpty():
+        return None
+    return np.array([box.GetMin(), box.GetMax()], dtype=np.float64)
+
+
+def file_statistics(filepath, load_payloads: bool = False,
+                    mask: Optional[Sequence[str]] = None) -> FileStatistics:
+    """Metrics of every Mesh in one file, read through memory-flat buffers
+
+    A mesh that cannot be measured is recorded with its ``error`` rather than
+    failing the file, and a file that cannot be read is recorded with its own.
+    """
+    filepath = Path(filepath)
+    result = FileStatistics(str(filepath), filepath.suffix)
+    try:
+        result.size_bytes = filepath.stat().st_size
+        with phase("open_stage"):
+            stage = open_stage(filepath, load_payloads, mask)
+    except Exception as error:  # Tf errors surface as generic exceptions
+        result.error = str(error)
+        return result
+    if not stage:
+        result.error = "Could not open file"
+        return result
+
+    with phase("mesh_statistics") as timer:
+        for prim in stage.Traverse():
+            if not prim.IsA(UsdGeom.Mesh):
+                continue
+            mesh = UsdGeom.Mesh(prim)
+            try:
+                buffers = mesh_buffers(mesh)
+                stats = mesh_statistics(buffers.points, buffers.counts, buffers.indices,
+                                        mesh.GetOrientationAttr().Get(), buffers.path)
+            except Exception as error:  # one bad mesh must not fail the library
+                stats = MeshStatistics(str(prim.GetPath()), invalid_meshes=1,
+                                       error=f"{type(error).__name__}: {error}")
+            result.meshes.append(stats)
+            timer.count(meshes=1, vertices=stats.vertices, faces=stats.faces)
+    try:
+        result.bounds = _world_bounds(stage)
+    except Exception:  # Tf errors from unreadable extents leave the box out
+        result.bounds = None
+    return result
+
+
+def library_statistics(directory, jobs: Optional[int] = None, load_payloads: bool = False,
+                       mask: Optional[Sequence[str]] = None) -> Dict:
+    """Per-file metrics under ``directory`` rolled up per directory and overall
+
+    Files are processed across ``jobs`` processes; ``directories`` is keyed
+    by path relative to ``directory`` (``"."`` for the top level) and only
+    covers the files directly inside each one.
+    """
+    directory = Path(directory)
+    files = sorted(iter_summaries(iter_usd_files(directory), jobs,
+                                  summarize=file_statistics,
+                                  load_payloads=load_payloads, mask=mask),
+                   key=lambda item: item.path)
+    totals = {item.path: item.total for item in files if not item.error}
+    grouped: Dict[str, List[MeshStatistics]] = {}
+    for path, total in totals.items():
+        parent = Path(path).parent.relative_to(directory).as_posix()
+        grouped.setdefault(parent, []).append(total)
+    return {
+        "root": str(directory),
+        "files": [item.to_dict() for item in files],
+        "directories": {name: MeshStatistics.merge(name, items).to_dict()
+                        for name, items in sorted(grouped.items())},
+        "total": MeshStatistics.merge(str(directory), totals.values()).to_dict(),
+        "errors": sum(1 for item in files if item.error),
+    }
@@ -0,0 +1,364 @@
+"""
+Spatial index over prim world bounds
+World-space boxes come from one shared UsdGeom.BBoxCache per stage, go into
+a flat bounding-volume hierarchy, and can be saved next to the file so that
+repeat queries skip opening and traversing the stage
+"""
+from pxr import Usd, UsdGeom
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import heapq
+import json
+import os
+import threading
+import zipfile
+
+import numpy as np
+
+from ..instrumentation import phase
+from .streaming import open_stage
+
+LEAF_SIZE = 8
+INDEX_VERSION = 1
+
+
+def collect_bounds(stage: Usd.Stage, time=Usd.TimeCode.Default(),
+                   purposes: Sequence[str] = (UsdGeom.Tokens.default_,
+                                              UsdGeom.Tokens.render),
+                   use_extents_hint: bool = True) -> Tuple[List[str], np.ndarray]:
+    """World-space aligned bounds of every boundable leaf prim
+
+    One BBoxCache is shared by all prims, so ancestor transforms and
+    authored extents are read once. PointInstancers and unloaded payload
+    prims are indexed as a whole; their descendants are not. Returns
+    ``(paths, bounds)`` with ``bounds`` shaped ``(N, 2, 3)`` as ``[min, max]``
+    rows.
+    """
+    cache = UsdGeom.BBoxCache(time, list(purposes), useExtentsHint=use_extents_hint)
+    paths, boxes = [], []
+    # The default predicate skips unloaded prims; keep them for their hints
+    predicate = Usd.TraverseInstanceProxies(
+        Usd.PrimIsActive & Usd.PrimIsDefined & ~Usd.PrimIsAbstract)
+    prims = iter(Usd.PrimRange(stage.GetPseudoRoot(), predicate))
+    for prim in prims:
+        if prim.HasAuthoredPayloads() and not prim.IsLoaded():
+            # Unloaded assets are indexed whole, from their extentsHint
+            prims.PruneChildren()
+            if not prim.IsA(UsdGeom.Imageable):
+                continue
+        elif not prim.IsA(UsdGeom.Boundable):
+            continue
+        elif prim.IsA(UsdGeom.PointInstancer):
+            prims.PruneChildren()
+        box = cache.ComputeWorldBound(prim).ComputeAlignedRange()
+        if box.IsEmpty():
+            continue
+        paths.append(str(prim.GetPath()))
+        boxes.append((tuple(box.GetMin()), tuple(box.GetMax())))
+    return paths, np.array(boxes, dtype=np.float64).reshape(-1, 2, 3)
+
+
+def _box_distance(point: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Euclidean distance from ``point`` to each box; zero inside"""
+    gap = np.maximum(np.maximum(lower - point, point - upper), 0.0)
+    return np.sqrt((gap * gap).sum(axis=-1))
+
+
+def _ray_entry(origin: np.ndarray, inverse: np.ndarray, lower: np.ndarray,
+               upper: np.ndarray, max_distance: float) -> np.ndarray:
+    """Slab test: entry distance along the ray per box, ``inf`` on a miss"""
+    with np.errstate(invalid="ignore"):
+        near = (lower - origin) * inverse
+        far = (upper - origin) * inverse
+    # 0 * inf on axis-parallel rays: the slab is all-or-nothing on that axis
+    inside = (origin >= lower) & (origin <= upper)
+    near = np.where(np.isnan(near), np.where(inside, -np.inf, np.inf), near)
+    far = np.where(np.isnan(far), np.where(inside, np.inf, -np.inf), far)
+    entry = np.maximum(np.minimum(near, far).max(axis=-1), 0.0)
+    leave = np.maximum(near, far).min(axis=-1)
+    return np.where((entry <= leave) & (entry <= max_distance), entry, np.inf)
+
+
+class SpatialIndex:
+    """Bounding-volume hierarchy over named axis-aligned boxes
+
+    Nodes are stored in flat arrays; a node with ``count > 0`` is a leaf
+    covering ``order[start:start + count]``, otherwise its children are
+    ``left`` and ``right``. Leaves are tested with one vectorized check.
+    """
+
+    def __init__(self, paths: Sequence[str], bounds: np.ndarray,
+                 leaf_size: int = LEAF_SIZE, source: Optional[Dict] = None):
+        self.paths = list(paths)
+        self.bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 2, 3)
+        if len(self.paths) != len(self.bounds):
+            raise ValueError(f"{len(self.paths)} paths but {len(self.bounds)} bounds")
+        self.leaf_size = leaf_size
+        self.source = source or {}
+        self._build()
+
+    def _build(self):
+        lower, upper = self.bounds[:, 0], self.bounds[:, 1]
+        centers = (lower + upper) / 2
+        self.order = np.arange(len(self.paths))
+        node_lower, node_upper, starts, counts, lefts, rights = [], [], [], [], [], []
+
+        def add_node(start: int, end: int) -> int:
+            items = self.order[start:end]
+            node_lower.append(lower[items].min(axis=0) if len(items) else np.zeros(3))
+            node_upper.append(upper[items].max(axis=0) if len(items) else np.zeros(3))
+            starts.append(start)
+            counts.append(end - start)
+            lefts.append(-1)
+            rights.append(-1)
+            return len(starts) - 1
+
+        stack = [(add_node(0, len(self.paths)), 0, len(self.paths))]
+        while stack:
+            node, start, end = stack.pop()
+            if end - start <= self.leaf_size:
+                continue
+            items = self.order[start:end]
+            spread = np.ptp(centers[items], axis=0)
+            axis = int(np.argmax(spread))
+            if spread[axis] == 0:
+                # Coincident centers cannot be separated; keep one big leaf
+                continue
+            middle = (end - start) // 2
+            self.order[start:end] = items[np.argpartition(centers[items, axis], middle)]
+            counts[node] = 0
+            lefts[node] = add_node(start, start + middle)
+            rights[node] = add_node(start + middle, end)
+            stack.append((lefts[node], start, start + middle))
+            stack.append((rights[node], start + middle, end))
+
+        self.node_lower = np.array(node_lower, dtype=np.float64).reshape(-1, 3)
+        self.node_upper = np.array(node_upper, dtype=np.float64).reshape(-1, 3)
+        self.node_start = np.array(starts, dtype=np.int64)
+        self.node_count = np.array(counts, dtype=np.int64)
+        self.node_left = np.array(lefts, dtype=np.int64)
+        self.node_right = np.array(rights, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _leaf_items(self, node: int) -> np.ndarray:
+        start = self.node_start[node]
+        return self.order[start:start + self.node_count[node]]
+
+    def _children(self, node: int) -> Tuple[int, int]:
+        return self.node_left[node], self.node_right[node]
+
+    def query_box(self, lower: Sequence[float], upper: Sequence[float]) -> List[str]:
+        """Paths whose bounds intersect the box ``[lower, upper]``"""
+        if not self.paths:
+            return []
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        hits = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if (np.any(self.node_lower[node] > upper)
+                    or np.any(self.node_upper[node] < lower)):
+                continue
+            if self.node_count[node]:
+                items = self._leaf_items(node)
+                boxes = self.bounds[items]
+                overlap = (np.all(boxes[:, 0] <= upper, axis=1)
+                           & np.all(boxes[:, 1] >= lower, axis=1))
+                hits.extend(items[overlap].tolist())
+            else:
+                stack.extend(self._children(node))
+        return [self.paths[item] for item in sorted(hits)]
+
+    def query_ray(self, origin: Sequence[float], direction: Sequence[float],
+                  max_distance: float = np.inf) -> List[Tuple[str, float]]:
+        """``(path, distance)`` for every box the ray enters, nearest first
+
+        ``direction`` is normalized, so distances are in scene units.
+        """
+        if not self.paths:
+            return []
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        length = np.linalg.norm(direction)
+        if length == 0:
+            raise ValueError("Ray direction must be non-zero")
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / (direction / length)
+
+        hits = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            entry = _ray_entry(origin, inverse, self.node_lower[node],
+                               self.node_upper[node], max_distance)
+            if not np.isfinite(entry):
+                continue
+            if self.node_count[node]:
+                items = self._leaf_items(node)
+                boxes = self.bounds[items]
+                entries = _ray_entry(origin, inverse, boxes[:, 0], boxes[:, 1],
+                                     max_distance)
+                hit = np.isfinite(entries)
+                hits.extend(zip(items[hit].tolist(), entries[hit].tolist()))
+            else:
+                stack.extend(self._children(node))
+        hits.sort(key=lambda item: (item[1], item[0]))
+        return [(self.paths[item], distance) for item, distance in hits]
+
+    def nearest(self, point: Sequence[float], k: int = 1) -> List[Tuple[str, float]]:
+        """The ``k`` boxes closest to ``point`` as ``(path, distance)``
+
+        Best-first search: nodes are visited in order of their distance, so
+        the walk stops as soon as no unvisited node can beat the k-th hit.
+        """
+        if not self.paths or k < 1:
+            return []
+        point = np.asarray(point, dtype=np.float64)
+        best: List[Tuple[float, int]] = []  # max-heap of (-distance, item)
+        queue = [(float(_box_distance(point, self.node_lower[0], self.node_upper[0])), 0)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if len(best) == k and distance > -best[0][0]:
+                break
+            if self.node_count[node]:
+                items = self._leaf_items(node)
+                boxes = self.bounds[items]
+                for item, item_distance in zip(
+                        items.tolist(),
+                        _box_distance(point, boxes[:, 0], boxes[:, 1]).tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-item_distance, -item))
+                    elif item_distance < -best[0][0]:
+                        heapq.heapreplace(best, (-item_distance, -item))
+            else:
+                for child in self._children(node):
+                    child_distance = float(_box_distance(
+                        point, self.node_lower[child], self.node_upper[child]))
+                    heapq.heappush(queue, (child_distance, int(child)))
+        ranked = sorted((-distance, -item) for distance, item in best)
+        return [(self.paths[item], distance) for distance, item in ranked]
+
+    def save(self, filepath) -> Path:
+        """Write the index (paths, boxes and tree) as a NumPy ``.npz``
+
+        The file is written beside the target and renamed over it, so a
+        concurrent load() sees the old index or the new one, never a part.
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer, so two threads or processes never share one
+        partial = filepath.with_name(
+            f"{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(partial, "wb") as handle:
+                np.savez(handle, version=INDEX_VERSION,
+                         paths=np.array(self.paths, dtype=str), bounds=self.bounds,
+                         leaf_size=self.leaf_size, source=json.dumps(self.source),
+                         order=self.order, node_lower=self.node_lower,
+                         node_upper=self.node_upper, node_start=self.node_start,
+                         node_count=self.node_count, node_left=self.node_left,
+                         node_right=self.node_right)
+            os.replace(partial, filepath)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return filepath
+
+    @classmethod
+    def load(cls, filepath) -> "SpatialIndex":
+        """Read an index written by save() without rebuilding the tree"""
+        with np.load(filepath, allow_pickle=False) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError(f"Unsupported spatial index version in {filepath}")
+            index = cls.__new__(cls)
+            index.paths = data["paths"].tolist()
+            index.bounds = data["bounds"].reshape(-1, 2, 3)
+            index.leaf_size = int(data["leaf_size"])
+            index.source = json.loads(str(data["source"]))
+            for name in ("order", "node_lower", "node_upper", "node_start",
+                         "node_count", "node_left", "node_right"):
+                setattr(index, name, data[name])
+        return index
+
+
+def used_layer_files(stage: Usd.Stage) -> List[str]:
+    """Files behind every layer the stage composed
+
+    That is the root layer, sublayers, references, loaded payloads and value
+    clips; members of a usdz package map to the package file.
+    """
+    files = set()
+    for layer in stage.GetUsedLayers():
+        if layer.realPath:
+            # usdz members look like "asset.usdz[geometry.usdc]"
+            files.add(layer.realPath.split("[", 1)[0])
+    return sorted(files)
+
+
+def _source_key(filepath: Path, layer_files: Sequence[str], load_payloads: bool,
+                mask: Optional[Sequence[str]]) -> Dict:
+    """What an index was built from; a saved index is reused only on a match
+
+    Size and mtime are taken for every file in ``layer_files``, so editing
+    a referenced or payloaded layer invalidates the index as well as
+    editing ``filepath`` itself.
+    """
+    layers = []
+    for layer_file in layer_files:
+        stat = os.stat(layer_file)
+        layers.append([layer_file, stat.st_size, stat.st_mtime_ns])
+    return {"path": str(filepath.resolve()), "layers": layers,
+            "load_payloads": load_payloads, "mask": sorted(mask) if mask else None}
+
+
+def _is_current(index: SpatialIndex, filepath: Path, load_payloads: bool,
+                mask: Optional[Sequence[str]]) -> bool:
+    layer_files = [layer[0] for layer in index.source.get("layers", [])]
+    try:
+        return index.source == _source_key(filepath, layer_files, load_payloads, mask)
+    except FileNotFoundError:
+        return False
+
+
+def index_path_for(filepath) -> Path:
+    """Default location of a file's saved index: ``.<name>.bvh.npz`` beside it"""
+    filepath = Path(filepath)
+    return filepath.with_name(f".{filepath.name}.bvh.npz")
+
+
+def build_index(filepath, load_payloads: bool = True,
+                mask: Optional[Sequence[str]] = None,
+                leaf_size: int = LEAF_SIZE) -> SpatialIndex:
+    """Open ``filepath`` and index the world bounds of its boundable prims"""
+    filepath = Path(filepath)
+    with phase("open_stage"):
+        stage = open_stage(filepath, load_payloads, mask)
+    if not stage:
+        raise RuntimeError(f"Could not open {filepath}")
+    with phase("collect_bounds") as timer:
+        paths, bounds = collect_bounds(stage)
+        timer.count(prims=len(paths))
+    with phase("build_index"):
+        return SpatialIndex(paths, bounds, leaf_size,
+                            _source_key(filepath, used_layer_files(stage),
+                                        load_payloads, mask))
+
+
+def load_or_build_index(filepath, index_path=None, load_payloads: bool = True,
+                        mask: Optional[Sequence[str]] = None) -> SpatialIndex:
+    """Reuse the saved index while every layer it was built from is unchanged"""
+    filepath = Path(filepath)
+    index_path = Path(index_path) if index_path else index_path_for(filepath)
+    if index_path.exists():
+        try:
+            index = SpatialIndex.load(index_path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            index = None
+        if index is not None and _is_current(index, filepath, load_payloads, mask):
+            return index
+    index = build_index(filepath, load_payloads, mask)
+    index.save(index_path)
+    return index
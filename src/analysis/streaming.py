@@ -0,0 +1,142 @@
+"""
+Streaming USD analysis for large asset directories
+Stages are opened without payloads (optionally masked), files are processed
+concurrently, and one JSON line is emitted per file as soon as it is ready
+"""
+from pxr import Usd, UsdGeom
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, IO, Iterable, Iterator, Optional, Sequence
+import json
+import os
+import sys
+
+from ..instrumentation import phase
+from .buffers import array_length
+
+USD_SUFFIXES = (".usd", ".usda", ".usdc", ".usdz")
+
+
+def iter_usd_files(directory, recursive: bool = True) -> Iterator[Path]:
+    """Yield USD files lazily so huge trees never sit in one list"""
+    directory = Path(directory)
+    candidates = directory.rglob("*") if recursive else directory.iterdir()
+    for path in candidates:
+        if path.suffix.lower() in USD_SUFFIXES and path.is_file():
+            yield path
+
+
+def open_stage(filepath, load_payloads: bool = False,
+               mask: Optional[Sequence[str]] = None) -> Optional[Usd.Stage]:
+    """Open a stage with payloads unloaded and an optional population mask"""
+    load = Usd.Stage.LoadAll if load_payloads else Usd.Stage.LoadNone
+    if mask:
+        population = Usd.StagePopulationMask()
+        for path in mask:
+            population.Add(path)
+        return Usd.Stage.OpenMasked(str(filepath), population, load)
+    return Usd.Stage.Open(str(filepath), load)
+
+
+def summarize_stage(filepath, load_payloads: bool = False,
+                    mask: Optional[Sequence[str]] = None,
+                    hierarchy: bool = False) -> Dict:
+    """Structural summary of one USD file as a JSON-friendly dict
+
+    With ``hierarchy=True`` the summary also lists every ``[path, type]``.
+    """
+    filepath = Path(filepath)
+    summary = {"path": str(filepath), "format": filepath.suffix, "size_bytes": None}
+    try:
+        # Inside the try: the file may have gone since the directory walk
+        summary["size_bytes"] = filepath.stat().st_size
+        with phase("open_stage"):
+            stage = open_stage(filepath, load_payloads, mask)
+    except Exception as error:  # Tf errors surface as generic exceptions
+        return dict(summary, error=str(error))
+    if not stage:
+        return dict(summary, error="Could not open file")
+
+    prim_types: Dict[str, int] = {}
+    prims = []
+    meshes = []
+    unloaded = 0
+    with phase("traverse") as timer:
+        for prim in stage.Traverse():
+            prim_type = str(prim.GetTypeName()) or "(untyped)"
+            prim_types[prim_type] = prim_types.get(prim_type, 0) + 1
+            if hierarchy:
+                prims.append([str(prim.GetPath()), prim_type])
+            if prim.HasAuthoredPayloads() and not prim.IsLoaded():
+                unloaded += 1
+            if prim_type == "Mesh":
+                mesh = UsdGeom.Mesh(prim)
+                meshes.append({
+                    "path": str(prim.GetPath()),
+                    "vertices": array_length(mesh.GetPointsAttr()),
+                    "faces": array_length(mesh.GetFaceVertexCountsAttr()),
+                })
+        vertices = sum(mesh["vertices"] for mesh in meshes)
+        faces = sum(mesh["faces"] for mesh in meshes)
+        timer.count(files=1, prims=sum(prim_types.values()),
+                    vertices=vertices, faces=faces)
+
+    summary.update(
+        prims=sum(prim_types.values()),
+        prim_types=prim_types,
+        meshes=meshes,
+        vertices=vertices,
+        faces=faces,
+        unloaded_payloads=unloaded,
+        custom_layer_data=dict(stage.GetRootLayer().customLayerData),
+    )
+    if hierarchy:
+        summary["hierarchy"] = prims
+    return summary
+
+
+def _summarize_task(task):
+    summarize, filepath, options = task
+    return summarize(filepath, **options)
+
+
+def iter_summaries(files: Iterable[Path], jobs: Optional[int] = None,
+                   summarize: Callable = summarize_stage, **options) -> Iterator:
+    """Summarize ``files`` across processes, yielding in completion order
+
+    ``options`` are passed to ``summarize`` (a module-level function, so it
+    pickles), summarize_stage() by default. At most ``jobs * 4`` files are in
+    flight, so memory stays flat no matter how many files the iterator
+    produces.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    tasks = ((summarize, path, options) for path in files)
+    if jobs == 1:
+        yield from map(_summarize_task, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        for task in tasks:
+            pending.add(pool.submit(_summarize_task, task))
+            if len(pending) >= jobs * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def stream_analysis(directory, output: IO = None, jobs: Optional[int] = None,
+                    load_payloads: bool = False,
+                    mask: Optional[Sequence[str]] = None) -> int:
+    """Write one JSON line per USD file under ``directory``; return the count"""
+    output = output or sys.stdout
+    count = 0
+    summaries = iter_summaries(iter_usd_files(directory), jobs,
+                               load_payloads=load_payloads, mask=mask)
+    for summary in summaries:
+        output.write(json.dumps(summary, default=str) + "\n")
+        output.flush()
+        count += 1
+    return count
@@ -0,0 +1,258 @@
+"""
+Content-addressed mesh deduplication for library export
+Each distinct point/index buffer is written once to a shared geometry layer;
+named prims in the interface layer reference it by content hash, and later
+exports that point at the same geometry layer reuse what is already in it
+"""
+from pxr import Sdf, Tf
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+import fcntl
+import hashlib
+import os
+
+import numpy as np
+
+from ..instrumentation import phase
+from ..primitives.basic_shapes import GeometryData
+from .batch import NamedGeometry, author_mesh_spec
+from .formats import ExportReport, export_layer, resolve_path
+
+GEOMETRY_ROOT = "/Geometry"
+
+
+def geometry_digest(geometry: GeometryData, **mesh_options) -> str:
+    """Hex digest of the buffers and the mesh options authored with them"""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (geometry.points, geometry.face_vertex_counts,
+                  geometry.face_vertex_indices):
+        # Length prefix keeps differently split buffers from colliding
+        digest.update(len(array).to_bytes(8, "little"))
+        digest.update(memoryview(np.ascontiguousarray(array)))
+    digest.update(repr(sorted(mesh_options.items())).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class DedupReport:
+    """How many meshes were shared and what deduplication saved"""
+    meshes: int
+    unique: int
+    logical_bytes: int
+    stored_bytes: int
+    # Unique meshes the geometry layer already held from earlier exports
+    reused: int = 0
+    interface: Optional[ExportReport] = None
+    geometry: Optional[ExportReport] = None
+    references: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.logical_bytes - self.stored_bytes
+
+    def summary(self) -> str:
+        saved = self.bytes_saved / self.logical_bytes if self.logical_bytes else 0.0
+        return (f"{self.meshes} meshes, {self.unique} unique, {self.reused} already "
+                f"in the library: {self.bytes_saved / 1024:.1f} KB of buffers saved "
+                f"({saved:.0%})")
+
+
+class DedupStageWriter:
+    """Write named meshes as references into a content-addressed geometry layer
+
+    ``filepath`` gets the lightweight interface layer; unique meshes go to
+    ``geometry_path`` (default ``<stem>_geometry.usdc`` next to it) under
+    ``/Geometry/mesh_<digest>``. An existing geometry layer is opened and
+    appended to, and meshes already in it are referenced rather than written
+    again, so a whole library can share one. The geometry layer is only
+    rewritten when this export added meshes to it, and an exclusive lock on
+    ``<geometry_path>.lock`` is held from open() to close(), so concurrent
+    exports into one geometry layer run one after another instead of
+    overwriting each other's meshes. ``geometry_format`` overrides the
+    extension of ``geometry_path``; pass None to keep it. The interface
+    layer can be usda or usdc (usdz would need the geometry layer packaged
+    with it).
+
+    Usage::
+
+        with DedupStageWriter("sweep.usda", geometry_path="library.usdc") as writer:
+            for name, geometry in items:
+                writer.add(name, geometry)
+        print(writer.report.summary())
+    """
+
+    def __init__(self, filepath, root: str = "/World",
+                 metadata: Optional[Dict] = None, output_format: Optional[str] = None,
+                 geometry_format: Optional[str] = "usdc", geometry_path=None):
+        self.filepath = resolve_path(filepath, output_format)
+        if self.filepath.suffix == ".usdz":
+            raise ValueError("Deduplicated exports reference a sibling geometry "
+                             "layer and cannot be written as usdz")
+        if geometry_path is None:
+            geometry_path = self.filepath.with_name(f"{self.filepath.stem}_geometry")
+        self.geometry_path = resolve_path(geometry_path, geometry_format)
+        if self.geometry_path.suffix == ".usdz":
+            raise ValueError("The shared geometry layer is appended to and cannot be usdz")
+        self.root = Sdf.Path(root)
+        self.metadata = metadata
+        self.names = set()
+        self.digests = set()
+        self.layer: Optional[Sdf.Layer] = None
+        self.geometry_layer: Optional[Sdf.Layer] = None
+        self.report = DedupReport(0, 0, 0, 0)
+        self._geometry_changed = False
+        self._lock = None
+        self._asset_path = "./" + Path(os.path.relpath(
+            self.geometry_path, self.filepath.parent)).as_posix()
+
+    def open(self) -> "DedupStageWriter":
+        """Create the interface layer and open (or create) the geometry layer"""
+        self._acquire_lock()
+        self.layer = Sdf.Layer.CreateAnonymous(self.filepath.stem)
+        if self.geometry_path.exists():
+            self.geometry_layer = Sdf.Layer.FindOrOpen(str(self.geometry_path))
+            if self.geometry_layer is None:
+                self._release_lock()
+                raise ValueError(f"Could not open geometry layer {self.geometry_path}")
+            # Another process may have added meshes since this one last read it
+            self.geometry_layer.Reload()
+        else:
+            self.geometry_layer = Sdf.Layer.CreateAnonymous(self.geometry_path.stem)
+            self._geometry_changed = True
+
+        root = Sdf.CreatePrimInLayer(self.layer, self.root)
+        root.specifier = Sdf.SpecifierDef
+        root.typeName = "Xform"
+        self.layer.defaultPrim = root.name
+        if self.metadata:
+            self.layer.customLayerData = self.metadata
+
+        if not self.geometry_layer.GetPrimAtPath(GEOMETRY_ROOT):
+            geometry_root = Sdf.CreatePrimInLayer(self.geometry_layer, GEOMETRY_ROOT)
+            geometry_root.specifier = Sdf.SpecifierDef
+            geometry_root.typeName = "Scope"
+            self.geometry_layer.defaultPrim = geometry_root.name
+            self._geometry_changed = True
+        return self
+
+    def _acquire_lock(self):
+        lock_path = self.geometry_path.with_name(f"{self.geometry_path.name}.lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = open(lock_path, "a")
+        fcntl.flock(self._lock, fcntl.LOCK_EX)
+
+    def _release_lock(self):
+        if self._lock is not None:
+            fcntl.flock(self._lock, fcntl.LOCK_UN)
+            self._lock.close()
+            self._lock = None
+
+    def add(self, name: str, geometry: GeometryData, **mesh_options) -> Sdf.Path:
+        """Reference ``geometry`` under the root, authoring it only if unseen"""
+        if self.layer is None:
+            raise RuntimeError("DedupStageWriter.add() called before open()")
+
+        prim_name = Tf.MakeValidIdentifier(name)
+        if prim_name in self.names:
+            raise ValueError(f"Duplicate mesh name in batch: {name!r}")
+        self.names.add(prim_name)
+
+        with phase("dedup_add") as timer:
+            digest = geometry_digest(geometry, **mesh_options)
+            source = Sdf.Path(GEOMETRY_ROOT).AppendChild(f"mesh_{digest}")
+            if digest not in self.digests:
+                self.digests.add(digest)
+                self.report.unique += 1
+                if self.geometry_layer.GetPrimAtPath(source):
+                    # Written by an earlier export into the same geometry layer
+                    self.report.reused += 1
+                    timer.count(reused=1)
+                else:
+                    author_mesh_spec(self.geometry_layer, source, geometry, **mesh_options)
+                    self._geometry_changed = True
+                    self.report.stored_bytes += geometry.nbytes
+                    timer.count(unique=1)
+
+            path = self.root.AppendChild(prim_name)
+            spec = Sdf.CreatePrimInLayer(self.layer, path)
+            spec.specifier = Sdf.SpecifierDef
+            spec.typeName = "Mesh"
+            spec.referenceList.Prepend(Sdf.Reference(self._asset_path, source))
+            timer.count(meshes=1)
+
+        self.report.meshes += 1
+        self.report.logical_bytes += geometry.nbytes
+        self.report.references[str(path)] = digest
+        return path
+
+    def write(self, items: Iterable[NamedGeometry]) -> int:
+        """Add every item in ``items``; return how many were written"""
+        written = 0
+        for name, geometry in items:
+            self.add(name, geometry)
+            written += 1
+        return written
+
+    def close(self) -> DedupReport:
+        """Write the geometry layer if it changed, then the interface layer
+
+        ``report.geometry`` stays None when every mesh was already in the
+        geometry layer.
+        """
+        try:
+            if self.layer is not None:
+                if self._geometry_changed:
+                    self.report.geometry = export_layer(self.geometry_layer,
+                                                        self.geometry_path)
+                self.report.interface = export_layer(self.layer, self.filepath)
+        finally:
+            self._release_lock()
+        return self.report
+
+    def __enter__(self) -> "DedupStageWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._release_lock()
+        return False
+
+
+def write_deduplicated(items: Iterable[NamedGeometry], filepath,
+                       root: str = "/World", metadata: Optional[Dict] = None,
+                       output_format: Optional[str] = None,
+                       geometry_path=None) -> DedupReport:
+    """Write ``items`` through a DedupStageWriter and return its report"""
+    with DedupStageWriter(filepath, root, metadata, output_format,
+                          geometry_path=geometry_path) as writer:
+        writer.write(items)
+    return writer.report
+
+
+if __name__ == "__main__":
+    from ..primitives.vectorized import cone_arrays
+    from .batch import BatchStageWriter
+
+    # A sweep where many names share (resolution, height, radius) settings
+    sweep: List[NamedGeometry] = []
+    for variant in range(10):
+        for resolution in (16, 64, 256):
+            for height in (1.0, 2.0):
+                sweep.append((f"cone_v{variant}_r{resolution}_h{height:g}",
+                              GeometryData(*cone_arrays(resolution, height))))
+
+    # Two exports sharing one geometry layer: the second writes no geometry
+    library = Path("dedup_demo/library_geometry.usdc")
+    library.unlink(missing_ok=True)
+    for part, items in (("sweep_a", sweep[:30]), ("sweep_b", sweep[30:])):
+        report = write_deduplicated(items, f"dedup_demo/{part}.usda", geometry_path=library)
+        print(f"{part}: {report.summary()}")
+        print(f"  {report.interface.summary()}")
+        if report.geometry is not None:
+            print(f"  {report.geometry.summary()}")
+    with BatchStageWriter("dedup_demo/sweep_plain.usdc") as plain:
+        plain.write(sweep)
+    print(f"without dedup: {plain.report.summary()}")
@@ -0,0 +1,139 @@
+"""
+Output format selection for USD writers: usda, usdc (crate) or usdz
+Layers are authored in memory and serialized once through export_layer();
+pxr is only imported there, so format and path resolution stay cheap
+"""
+from pathlib import Path
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+import tempfile
+import time
+
+from ..instrumentation import phase
+
+if TYPE_CHECKING:
+    from pxr import Sdf
+
+FORMATS = ("usda", "usdc", "usdz")
+AUTO = "auto"
+# ".usd" may hold either encoding; it is written as crate unless asked otherwise
+GENERIC = "usd"
+GENERIC_FORMAT = "usdc"
+
+# Meshes with more points than this go to binary crate under "auto"
+USDC_POINT_THRESHOLD = 10_000
+
+
+@dataclass
+class ExportReport:
+    """Where a layer was written, in which format, and what it cost"""
+    path: Path
+    format: str
+    size_bytes: int
+    write_seconds: float
+
+    def summary(self) -> str:
+        return (f"{self.path.name}: {self.size_bytes / 1024:.1f} KB "
+                f"in {self.write_seconds * 1000:.1f} ms")
+
+
+def resolve_format(output_format: Optional[str] = AUTO, num_points: int = 0,
+                   threshold: int = USDC_POINT_THRESHOLD) -> str:
+    """Turn ``auto`` (or the generic ``usd``) into a concrete format"""
+    fmt = (output_format or AUTO).lower().lstrip(".")
+    if fmt == AUTO:
+        return "usdc" if num_points > threshold else "usda"
+    if fmt == GENERIC:
+        return GENERIC_FORMAT
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown USD output format {output_format!r}; "
+                         f"expected one of {FORMATS + (GENERIC, AUTO)}")
+    return fmt
+
+
+def resolve_path(filepath, output_format: Optional[str] = None, num_points: int = 0,
+                 threshold: int = USDC_POINT_THRESHOLD) -> Path:
+    """Give ``filepath`` the extension of the requested format
+
+    With ``output_format=None`` the extension already on ``filepath`` wins;
+    ``usd`` keeps (or gives) the generic ``.usd`` extension.
+    """
+    filepath = Path(filepath)
+    suffix = filepath.suffix.lower().lstrip(".")
+    if output_format is None:
+        output_format = suffix if suffix in FORMATS + (GENERIC,) else AUTO
+    fmt = resolve_format(output_format, num_points, threshold)
+    if output_format.lower().lstrip(".") == GENERIC:
+        fmt = GENERIC
+    if suffix in FORMATS + (GENERIC,):
+        return filepath.with_suffix(f".{fmt}")
+    # Names such as "cone_r1.5" carry dots that are not extensions
+    return filepath.with_name(f"{filepath.name}.{fmt}")
+
+
+def export_layer(layer: "Sdf.Layer", filepath) -> ExportReport:
+    """Serialize ``layer`` to ``filepath``; the extension picks the format"""
+    filepath = Path(filepath)
+    fmt = resolve_format(filepath.suffix)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    with phase("save", format=fmt) as timer:
+        start = time.perf_counter()
+        if fmt == "usdz":
+            # usdz is a read-only package: write crate first, then zip it up
+            from pxr import Sdf, UsdUtils
+            with tempfile.TemporaryDirectory() as tmp:
+                crate = Path(tmp) / f"{filepath.stem}.usdc"
+                if not layer.Export(str(crate)):
+                    raise RuntimeError(f"Could not export layer to {crate}")
+                if not UsdUtils.CreateNewUsdzPackage(Sdf.AssetPath(str(crate)),
+                                                     str(filepath)):
+                    raise RuntimeError(f"Could not package {filepath}")
+        elif filepath.suffix.lower() == f".{GENERIC}":
+            # Explicit, so USD_DEFAULT_FILE_FORMAT cannot change the encoding
+            if not layer.Export(str(filepath), args={"format": fmt}):
+                raise RuntimeError(f"Could not export layer to {filepath}")
+        elif not layer.Export(str(filepath)):
+            raise RuntimeError(f"Could not export layer to {filepath}")
+        elapsed = time.perf_counter() - start
+        size = filepath.stat().st_size
+        timer.count(bytes_written=size)
+
+    return ExportReport(filepath, fmt, size, elapsed)
+
+
+def save_stage(stage, filepath) -> ExportReport:
+    """Serialize a stage's root layer to ``filepath``"""
+    return export_layer(stage.GetRootLayer(), filepath)
+
+
+def compare_formats(layer: "Sdf.Layer", output_dir, name: str) -> List[ExportReport]:
+    """Write ``layer`` once per format to see size and write time side by side"""
+    output_dir = Path(output_dir)
+    return [export_layer(layer, output_dir / f"{name}.{fmt}") for fmt in FORMATS]
+
+
+def format_table(reports: List[ExportReport]) -> str:
+    """Render export reports as an aligned text table"""
+    lines = [f"{'format':<8}{'size (KB)':>12}{'write (ms)':>12}"]
+    for report in reports:
+        lines.append(f"{report.format:<8}{report.size_bytes / 1024:>12.1f}"
+                     f"{report.write_seconds * 1000:>12.2f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from pxr import Usd, UsdGeom
+    from ..primitives.basic_shapes import GeometryData
+    from ..primitives.vectorized import uv_sphere_arrays
+
+    for resolution in (32, 256, 1024):
+        stage = Usd.Stage.CreateInMemory()
+        mesh = UsdGeom.Mesh.Define(stage, "/Sphere")
+        points, counts, indices = GeometryData(*uv_sphere_arrays(resolution)).to_vt()
+        mesh.GetPointsAttr().Set(points)
+        mesh.GetFaceVertexCountsAttr().Set(counts)
+        mesh.GetFaceVertexIndicesAttr().Set(indices)
+        print(f"\nUV sphere, resolution {resolution} ({len(points)} points)")
+        print(format_table(compare_formats(stage.GetRootLayer(), "format_comparison",
+                                           f"sphere_{resolution}")))
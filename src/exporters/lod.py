@@ -0,0 +1,138 @@
+"""
+Level-of-detail chains for primitives
+One primitive spec becomes a geometric series of resolutions authored on a
+single prim as a ``lod`` variant set, or as render/proxy purpose children
+"""
+from pxr import Usd, UsdGeom, Vt
+from typing import List, Optional, Sequence, Tuple
+
+from ..primitives.basic_shapes import GeometryData
+from ..primitives.derived import extent
+from ..primitives.vectorized import GENERATORS, SUBDIVISION_SCHEMES
+
+LOD_VARIANT_SET = "lod"
+LOD_MODES = ("variants", "purpose")
+
+
+def lod_resolutions(resolution: int, levels: int = 4, ratio: float = 0.5,
+                    minimum: int = 3) -> List[int]:
+    """Geometric series of resolutions, finest first, without repeats"""
+    if levels < 1:
+        raise ValueError(f"LOD chains need at least one level, got {levels}")
+    if not 0 < ratio < 1:
+        raise ValueError(f"LOD ratio must be between 0 and 1, got {ratio}")
+    resolutions = []
+    for level in range(levels):
+        value = max(minimum, int(round(resolution * ratio ** level)))
+        if resolutions and value >= resolutions[-1]:
+            break
+        resolutions.append(value)
+    return resolutions
+
+
+def lod_levels(kind: str, resolutions: Sequence[int],
+               **params) -> List[Tuple[int, GeometryData]]:
+    """``(resolution, geometry)`` for every resolution that adds a distinct mesh
+
+    Ico and cube spheres round resolutions to subdivision steps, so
+    neighbouring resolutions can generate the same mesh; a level with the
+    point count of the one before it is dropped.
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown primitive {kind!r}; expected one of {sorted(GENERATORS)}")
+    generator = GENERATORS[kind]
+    levels: List[Tuple[int, GeometryData]] = []
+    for resolution in resolutions:
+        geometry = GeometryData(*generator(resolution, **params))
+        if not levels or geometry.num_points != levels[-1][1].num_points:
+            levels.append((resolution, geometry))
+    return levels
+
+
+def lod_chain(kind: str, resolutions: Sequence[int], **params) -> List[GeometryData]:
+    """Geometry for every distinct resolution of one primitive spec
+
+    The series is geometric, so all coarser levels together cost less than
+    the finest one; their unit shapes come from the topology cache.
+    """
+    return [geometry for _, geometry in lod_levels(kind, resolutions, **params)]
+
+
+def _set_geometry(mesh: UsdGeom.Mesh, geometry: GeometryData):
+    points, counts, indices = geometry.to_vt()
+    mesh.CreatePointsAttr().Set(points)
+    mesh.CreateFaceVertexCountsAttr().Set(counts)
+    mesh.CreateFaceVertexIndicesAttr().Set(indices)
+    mesh.CreateExtentAttr().Set(Vt.Vec3fArray.FromNumpy(extent(geometry.points)))
+
+
+def author_lod_variants(stage: Usd.Stage, path: str, chain: Sequence[GeometryData],
+                        names: Optional[Sequence[str]] = None,
+                        selection: int = 0,
+                        subdivision_scheme: Optional[str] = "none") -> UsdGeom.Mesh:
+    """Author ``chain`` as variants ``lod0..lodN`` of one Mesh prim
+
+    Topology-independent opinions (orientation, subdivision) live outside
+    the variants; ``selection`` picks the default level. A
+    ``subdivision_scheme`` of None leaves the USD default.
+    """
+    names = list(names or (f"lod{level}" for level in range(len(chain))))
+    mesh = UsdGeom.Mesh.Define(stage, path)
+    mesh.CreateOrientationAttr().Set("leftHanded")
+    if subdivision_scheme is not None:
+        mesh.CreateSubdivisionSchemeAttr().Set(subdivision_scheme)
+
+    variant_set = mesh.GetPrim().GetVariantSets().AddVariantSet(LOD_VARIANT_SET)
+    for name, geometry in zip(names, chain):
+        variant_set.AddVariant(name)
+        variant_set.SetVariantSelection(name)
+        with variant_set.GetVariantEditContext():
+            _set_geometry(mesh, geometry)
+    variant_set.SetVariantSelection(names[selection])
+    return mesh
+
+
+def author_lod_purposes(stage: Usd.Stage, path: str, chain: Sequence[GeometryData],
+                        subdivision_scheme: Optional[str] = "none") -> UsdGeom.Xform:
+    """Finest level as a ``render`` child, coarsest as a ``proxy`` child
+
+    Purpose only distinguishes render from proxy, so intermediate levels
+    are not authored in this mode.
+    """
+    root = UsdGeom.Xform.Define(stage, path)
+    meshes = {}
+    for child, purpose, geometry in (("render", UsdGeom.Tokens.render, chain[0]),
+                                     ("proxy", UsdGeom.Tokens.proxy, chain[-1])):
+        mesh = UsdGeom.Mesh.Define(stage, root.GetPath().AppendChild(child))
+        _set_geometry(mesh, geometry)
+        mesh.CreateOrientationAttr().Set("leftHanded")
+        if subdivision_scheme is not None:
+            mesh.CreateSubdivisionSchemeAttr().Set(subdivision_scheme)
+        mesh.CreatePurposeAttr().Set(purpose)
+        meshes[child] = mesh
+    meshes["render"].GetProxyPrimRel().SetTargets([meshes["proxy"].GetPath()])
+    return root
+
+
+def author_lod(stage: Usd.Stage, path: str, kind: str, resolution: int,
+               levels: int = 4, ratio: float = 0.5, mode: str = "variants",
+               **params) -> Usd.Prim:
+    """Generate and author a full LOD chain for one primitive spec"""
+    if mode not in LOD_MODES:
+        raise ValueError(f"Unknown LOD mode {mode!r}; expected one of {LOD_MODES}")
+    distinct = lod_levels(kind, lod_resolutions(resolution, levels, ratio), **params)
+    resolutions = [level for level, _ in distinct]
+    chain = [geometry for _, geometry in distinct]
+
+    scheme = SUBDIVISION_SCHEMES[kind]
+    if mode == "variants":
+        prim = author_lod_variants(stage, path, chain,
+                                   subdivision_scheme=scheme).GetPrim()
+    else:
+        prim = author_lod_purposes(stage, path, chain, scheme).GetPrim()
+    prim.SetCustomDataByKey("lod", {
+        "geometry_type": kind,
+        "resolutions": resolutions,
+        "points": [geometry.num_points for geometry in chain],
+    })
+    return prim
@@ -0,0 +1,129 @@
+"""
+Parallel geometry library export across a process pool
+Stage authoring holds the GIL, so parameter-grid variants are split into
+deterministic chunks and each chunk is written by a worker process
+"""
+from pxr import Sdf
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import os
+import time
+
+from ..primitives.basic_shapes import GeometryData
+from ..primitives.vectorized import GENERATORS, SUBDIVISION_SCHEMES, MeshArrays
+from .batch import BatchStageWriter
+from .formats import export_layer, resolve_path
+
+# Primitive kind -> (array generator, mesh options), from the same tables
+# TechArtistGeometry authors with
+PRIMITIVES: Dict[str, Tuple[Callable[..., MeshArrays], Dict]] = {
+    kind: (generator, {"subdivision_scheme": SUBDIVISION_SCHEMES[kind]})
+    for kind, generator in GENERATORS.items()
+}
+
+
+@dataclass
+class LibraryResult:
+    """Files produced by export_library() and how long it took"""
+    files: List[Path]
+    variants: int
+    seconds: float
+    merged: Optional[Path] = None
+    jobs: int = 1
+    names: List[str] = field(default_factory=list)
+
+
+def parameter_grid(**axes: Sequence) -> List[Dict]:
+    """Cartesian product of parameter axes, in sorted key order"""
+    keys = sorted(axes)
+    return [dict(zip(keys, values)) for values in product(*(axes[k] for k in keys))]
+
+
+def _format_value(value) -> str:
+    text = f"{value:g}" if isinstance(value, float) else str(value)
+    return text.replace("-", "m").replace(".", "p")
+
+
+def variant_name(kind: str, params: Dict) -> str:
+    """Deterministic prim name, e.g. ``cone_height2_radius0p5_resolution16``"""
+    parts = [f"{key}{_format_value(params[key])}" for key in sorted(params)]
+    return "_".join([kind] + parts)
+
+
+def _export_chunk(task: Tuple[str, List[Dict], str, str]) -> Tuple[str, List[str]]:
+    """Worker entry point: author one chunk of variants into one file"""
+    kind, chunk, filepath, output_format = task
+    generator, mesh_options = PRIMITIVES[kind]
+
+    names = []
+    with BatchStageWriter(filepath, output_format=output_format,
+                          metadata={"geometry_type": kind}) as writer:
+        for params in chunk:
+            name = variant_name(kind, params)
+            path = writer.add(name, GeometryData(*generator(**params)), **mesh_options)
+            writer.layer.GetPrimAtPath(path).customData = {"parameters": params}
+            names.append(name)
+    return str(writer.filepath), names
+
+
+def merge_by_reference(files: Sequence[Path], filepath, root: str = "/Library") -> Path:
+    """Author one asset whose children reference each chunk file's default prim"""
+    filepath = Path(filepath)
+    layer = Sdf.Layer.CreateAnonymous(filepath.stem)
+    with Sdf.ChangeBlock():
+        root_spec = Sdf.CreatePrimInLayer(layer, root)
+        root_spec.specifier = Sdf.SpecifierDef
+        root_spec.typeName = "Xform"
+        layer.defaultPrim = root_spec.name
+        for part in files:
+            part = Path(part)
+            child = Sdf.CreatePrimInLayer(layer, root_spec.path.AppendChild(
+                part.stem.replace(".", "_")))
+            child.specifier = Sdf.SpecifierDef
+            child.typeName = "Xform"
+            relative = os.path.relpath(part, filepath.parent)
+            child.referenceList.Prepend(Sdf.Reference(f"./{Path(relative).as_posix()}"))
+    export_layer(layer, filepath)
+    return filepath
+
+
+def export_library(kind: str, grid: Sequence[Dict], output_dir,
+                   jobs: Optional[int] = None, chunk_size: int = 256,
+                   output_format: str = "usdc", merge: bool = True) -> LibraryResult:
+    """Generate every variant in ``grid`` across ``jobs`` processes
+
+    Chunk files are named ``{kind}_{index:05d}`` from the grid order, so the
+    output layout does not depend on the number of workers.
+    """
+    if kind not in PRIMITIVES:
+        raise ValueError(f"Unknown primitive {kind!r}; expected one of {sorted(PRIMITIVES)}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [
+        (kind, list(grid[start:start + chunk_size]),
+         str(output_dir / f"{kind}_{start // chunk_size:05d}"), output_format)
+        for start in range(0, len(grid), chunk_size)
+    ]
+
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [_export_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_export_chunk, tasks))
+
+    files = [Path(path) for path, _ in results]
+    names = [name for _, chunk_names in results for name in chunk_names]
+    merged = None
+    if merge and files:
+        merged = merge_by_reference(
+            files, resolve_path(output_dir / f"{kind}_library", output_format))
+    return LibraryResult(files, len(grid), time.perf_counter() - start,
+                         merged, jobs, names)
@@ -0,0 +1,153 @@
+"""
+Payload-based asset layout
+Every mesh under the default prim moves into its own payload layer; the
+interface layer keeps only a component Xform per asset with its bounds,
+counts and metadata, so referencing stages open without reading geometry
+"""
+from pxr import Kind, Sdf, Usd, UsdGeom
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import List, Optional
+import os
+
+import numpy as np
+
+from ..instrumentation import phase
+from .batch import author_extents_hint
+from .formats import ExportReport, export_layer, resolve_path
+
+GEOMETRY_CHILD = "Geometry"
+
+
+@dataclass
+class PayloadReport:
+    """The interface layer plus one export report per payload layer"""
+    interface: ExportReport
+    payloads: List[ExportReport] = field(default_factory=list)
+
+    @property
+    def size_bytes(self) -> int:
+        return self.interface.size_bytes + sum(p.size_bytes for p in self.payloads)
+
+    def summary(self) -> str:
+        heavy = sum(p.size_bytes for p in self.payloads)
+        return (f"{self.interface.path.name}: {self.interface.size_bytes / 1024:.1f} KB "
+                f"interface, {len(self.payloads)} payloads {heavy / 1024:.1f} KB")
+
+
+def _mesh_bounds(cache: UsdGeom.BBoxCache, prim: Usd.Prim,
+                 root: Usd.Prim) -> Optional[np.ndarray]:
+    """Bounds of ``prim`` in ``root``'s space, so the mesh's own xform counts"""
+    bounds = cache.ComputeRelativeBound(prim, root).ComputeAlignedRange()
+    if bounds.IsEmpty():
+        return None
+    return np.array([bounds.GetMin(), bounds.GetMax()])
+
+
+def _array_length(spec: Sdf.PrimSpec, name: str) -> int:
+    attr = spec.attributes.get(name)
+    return len(attr.default) if attr is not None and attr.default is not None else 0
+
+
+def export_with_payloads(layer: Sdf.Layer, filepath, payload_format: str = "usdc",
+                         output_format: Optional[str] = None) -> PayloadReport:
+    """Write ``layer`` as an interface layer plus one payload layer per mesh
+
+    Meshes directly under the default prim (or the first root prim) become
+    ``<Name>/Geometry`` inside ``<stem>_payloads/<Name>.<payload_format>``;
+    in the interface layer ``<Name>`` is a component Xform with
+    ``extentsHint``, the mesh's customData and vertex/face counts, and a
+    payload arc. ``layer`` itself is left untouched.
+    """
+    filepath = resolve_path(filepath, output_format)
+    if filepath.suffix == ".usdz":
+        raise ValueError("Payload layouts reference sibling layers and cannot be "
+                         "written as usdz")
+    interface = Sdf.Layer.CreateAnonymous(filepath.stem)
+    interface.TransferContent(layer)
+    if not interface.defaultPrim and interface.rootPrims:
+        interface.defaultPrim = interface.rootPrims[0].name
+    root = interface.GetPrimAtPath(Sdf.Path.absoluteRootPath.AppendChild(
+        interface.defaultPrim)) if interface.defaultPrim else None
+    if root is None:
+        raise ValueError("Payload export needs a layer with a root prim")
+
+    # Bounds come from the source stage, before the meshes leave the interface
+    source = Usd.Stage.Open(layer)
+    source_root = source.GetPrimAtPath(root.path)
+    bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(),
+                                   [UsdGeom.Tokens.default_, UsdGeom.Tokens.render])
+
+    payload_dir = filepath.with_name(f"{filepath.stem}_payloads")
+    payloads: List[ExportReport] = []
+    world_bounds = None
+    with phase("split_payloads") as timer:
+        for child in list(root.nameChildren):
+            if child.typeName != "Mesh":
+                continue
+            name = child.name
+            payload = Sdf.Layer.CreateAnonymous(name)
+            asset = Sdf.CreatePrimInLayer(payload, Sdf.Path.absoluteRootPath.AppendChild(name))
+            asset.specifier = Sdf.SpecifierDef
+            asset.typeName = "Xform"
+            payload.defaultPrim = name
+            Sdf.CopySpec(interface, child.path, payload, asset.path.AppendChild(GEOMETRY_CHILD))
+
+            bounds = _mesh_bounds(bbox_cache, source_root.GetChild(name), source_root)
+            counts = {"points": _array_length(child, "points"),
+                      "faces": _array_length(child, "faceVertexCounts")}
+            custom_data = dict(child.customData)
+            del root.nameChildren[name]
+
+            target = resolve_path(payload_dir / name, payload_format)
+            payloads.append(export_layer(payload, target))
+            relative = os.path.relpath(target, filepath.parent)
+
+            stub = Sdf.CreatePrimInLayer(interface, root.path.AppendChild(name))
+            stub.specifier = Sdf.SpecifierDef
+            stub.typeName = "Xform"
+            stub.kind = Kind.Tokens.component
+            stub.customData = dict(custom_data, geometry=counts)
+            stub.payloadList.Prepend(Sdf.Payload(f"./{Path(relative).as_posix()}"))
+            if bounds is not None:
+                author_extents_hint(stub, bounds)
+                world_bounds = bounds if world_bounds is None else np.stack([
+                    np.minimum(world_bounds[0], bounds[0]),
+                    np.maximum(world_bounds[1], bounds[1])])
+            timer.count(payloads=1, vertices=counts["points"])
+
+    root.kind = Kind.Tokens.assembly
+    if world_bounds is not None:
+        author_extents_hint(root, world_bounds)
+    return PayloadReport(export_layer(interface, filepath), payloads)
+
+
+if __name__ == "__main__":
+    import time
+    from pxr import Usd
+    from ..primitives.basic_shapes import GeometryData
+    from ..primitives.vectorized import sphere_arrays
+    from .batch import BatchStageWriter
+
+    with BatchStageWriter("payload_demo/library.usdc") as writer:
+        for index in range(64):
+            writer.add(f"sphere_{index}", GeometryData(*sphere_arrays(128, 1.0 + index)))
+    report = export_with_payloads(writer.layer, "payload_demo/library_payloads.usda")
+    print(report.summary())
+
+    from pxr import UsdGeom
+    for label, path, load in (("flat", writer.filepath, Usd.Stage.LoadAll),
+                              ("payloads, LoadNone", report.interface.path,
+                               Usd.Stage.LoadNone),
+                              ("payloads, LoadAll", report.interface.path,
+                               Usd.Stage.LoadAll)):
+        start = time.perf_counter()
+        stage = Usd.Stage.Open(str(path), load)
+        bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_],
+                                       useExtentsHint=True)
+        for prim in stage.Traverse():
+            if prim.IsA(UsdGeom.Mesh):
+                prim.GetAttribute("points").Get()
+        bounds = bbox_cache.ComputeWorldBound(stage.GetDefaultPrim()).ComputeAlignedRange()
+        print(f"  {label}: open, read loaded points and bound in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms ({bounds.GetMax()})")
@@ -0,0 +1,144 @@
+"""
+Proxy-purpose meshes from QEM simplification
+Every Mesh in a stage gets a ``<Name>_proxy`` sibling holding a simplified
+copy with ``purpose = proxy``; the source becomes ``render`` and points at
+it through ``proxyPrim``, so viewports and previews draw the light version
+"""
+from pxr import Gf, Usd, UsdGeom, Vt
+from typing import Dict, Optional
+import math
+
+import numpy as np
+
+from ..instrumentation import phase
+from ..primitives.derived import extent
+from ..primitives.simplify import SimplifyResult, simplify
+from .formats import ExportReport, export_layer, resolve_path
+
+PROXY_SUFFIX = "_proxy"
+
+# Meshes at or below this many faces are already cheap enough to draw
+MIN_SOURCE_FACES = 64
+
+
+def _proxy_path(mesh: UsdGeom.Mesh, suffix: str):
+    path = mesh.GetPath()
+    return path.GetParentPath().AppendChild(f"{path.name}{suffix}")
+
+
+def author_proxy(stage: Usd.Stage, mesh: UsdGeom.Mesh, target_faces: Optional[int] = None,
+                 max_error: Optional[float] = None,
+                 suffix: str = PROXY_SUFFIX) -> Optional[SimplifyResult]:
+    """Simplify one mesh's default-time geometry into a proxy sibling
+
+    The sibling copies the source's orientation and local transform. Returns
+    None (and authors nothing) for meshes without default-time points.
+    """
+    points = mesh.GetPointsAttr().Get()
+    counts = mesh.GetFaceVertexCountsAttr().Get()
+    indices = mesh.GetFaceVertexIndicesAttr().Get()
+    if not points or not counts or indices is None:
+        return None
+    result = simplify(np.asarray(points), np.asarray(counts), np.asarray(indices),
+                      target_faces, max_error)
+
+    proxy = UsdGeom.Mesh.Define(stage, _proxy_path(mesh, suffix))
+    geometry = result.geometry
+    vt_points, vt_counts, vt_indices = geometry.to_vt()
+    proxy.CreatePointsAttr().Set(vt_points)
+    proxy.CreateFaceVertexCountsAttr().Set(vt_counts)
+    proxy.CreateFaceVertexIndicesAttr().Set(vt_indices)
+    proxy.CreateExtentAttr().Set(Vt.Vec3fArray.FromNumpy(extent(geometry.points)))
+    proxy.CreateOrientationAttr().Set(mesh.GetOrientationAttr().Get())
+    proxy.CreateSubdivisionSchemeAttr().Set("none")
+    proxy.CreatePurposeAttr().Set(UsdGeom.Tokens.proxy)
+    # Replaces whatever a previous run left on the sibling
+    proxy.ClearXformOpOrder()
+    local, resets = mesh.GetLocalTransformation(), mesh.GetResetXformStack()
+    if resets or local != Gf.Matrix4d(1.0):
+        proxy.SetResetXformStack(resets)
+        proxy.AddTransformOp().Set(local)
+
+    mesh.CreatePurposeAttr().Set(UsdGeom.Tokens.render)
+    mesh.GetProxyPrimRel().SetTargets([proxy.GetPath()])
+    proxy.GetPrim().SetCustomDataByKey("simplify", {
+        "source": str(mesh.GetPath()),
+        "source_faces": result.source_faces,
+        "faces": geometry.num_faces,
+        "error": result.error,
+    })
+    return result
+
+
+def author_proxies(stage: Usd.Stage, ratio: Optional[float] = 0.1,
+                   max_error: Optional[float] = None, min_faces: int = MIN_SOURCE_FACES,
+                   suffix: str = PROXY_SUFFIX) -> Dict[str, SimplifyResult]:
+    """Author a proxy for every render/default Mesh with more than ``min_faces``
+
+    ``ratio`` is the fraction of (triangulated) faces to keep and
+    ``max_error`` caps the quadric error; with both, whichever stops first
+    wins. Existing proxies and guides are left alone, so running this twice
+    re-simplifies into the same siblings.
+    """
+    if ratio is None and max_error is None:
+        raise ValueError("author_proxies() needs a face ratio or a max_error")
+    if ratio is not None and not 0 < ratio < 1:
+        raise ValueError(f"Proxy face ratio must be between 0 and 1, got {ratio}")
+
+    # Collected first: defining siblings while traversing would visit them
+    meshes = [UsdGeom.Mesh(prim) for prim in stage.Traverse() if prim.IsA(UsdGeom.Mesh)]
+    results: Dict[str, SimplifyResult] = {}
+    with phase("author_proxies") as timer:
+        for mesh in meshes:
+            if mesh.GetPurposeAttr().Get() in (UsdGeom.Tokens.proxy, UsdGeom.Tokens.guide):
+                continue
+            counts = mesh.GetFaceVertexCountsAttr().Get()
+            if not counts or len(counts) <= min_faces:
+                continue
+            # Quads and n-gons become n - 2 triangles before simplification
+            triangles = int(np.asarray(counts).sum()) - 2 * len(counts)
+            target = None if ratio is None else max(math.ceil(triangles * ratio), 1)
+            result = author_proxy(stage, mesh, target, max_error, suffix)
+            if result is not None:
+                results[str(mesh.GetPath())] = result
+                timer.count(meshes=1, faces_in=result.source_faces,
+                            faces_out=result.geometry.num_faces)
+    return results
+
+
+def simplify_file(source, destination, ratio: Optional[float] = 0.1,
+                  max_error: Optional[float] = None,
+                  output_format: Optional[str] = None) -> ExportReport:
+    """Open ``source``, author proxies for its meshes and write ``destination``
+
+    Only the root layer is rewritten; meshes that come in through
+    references or payloads get their proxies authored as overrides.
+    """
+    stage = Usd.Stage.Open(str(source))
+    if stage is None:
+        raise ValueError(f"Could not open USD file {source}")
+    author_proxies(stage, ratio, max_error)
+    return export_layer(stage.GetRootLayer(), resolve_path(destination, output_format))
+
+
+if __name__ == "__main__":
+    import time
+    from ..primitives.basic_shapes import GeometryData
+    from ..primitives.vectorized import sphere_arrays
+
+    stage = Usd.Stage.CreateInMemory()
+    world = UsdGeom.Xform.Define(stage, "/World")
+    stage.SetDefaultPrim(world.GetPrim())
+    for topology, resolution in (("uv", 128), ("ico", 128), ("cube", 64)):
+        mesh = UsdGeom.Mesh.Define(stage, f"/World/{topology.title()}Sphere")
+        points, counts, indices = GeometryData(*sphere_arrays(resolution, 1.0, topology)).to_vt()
+        mesh.CreatePointsAttr().Set(points)
+        mesh.CreateFaceVertexCountsAttr().Set(counts)
+        mesh.CreateFaceVertexIndicesAttr().Set(indices)
+        mesh.CreateOrientationAttr().Set("leftHanded")
+
+    start = time.perf_counter()
+    for path, result in author_proxies(stage, ratio=0.05).items():
+        print(f"  {path}: {result.summary()}")
+    print(f"Simplified in {time.perf_counter() - start:.2f} s")
+    print(export_layer(stage.GetRootLayer(), "proxy_demo/spheres.usda").summary())
@@ -0,0 +1,171 @@
+"""
+Opt-in hot-path timing for geometry generation, conversion, save and analysis
+Enable with USD_GEOMETRY_PROFILE=1 (summary table at exit) or
+USD_GEOMETRY_PROFILE=path/to/trace.json (Chrome trace at exit);
+records are kept per process, so pool workers are not included
+"""
+import atexit
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+ENV_VAR = "USD_GEOMETRY_PROFILE"
+
+
+@dataclass
+class PhaseRecord:
+    """One timed phase: ``args`` describe it, ``counters`` are summed"""
+    name: str
+    start_ns: int
+    duration_ns: int = 0
+    args: Dict[str, object] = field(default_factory=dict)
+    counters: Dict[str, float] = field(default_factory=dict)
+    pid: int = 0
+    tid: int = 0
+
+
+class _NullPhase:
+    """Shared no-op phase returned while profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, **counters):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("recorder", "record")
+
+    def __init__(self, recorder: "Recorder", name: str, args: Dict):
+        self.recorder = recorder
+        self.record = PhaseRecord(name, 0, args=args,
+                                  pid=os.getpid(), tid=threading.get_ident())
+
+    def __enter__(self):
+        self.record.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.record.duration_ns = time.perf_counter_ns() - self.record.start_ns
+        self.recorder.add(self.record)
+        return False
+
+    def count(self, **counters):
+        """Add to this phase's counters, e.g. ``count(vertices=n)``"""
+        for key, value in counters.items():
+            self.record.counters[key] = self.record.counters.get(key, 0) + value
+
+
+class Recorder:
+    """Collects phase records and renders them as a table or Chrome trace"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.records: List[PhaseRecord] = []
+        self._lock = threading.Lock()
+
+    def phase(self, name: str, **args):
+        """Context manager timing one block into this recorder (see ``phase()``)"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name, args)
+
+    def add(self, record: PhaseRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-phase call count, total/mean/max seconds and summed counters"""
+        phases: Dict[str, Dict[str, float]] = {}
+        for record in self.records:
+            entry = phases.setdefault(record.name, {"calls": 0, "total_s": 0.0,
+                                                    "max_s": 0.0})
+            seconds = record.duration_ns / 1e9
+            entry["calls"] += 1
+            entry["total_s"] += seconds
+            entry["max_s"] = max(entry["max_s"], seconds)
+            for key, value in record.counters.items():
+                entry[key] = entry.get(key, 0) + value
+        for entry in phases.values():
+            entry["mean_s"] = entry["total_s"] / entry["calls"]
+        return phases
+
+    def summary_table(self) -> str:
+        """Aligned text table of summary(), slowest phases first"""
+        rows = sorted(self.summary().items(), key=lambda item: -item[1]["total_s"])
+        lines = [f"{'phase':<28}{'calls':>8}{'total ms':>12}{'mean ms':>12}  counters"]
+        for name, entry in rows:
+            counters = ", ".join(f"{key}={int(value)}" for key, value in entry.items()
+                                 if key not in ("calls", "total_s", "max_s", "mean_s"))
+            lines.append(f"{name:<28}{entry['calls']:>8}{entry['total_s'] * 1000:>12.2f}"
+                         f"{entry['mean_s'] * 1000:>12.3f}  {counters}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict:
+        """Records as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        events = [{
+            "name": record.name,
+            "cat": "usd-geometry",
+            "ph": "X",
+            "ts": record.start_ns / 1000,
+            "dur": record.duration_ns / 1000,
+            "pid": record.pid,
+            "tid": record.tid,
+            "args": dict(record.args, **record.counters),
+        } for record in self.records]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, filepath) -> Path:
+        filepath = Path(filepath)
+        filepath.write_text(json.dumps(self.chrome_trace(), default=str))
+        return filepath
+
+
+def _setting() -> str:
+    return os.environ.get(ENV_VAR, "").strip()
+
+
+RECORDER = Recorder(enabled=_setting().lower() not in ("", "0", "false", "no"))
+
+
+def phase(name: str, **args):
+    """Time a block: ``with phase("save", format="usdc") as p: ...; p.count(bytes=n)``
+
+    Keyword ``args`` label the trace event; ``count()`` adds summed counters.
+    Returns a shared no-op object when profiling is disabled.
+    """
+    return RECORDER.phase(name, **args)
+
+
+def _report_at_exit():
+    # Pool workers import this module too; only the parent reports
+    if not RECORDER.records or multiprocessing.parent_process() is not None:
+        return
+    setting = _setting()
+    if setting.endswith(".json"):
+        RECORDER.write_chrome_trace(setting)
+        print(f"⏱️  Chrome trace written to {setting}", file=sys.stderr)
+    else:
+        print(RECORDER.summary_table(), file=sys.stderr)
+
+
+if RECORDER.enabled:
+    atexit.register(_report_at_exit)
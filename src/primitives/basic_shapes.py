@@ -2,41 +2,71 @@
 Basic 3D shape generators for USD export
 Following PEP 20 principles of elegance and simplicity
 """
-from pxr import Usd, UsdGeom, Sdf
-from pathlib import Path
-import math
-from typing import List, Tuple
-from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from .vectorized import INDEX_DTYPE, POINT_DTYPE, cone_arrays, to_vt
+
+PointsLike = Union[np.ndarray, Sequence[Tuple[float, float, float]]]
+IndicesLike = Union[np.ndarray, Sequence[int]]
 
-@dataclass
 class GeometryData:
-    """Elegant data structure for 3D geometry"""
-    points: List[Tuple[float, float, float]]
-    face_vertex_counts: List[int]
-    face_vertex_indices: List[int]
+    """Elegant data structure for 3D geometry backed by contiguous arrays
+
+    Points are stored as float32 ``(N, 3)`` and topology as int32 buffers,
+    so hand-off to USD attributes goes through the buffer protocol instead
+    of one Python object per element.
+    """
+    __slots__ = ("points", "face_vertex_counts", "face_vertex_indices")
+
+    def __init__(self, points: PointsLike, face_vertex_counts: IndicesLike,
+                 face_vertex_indices: IndicesLike):
+        self.points = np.ascontiguousarray(points, dtype=POINT_DTYPE).reshape(-1, 3)
+        self.face_vertex_counts = np.ascontiguousarray(
+            face_vertex_counts, dtype=INDEX_DTYPE).reshape(-1)
+        self.face_vertex_indices = np.ascontiguousarray(
+            face_vertex_indices, dtype=INDEX_DTYPE).reshape(-1)
+
+    @classmethod
+    def from_vt(cls, points, face_vertex_counts, face_vertex_indices) -> "GeometryData":
+        """Wrap Vt arrays (e.g. from ``GetPointsAttr().Get()``) without per-element copies"""
+        return cls(np.asarray(points), np.asarray(face_vertex_counts),
+                   np.asarray(face_vertex_indices))
+
+    def to_vt(self):
+        """Return ``(Vt.Vec3fArray, Vt.IntArray, Vt.IntArray)`` for attribute ``Set()``"""
+        return to_vt(self.points, self.face_vertex_counts, self.face_vertex_indices)
+
+    @property
+    def num_points(self) -> int:
+        return len(self.points)
+
+    @property
+    def num_faces(self) -> int:
+        return len(self.face_vertex_counts)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the point and index buffers"""
+        return (self.points.nbytes + self.face_vertex_counts.nbytes
+                + self.face_vertex_indices.nbytes)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GeometryData):
+            return NotImplemented
+        return (np.array_equal(self.points, other.points)
+                and np.array_equal(self.face_vertex_counts, other.face_vertex_counts)
+                and np.array_equal(self.face_vertex_indices, other.face_vertex_indices))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"GeometryData(points={self.num_points}, faces={self.num_faces})"
 
 def create_cone(resolution: int = 12, height: float = 2.0) -> GeometryData:
     """Create cone geometry with mathematical precision"""
-    # Generate base circle points
-    points = [
-        (math.cos(2 * math.pi * i / resolution), 0, 
-         math.sin(2 * math.pi * i / resolution))
-        for i in range(resolution)
-    ]
-    
-    # Add apex
-    points.append((0, height, 0))
-    
-    # Generate triangular faces
-    face_vertex_indices = []
-    face_vertex_counts = []
-    
-    for i in range(resolution):
-        triangle = [i, (i + 1) % resolution, resolution]
-        face_vertex_indices.extend(triangle)
-        face_vertex_counts.append(3)
-    
-    return GeometryData(points, face_vertex_counts, face_vertex_indices)
+    return GeometryData(*cone_arrays(resolution, height, base=False))
 
 if __name__ == "__main__":
     # Test the cone creation
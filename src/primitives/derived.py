@@ -0,0 +1,98 @@
+"""
+Per-mesh data derived from points and topology: extents and normals
+Computed with NumPy at export time so consumers read bounds and shading
+normals from attributes instead of walking every point on load
+"""
+import numpy as np
+from typing import Tuple
+
+from .topology_cache import TOPOLOGY_CACHE
+from .vectorized import POINT_DTYPE, sphere_arrays
+
+NORMAL_MODES = ("smooth", "faceted")
+
+
+def extent(points: np.ndarray) -> np.ndarray:
+    """``[min, max]`` corners of the axis-aligned bounds as a (2, 3) array"""
+    points = np.asarray(points)
+    if len(points) == 0:
+        return np.zeros((2, 3), dtype=POINT_DTYPE)
+    return np.stack([points.min(axis=0), points.max(axis=0)]).astype(POINT_DTYPE)
+
+
+def face_normals(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                 orientation: str = "leftHanded", normalize: bool = True) -> np.ndarray:
+    """One outward normal per face, from Newell's method
+
+    Works for any polygon size; unnormalized normals have a length of twice
+    the face area, which vertex_normals() uses as the weight.
+    """
+    # Float32 halves the memory traffic; primitives sit near the origin,
+    # so the cross products do not lose meaningful precision
+    points = np.asarray(points, dtype=POINT_DTYPE)
+    counts = np.asarray(counts)
+    indices = np.asarray(indices)
+    if len(counts) == 0:
+        return np.zeros((0, 3), dtype=POINT_DTYPE)
+
+    starts = np.cumsum(counts) - counts
+    following = np.arange(1, len(indices) + 1)
+    following[starts + counts - 1] = starts
+    following = indices[following]
+    # Per-component 1-D gathers are much cheaper than np.cross on (N, 3) rows
+    x, y, z = (np.ascontiguousarray(points[:, axis]) for axis in range(3))
+    x0, y0, z0 = x[indices], y[indices], z[indices]
+    x1, y1, z1 = x[following], y[following], z[following]
+    cross = (y0 * z1 - z0 * y1, z0 * x1 - x0 * z1, x0 * y1 - y0 * x1)
+    if np.all(counts == counts[0]):
+        normals = np.stack([c.reshape(-1, counts[0]).sum(axis=1) for c in cross], axis=1)
+    else:
+        normals = np.stack([np.add.reduceat(c, starts) for c in cross], axis=1)
+    if orientation == "leftHanded":
+        # Clockwise winding: Newell's normal points inward
+        normals = -normals
+    if normalize:
+        normals = _normalized(normals)
+    return normals.astype(POINT_DTYPE)
+
+
+def vertex_normals(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                   orientation: str = "leftHanded") -> np.ndarray:
+    """Area-weighted average of the normals of the faces around each point"""
+    weighted = face_normals(points, counts, indices, orientation, normalize=False)
+    counts = np.asarray(counts)
+    normals = np.stack([
+        np.bincount(indices, weights=np.repeat(weighted[:, axis], counts),
+                    minlength=len(points))
+        for axis in range(3)
+    ], axis=1)
+    return _normalized(normals).astype(POINT_DTYPE)
+
+
+def mesh_normals(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                 mode: str = "smooth",
+                 orientation: str = "leftHanded") -> Tuple[np.ndarray, str]:
+    """Normals plus the USD interpolation they need (``vertex`` or ``uniform``)"""
+    if mode == "smooth":
+        return vertex_normals(points, counts, indices, orientation), "vertex"
+    if mode == "faceted":
+        return face_normals(points, counts, indices, orientation), "uniform"
+    raise ValueError(f"Unknown normal mode {mode!r}; expected one of {NORMAL_MODES}")
+
+
+def sphere_normals(resolution: int, topology: str = "uv",
+                   mode: str = "smooth") -> Tuple[np.ndarray, str]:
+    """Normals for sphere_arrays(); they do not depend on the radius, so
+    they are computed once per topology and kept in the topology cache"""
+    if mode not in NORMAL_MODES:
+        raise ValueError(f"Unknown normal mode {mode!r}; expected one of {NORMAL_MODES}")
+    (normals,) = TOPOLOGY_CACHE.get(
+        ("sphere_normals", topology, resolution, mode),
+        lambda: (mesh_normals(*sphere_arrays(resolution, 1.0, topology), mode)[0],))
+    return normals, "vertex" if mode == "smooth" else "uniform"
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    # Degenerate faces and unused points keep a zero normal
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
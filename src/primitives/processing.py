@@ -0,0 +1,461 @@
+"""
+Mesh processing stages on array-backed geometry: validation, triangulation
+and vertex welding
+Every stage takes and returns (points, counts, indices), so they chain in
+front of any exporter; per-face work runs on the flat count and index
+buffers with NumPy rather than per-face Python loops
+"""
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple
+
+from .vectorized import INDEX_DTYPE, POINT_DTYPE, MeshArrays
+
+TRIANGULATION_METHODS = ("fan", "ear", "auto")
+
+# Cell coordinates are packed into one int64 key, 21 bits per axis
+_CELL_BITS = 21
+_CELL_LIMIT = 1 << _CELL_BITS
+
+# Ear tests check candidates against every corner of their face; faces are
+# batched so one (faces, candidates, n) block stays near this many elements
+_EAR_BATCH_ELEMENTS = 1 << 22
+
+
+def face_starts(counts: np.ndarray) -> np.ndarray:
+    """Offset of each face's first corner in the index buffer"""
+    counts = np.asarray(counts, dtype=np.int64)
+    return np.cumsum(counts) - counts
+
+
+def _corner_faces(counts: np.ndarray) -> np.ndarray:
+    """Face number of every corner"""
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+def _by_size(counts: np.ndarray,
+             indices: np.ndarray) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """Yield ``(size, faces, corners (F, size))`` for each distinct face size
+
+    Reshaping same-sized faces into a 2-D block turns per-face loops into
+    row operations; a mesh of one face size is a single reshape.
+    """
+    if len(counts) and (counts == counts[0]).all():
+        size = int(counts[0])
+        yield size, np.arange(len(counts)), indices.reshape(-1, size)
+        return
+    starts = face_starts(counts)
+    for size in np.unique(counts):
+        faces = np.flatnonzero(counts == size)
+        yield int(size), faces, indices[starts[faces][:, None] + np.arange(size)]
+
+
+def _next_corners(counts: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Position of the following corner of the same face, wrapping around"""
+    following = np.arange(1, int(counts.sum()) + 1)
+    nonempty = counts > 0
+    following[(starts + counts - 1)[nonempty]] = starts[nonempty]
+    return following
+
+
+@dataclass
+class ValidationReport:
+    """Topology problems found by validate_mesh(); empty arrays mean none"""
+    num_points: int
+    num_faces: int
+    # len(indices) - sum(counts); per-face checks are skipped when non-zero
+    count_mismatch: int = 0
+    negative_counts: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    short_faces: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    out_of_range: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    degenerate_faces: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    non_finite_points: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    # Not an error, but worth compacting before export
+    unused_points: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.count_mismatch or len(self.negative_counts)
+                    or len(self.short_faces) or len(self.out_of_range)
+                    or len(self.degenerate_faces) or len(self.non_finite_points))
+
+    def summary(self) -> str:
+        problems = [
+            f"{label}: {value}" for label, value in (
+                ("count mismatch", self.count_mismatch),
+                ("negative counts", len(self.negative_counts)),
+                ("faces under 3 vertices", len(self.short_faces)),
+                ("indices out of range", len(self.out_of_range)),
+                ("degenerate faces", len(self.degenerate_faces)),
+                ("non-finite points", len(self.non_finite_points)),
+                ("unused points", self.unused_points),
+            ) if value
+        ]
+        state = "valid" if self.ok else "INVALID"
+        details = f" ({', '.join(problems)})" if problems else ""
+        return f"{self.num_points} points, {self.num_faces} faces: {state}{details}"
+
+    def raise_if_invalid(self):
+        if not self.ok:
+            raise ValueError(f"Invalid mesh: {self.summary()}")
+
+
+def validate_mesh(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                  area_tolerance: float = 1e-6) -> ValidationReport:
+    """Check index bounds, the counts sum and degenerate faces
+
+    A face is degenerate when it repeats a vertex or its area is below
+    ``area_tolerance`` times its longest edge squared (collinear corners
+    and slivers; the default sits above float32 rounding).
+    """
+    points = np.asarray(points).reshape(-1, 3)
+    counts = np.asarray(counts, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    report = ValidationReport(len(points), len(counts))
+    report.non_finite_points = np.flatnonzero(~np.isfinite(points).all(axis=1))
+    report.negative_counts = np.flatnonzero(counts < 0)
+    report.short_faces = np.flatnonzero((counts >= 0) & (counts < 3))
+    if len(report.negative_counts):
+        return report
+    report.count_mismatch = len(indices) - int(counts.sum())
+    if report.count_mismatch:
+        return report
+
+    in_range = (indices >= 0) & (indices < len(points))
+    report.out_of_range = np.flatnonzero(~in_range)
+    used = np.zeros(len(points), dtype=bool)
+    used[indices[in_range]] = True
+    report.unused_points = len(points) - int(np.count_nonzero(used))
+    if len(report.out_of_range) or len(counts) == 0:
+        return report
+
+    degenerate = np.zeros(len(counts), dtype=bool)
+    x, y, z = _components(points)
+    for size, faces, corners in _by_size(counts, indices):
+        if size < 3:
+            continue
+        # Repeated vertices: sort each face's corners and compare neighbours
+        ordered = np.sort(corners, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        # Twice the area from corners relative to the first, which keeps
+        # float32 cancellation proportional to the face's own size
+        dx, dy, dz = (c[corners[:, 1:]] - c[corners[:, :1]] for c in (x, y, z))
+        doubled = np.sqrt(sum(
+            (u[:, :-1] * v[:, 1:] - v[:, :-1] * u[:, 1:]).sum(axis=1) ** 2
+            for u, v in ((dy, dz), (dz, dx), (dx, dy))))
+        longest = np.sum([(c[np.roll(corners, -1, axis=1)] - c[corners]) ** 2
+                          for c in (x, y, z)], axis=0).max(axis=1)
+        degenerate[faces] = repeated | (doubled <= 2.0 * area_tolerance * longest)
+    report.degenerate_faces = np.flatnonzero(degenerate)
+    return report
+
+
+def _fan(counts: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """(T, 3) fan triangles around each face's first corner, in face order"""
+    starts = face_starts(counts)
+    tri_counts = np.maximum(counts - 2, 0)
+    total = int(tri_counts.sum())
+    first = np.repeat(starts, tri_counts)
+    local = np.arange(total) - np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts)
+    return np.stack([indices[first], indices[first + local + 1],
+                     indices[first + local + 2]], axis=1)
+
+
+def _components(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Per-component float32 gathers, as in derived.face_normals()
+    points = np.asarray(points, dtype=POINT_DTYPE).reshape(-1, 3)
+    return tuple(np.ascontiguousarray(points[:, axis]) for axis in range(3))
+
+
+def _reflex_corners(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                    corners: np.ndarray) -> np.ndarray:
+    """(F, n) mask of corners whose turn points against the face's Newell normal
+
+    Works for either winding without projecting to 2-D.
+    """
+    px, py, pz = x[corners], y[corners], z[corners]
+    nx, ny, nz = (np.roll(c, -1, axis=1) for c in (px, py, pz))
+    normal = [(py * nz - pz * ny).sum(axis=1, keepdims=True),
+              (pz * nx - px * nz).sum(axis=1, keepdims=True),
+              (px * ny - py * nx).sum(axis=1, keepdims=True)]
+    # Incoming x outgoing edge at every corner
+    ix, iy, iz = (c - np.roll(c, 1, axis=1) for c in (px, py, pz))
+    ox, oy, oz = nx - px, ny - py, nz - pz
+    facing = ((iy * oz - iz * oy) * normal[0] + (iz * ox - ix * oz) * normal[1]
+              + (ix * oy - iy * ox) * normal[2])
+    return facing < 0.0
+
+
+def concave_faces(points: np.ndarray, counts: np.ndarray,
+                  indices: np.ndarray) -> np.ndarray:
+    """Faces with a reflex corner, i.e. those a fan may triangulate wrongly"""
+    counts = np.asarray(counts, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    x, y, z = _components(points)
+    concave = [np.empty(0, dtype=np.int64)]
+    for size, faces, corners in _by_size(counts, indices):
+        if size > 3:
+            concave.append(faces[_reflex_corners(x, y, z, corners).any(axis=1)])
+    return np.sort(np.concatenate(concave))
+
+
+def _split_quads(points: np.ndarray, quads: np.ndarray) -> np.ndarray:
+    """(F, 4) quads -> (F, 2, 3) triangles split along the diagonal that stays
+    inside: through corner 1 or 3 when either is reflex, else through 0"""
+    reflex = _reflex_corners(*_components(points), quads)
+    through_odd = reflex[:, 1] | reflex[:, 3]
+    order = np.where(through_odd[:, None], np.array([1, 2, 3, 3, 0, 1]),
+                     np.array([0, 1, 2, 0, 2, 3]))
+    return np.take_along_axis(quads, order, axis=1).reshape(-1, 2, 3)
+
+
+def _project(points: np.ndarray, normals: np.ndarray) -> np.ndarray:
+    """Drop each face's dominant normal axis; (F, n, 3) -> (F, n, 2), counter-clockwise"""
+    axis = np.abs(normals).argmax(axis=1)
+    keep = np.array([[1, 2], [2, 0], [0, 1]])[axis]
+    flat = np.take_along_axis(points, keep[:, None, :], axis=2)
+    # (1, 2), (2, 0), (0, 1) are cyclic, so the sign of the dropped
+    # component tells whether the projected polygon is clockwise
+    flip = np.take_along_axis(normals, axis[:, None], axis=1)[:, 0] < 0
+    flat[flip, :, 0] *= -1.0
+    return flat
+
+
+def _ear_clip(points: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Ear-clip ``faces`` (F, n) of one size together; returns (F, n - 2, 3)
+
+    Each round clips the first ear of every face at once. Clipping only
+    changes the ear status of the two neighbours, so only they are
+    re-tested; a face left without a known ear is fully re-tested, and one
+    with no valid ear at all (self-intersecting or degenerate) clips its
+    first remaining corner so the output always has n - 2 triangles.
+    """
+    count, size = faces.shape
+    corners = points[faces]
+    centered = corners - corners.mean(axis=1, keepdims=True)
+    normals = np.cross(centered, np.roll(centered, -1, axis=1)).sum(axis=1)
+    flat = _project(corners, normals)
+
+    rows = np.arange(count)
+    alive = np.ones((count, size), dtype=bool)
+    nxt = np.tile(np.roll(np.arange(size), -1), (count, 1))
+    prv = np.tile(np.roll(np.arange(size), 1), (count, 1))
+    triangles = np.empty((count, size - 2, 3), dtype=np.int64)
+    fx, fy = np.ascontiguousarray(flat[..., 0]), np.ascontiguousarray(flat[..., 1])
+
+    def is_ear(face_rows: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """(R, k) ear test of corner ``candidates`` in faces ``face_rows``"""
+        batch = max(1, _EAR_BATCH_ELEMENTS // (candidates.shape[1] * size))
+        if len(face_rows) > batch:
+            return np.concatenate([is_ear(face_rows[first:first + batch],
+                                          candidates[first:first + batch])
+                                   for first in range(0, len(face_rows), batch)])
+        r = face_rows[:, None]
+        before, after = prv[r, candidates], nxt[r, candidates]
+        triangle = [(fx[r, corner][..., None], fy[r, corner][..., None])
+                    for corner in (before, candidates, after)]
+        px, py = fx[face_rows][:, None, :], fy[face_rows][:, None, :]
+        # (R, candidate, other): a corner on the inner side of all three
+        # edges (inclusive) lies in the candidate triangle
+        inside = np.logical_and.reduce([
+            (ex - ox) * py - (ey - oy) * px >= (ex - ox) * oy - (ey - oy) * ox
+            for (ox, oy), (ex, ey) in zip(triangle, triangle[1:] + triangle[:1])])
+        (ax, ay), (bx, by), (cx, cy) = triangle
+        convex = ((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))[..., 0] > 0.0
+        others = np.arange(size)
+        others = (alive[face_rows][:, None, :] & (others != candidates[..., None])
+                  & (others != before[..., None]) & (others != after[..., None]))
+        return alive[r, candidates] & convex & ~(inside & others).any(axis=2)
+
+    ears = is_ear(rows, np.tile(np.arange(size), (count, 1)))
+    for step in range(size - 3):
+        stale = np.flatnonzero(~ears.any(axis=1))
+        if len(stale):
+            ears[stale] = is_ear(stale, np.tile(np.arange(size), (len(stale), 1)))
+        clip = np.where(ears.any(axis=1), ears.argmax(axis=1), alive.argmax(axis=1))
+
+        before, after = prv[rows, clip], nxt[rows, clip]
+        triangles[:, step] = np.stack([before, clip, after], axis=1)
+        alive[rows, clip] = False
+        ears[rows, clip] = False
+        nxt[rows, before] = after
+        prv[rows, after] = before
+        neighbours = np.stack([before, after], axis=1)
+        ears[rows[:, None], neighbours] = is_ear(rows, neighbours)
+
+    last = alive.argmax(axis=1)
+    triangles[:, size - 3] = np.stack([prv[rows, last], last, nxt[rows, last]], axis=1)
+    # Corner positions back to point indices
+    return np.take_along_axis(faces[:, None, :], triangles, axis=2)
+
+
+def triangulate(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                method: str = "auto") -> MeshArrays:
+    """Split every face into triangles that keep its winding
+
+    ``fan`` connects each face's first corner to the rest (exact for convex
+    faces), ``ear`` ear-clips every polygon and ``auto`` ear-clips only the
+    faces concave_faces() finds. Triangles stay grouped in face order, so
+    ``triangle_faces(counts)`` maps them back to their source faces. Faces
+    with fewer than three corners are dropped.
+    """
+    if method not in TRIANGULATION_METHODS:
+        raise ValueError(f"Unknown triangulation method {method!r}; "
+                         f"expected one of {TRIANGULATION_METHODS}")
+    counts = np.asarray(counts, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(counts) and (counts == 3).all():
+        return (points, np.asarray(counts, dtype=INDEX_DTYPE),
+                np.asarray(indices, dtype=INDEX_DTYPE))
+
+    triangles = _fan(counts, indices)
+    if method == "ear":
+        clipped = np.flatnonzero(counts > 3)
+    elif method == "auto":
+        clipped = concave_faces(points, counts, indices)
+    else:
+        clipped = np.empty(0, dtype=np.int64)
+
+    if len(clipped):
+        corner_points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        starts = face_starts(counts)
+        tri_counts = np.maximum(counts - 2, 0)
+        tri_starts = np.cumsum(tri_counts) - tri_counts
+        for size in np.unique(counts[clipped]):
+            group = clipped[counts[clipped] == size]
+            faces = indices[starts[group][:, None] + np.arange(size)]
+            rows = tri_starts[group][:, None] + np.arange(size - 2)
+            # A quad has a single ear choice, so it needs no clipping rounds
+            clip = _split_quads if size == 4 else _ear_clip
+            triangles[rows.ravel()] = clip(corner_points, faces).reshape(-1, 3)
+
+    return (points, np.full(len(triangles), 3, dtype=INDEX_DTYPE),
+            triangles.astype(INDEX_DTYPE).ravel())
+
+
+def triangle_faces(counts: np.ndarray) -> np.ndarray:
+    """Source face of every triangle triangulate() emits for ``counts``"""
+    counts = np.asarray(counts, dtype=np.int64)
+    return np.repeat(np.arange(len(counts)), np.maximum(counts - 2, 0))
+
+
+def _pack_cells(cells: np.ndarray) -> np.ndarray:
+    # Sums rather than ORs, so negative neighbour offsets pack too
+    return (cells[:, 0] << (2 * _CELL_BITS)) + (cells[:, 1] << _CELL_BITS) + cells[:, 2]
+
+
+def _cell_pairs(first_cells: np.ndarray, second_cells: np.ndarray, starts: np.ndarray,
+                sizes: np.ndarray, order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (point in first cell, point in second cell) combination"""
+    left, right = sizes[first_cells], sizes[second_cells]
+    totals = left * right
+    local = np.arange(int(totals.sum())) - np.repeat(np.cumsum(totals) - totals, totals)
+    right_sizes = np.repeat(right, totals)
+    a = order[np.repeat(starts[first_cells], totals) + local // right_sizes]
+    b = order[np.repeat(starts[second_cells], totals) + local % right_sizes]
+    return a, b
+
+
+def weld_map(points: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """``(remap, keep)`` merging points closer than ``tolerance``
+
+    Points are hashed to a grid of ``tolerance``-sized cells, so only
+    points in the same or adjacent cells are ever compared. Clusters are
+    the connected components of the within-tolerance graph; ``keep`` holds
+    the lowest original index of each cluster and ``remap[i]`` is the
+    position of point ``i``'s cluster in ``keep``.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"Weld tolerance must be positive, got {tolerance}")
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Cells start at 1 so a neighbour at -1 never borrows across packed axes
+    cells = np.floor((points - points.min(axis=0)) / tolerance).astype(np.int64) + 1
+    if cells.max() >= _CELL_LIMIT - 1:
+        raise ValueError(f"Weld tolerance {tolerance} is too small for a mesh this "
+                         f"large; cells are limited to {_CELL_LIMIT - 3} per axis")
+    keys = _pack_cells(cells)
+    order = np.argsort(keys, kind="stable")
+    cell_keys, starts, sizes = np.unique(keys[order], return_index=True,
+                                         return_counts=True)
+
+    # Same cell, then the 13 "forward" neighbours so each cell pair is seen once
+    shared = np.flatnonzero(sizes > 1)
+    a, b = _cell_pairs(shared, shared, starts, sizes, order)
+    pairs_a, pairs_b = [a[a < b]], [b[a < b]]
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+               if (dx, dy, dz) > (0, 0, 0)]
+    for delta in _pack_cells(np.array(offsets, dtype=np.int64)):
+        wanted = cell_keys + delta
+        found = np.minimum(np.searchsorted(cell_keys, wanted), len(cell_keys) - 1)
+        hit = np.flatnonzero(cell_keys[found] == wanted)
+        a, b = _cell_pairs(hit, found[hit], starts, sizes, order)
+        pairs_a.append(a)
+        pairs_b.append(b)
+
+    a, b = np.concatenate(pairs_a), np.concatenate(pairs_b)
+    close = np.einsum("ij,ij->i", points[a] - points[b], points[a] - points[b])
+    a, b = a[close <= tolerance * tolerance], b[close <= tolerance * tolerance]
+
+    # Min-label propagation with pointer jumping
+    labels = np.arange(len(points))
+    while True:
+        lowest = np.minimum(labels[a], labels[b])
+        updated = labels.copy()
+        np.minimum.at(updated, a, lowest)
+        np.minimum.at(updated, b, lowest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    keep = np.flatnonzero(labels == np.arange(len(points)))
+    return np.searchsorted(keep, labels), keep
+
+
+def weld(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+         tolerance: float = 1e-6, drop_degenerate: bool = True) -> MeshArrays:
+    """Merge points within ``tolerance`` and re-index the faces
+
+    With ``drop_degenerate`` a corner that now repeats the next corner of
+    its face is removed (a collapsed quad becomes a triangle) and faces
+    left with fewer than three corners are dropped.
+    """
+    remap, keep = weld_map(points, tolerance)
+    counts = np.asarray(counts, dtype=np.int64)
+    indices = remap[np.asarray(indices, dtype=np.int64)]
+    if drop_degenerate and len(indices):
+        starts = face_starts(counts)
+        repeats = indices == indices[_next_corners(counts, starts)]
+        if repeats.any():
+            faces = _corner_faces(counts)
+            kept_corners = ~repeats
+            counts = np.bincount(faces[kept_corners], minlength=len(counts))
+            kept_corners &= counts[faces] >= 3
+            indices = indices[kept_corners]
+            counts = counts[counts >= 3]
+    return (np.asarray(points)[keep], counts.astype(INDEX_DTYPE),
+            indices.astype(INDEX_DTYPE))
+
+
+def process_mesh(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+                 weld_tolerance: Optional[float] = None,
+                 triangulation: Optional[str] = None,
+                 validate: bool = True) -> MeshArrays:
+    """Validate, then optionally weld and triangulate, ready for an exporter
+
+    Raises ValueError when the input fails validate_mesh(); degenerate
+    faces are tolerated when welding, which removes collapsed ones.
+    """
+    if validate:
+        report = validate_mesh(points, counts, indices)
+        if weld_tolerance is not None:
+            report.degenerate_faces = report.degenerate_faces[:0]
+        report.raise_if_invalid()
+    if weld_tolerance is not None:
+        points, counts, indices = weld(points, counts, indices, weld_tolerance)
+    if triangulation is not None:
+        points, counts, indices = triangulate(points, counts, indices, triangulation)
+    return points, counts, indices
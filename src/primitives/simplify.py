@@ -0,0 +1,251 @@
+"""
+Quadric error metric (QEM) mesh simplification
+Edges are collapsed cheapest-first from a heapq priority queue; quadrics,
+positions and triangles live in flat NumPy arrays, and the edges around a
+merged vertex are re-costed together in one batched solve
+"""
+import heapq
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .basic_shapes import GeometryData
+from .processing import triangulate
+from .vectorized import INDEX_DTYPE, POINT_DTYPE
+
+# Open borders get a perpendicular plane this much heavier than the faces,
+# so the outline of a cone base or a grid edge survives simplification
+BOUNDARY_WEIGHT = 1000.0
+
+# A collapse is rejected when a surviving triangle's normal turns by more
+# than ~80 degrees, which is how folds and flipped faces start
+FLIP_COSINE = 0.2
+
+
+@dataclass
+class SimplifyResult:
+    """Simplified triangle mesh plus what it cost"""
+    geometry: GeometryData
+    source_faces: int
+    collapses: int
+    # Largest quadric error of an accepted collapse (squared distance units)
+    error: float
+
+    @property
+    def ratio(self) -> float:
+        return self.geometry.num_faces / self.source_faces if self.source_faces else 1.0
+
+    def summary(self) -> str:
+        return (f"{self.source_faces} -> {self.geometry.num_faces} faces "
+                f"({self.ratio:.1%}), {self.collapses} collapses, "
+                f"max error {self.error:.3g}")
+
+
+def _plane_quadrics(planes: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """(K, 16) flattened ``weight * p p^T`` for planes ``p = (a, b, c, d)``"""
+    return (weights[:, None, None] * planes[:, :, None] * planes[:, None, :]).reshape(-1, 16)
+
+
+def _accumulate(vertices: np.ndarray, quadrics: np.ndarray, count: int) -> np.ndarray:
+    """Sum per-element quadrics onto their vertices with one bincount per entry"""
+    return np.stack([np.bincount(vertices, weights=quadrics[:, entry], minlength=count)
+                     for entry in range(16)], axis=1)
+
+
+def vertex_quadrics(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """(V, 4, 4) area-weighted plane quadrics, plus border constraint planes"""
+    a, b, c = (points[triangles[:, corner]] for corner in range(3))
+    normals = np.cross(b - a, c - a)
+    doubled = np.linalg.norm(normals, axis=1)
+    unit = np.divide(normals, doubled[:, None], out=np.zeros_like(normals),
+                     where=doubled[:, None] > 0)
+    planes = np.concatenate([unit, -np.einsum("ij,ij->i", unit, a)[:, None]], axis=1)
+    face_q = _plane_quadrics(planes, doubled / 2.0)
+    quadrics = _accumulate(triangles.ravel(), np.repeat(face_q, 3, axis=0), len(points))
+
+    # Border edges are used by exactly one triangle
+    directed = triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    keys = np.sort(directed, axis=1)
+    keys = keys[:, 0] * len(points) + keys[:, 1]
+    _, first, uses = np.unique(keys, return_index=True, return_counts=True)
+    border = first[uses == 1]
+    if len(border):
+        start, end = points[directed[border, 0]], points[directed[border, 1]]
+        edge = end - start
+        perpendicular = np.cross(edge, unit[border // 3])
+        length = np.linalg.norm(perpendicular, axis=1)
+        perpendicular = np.divide(perpendicular, length[:, None],
+                                  out=np.zeros_like(perpendicular),
+                                  where=length[:, None] > 0)
+        planes = np.concatenate(
+            [perpendicular, -np.einsum("ij,ij->i", perpendicular, start)[:, None]], axis=1)
+        border_q = _plane_quadrics(planes, BOUNDARY_WEIGHT * np.einsum("ij,ij->i", edge, edge))
+        quadrics += _accumulate(directed[border].ravel(), np.repeat(border_q, 2, axis=0),
+                                len(points))
+    return quadrics.reshape(-1, 4, 4)
+
+
+def _cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # np.cross costs more in argument handling than in arithmetic on the
+    # handful of rows each collapse touches
+    out = np.empty(u.shape)
+    out[..., 0] = u[..., 1] * v[..., 2] - u[..., 2] * v[..., 1]
+    out[..., 1] = u[..., 2] * v[..., 0] - u[..., 0] * v[..., 2]
+    out[..., 2] = u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+    return out
+
+
+def edge_costs(quadrics: np.ndarray, points: np.ndarray, first: np.ndarray,
+               second: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``(cost, target)`` of collapsing each edge ``first[i] - second[i]``
+
+    The target minimizes the summed quadric where its 3x3 block is well
+    conditioned; otherwise (flat or straight regions) the best of both
+    ends and the midpoint is used.
+    """
+    q = quadrics[first] + quadrics[second]
+    start, end = points[first], points[second]
+    middle = (start + end) / 2.0
+
+    # Cramer's rule on the symmetric 3x3 block, all edges at once
+    rows = q[:, :3, :3]
+    rhs = -q[:, :3, 3]
+    adjugate = np.stack([_cross(rows[:, 1], rows[:, 2]), _cross(rows[:, 2], rows[:, 0]),
+                         _cross(rows[:, 0], rows[:, 1])], axis=1)
+    det = np.einsum("ki,ki->k", rows[:, 0], adjugate[:, 0])
+    scale = np.abs(rows).sum(axis=(1, 2))
+    solvable = np.abs(det) > 1e-9 * scale ** 3
+    solved = np.einsum("kij,ki->kj", adjugate, rhs) / np.where(solvable, det, 1.0)[:, None]
+    # Nearly singular blocks can throw the optimum far off the edge
+    reach = np.einsum("ki,ki->k", end - start, end - start)
+    offset = np.einsum("ki,ki->k", solved - middle, solved - middle)
+    fallback = ~solvable | (offset > 4.0 * reach)
+    solved[fallback] = middle[fallback]
+
+    # v^T A v + 2 b.v + c for every candidate
+    candidates = np.stack([start, end, middle, solved], axis=1)
+    errors = (np.einsum("kmi,kij,kmj->km", candidates, rows, candidates)
+              + 2.0 * np.einsum("kmi,ki->km", candidates, q[:, :3, 3])
+              + q[:, 3, 3][:, None])
+    best = errors.argmin(axis=1)
+    picked = np.arange(len(best))
+    # Round-off can leave tiny negatives on exactly planar neighbourhoods
+    return np.maximum(errors[picked, best], 0.0), candidates[picked, best]
+
+
+def _unique_edges(triangles: np.ndarray, count: int) -> np.ndarray:
+    edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    keys = np.unique(edges[:, 0] * count + edges[:, 1])
+    return np.stack([keys // count, keys % count], axis=1)
+
+
+def _normals(corners: np.ndarray) -> np.ndarray:
+    return _cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+
+def simplify(points: np.ndarray, counts: np.ndarray, indices: np.ndarray,
+             target_faces: Optional[int] = None,
+             max_error: Optional[float] = None) -> SimplifyResult:
+    """Collapse edges until ``target_faces`` remain or the next collapse
+    would cost more than ``max_error``
+
+    Polygons are triangulated first, so the result is a triangle mesh that
+    keeps the input winding. Collapses that would make the surface
+    non-manifold or fold a triangle over are skipped.
+    """
+    if target_faces is None and max_error is None:
+        raise ValueError("simplify() needs a target_faces count or a max_error")
+    points, _, flat = triangulate(points, counts, indices)
+    triangles = np.asarray(flat, dtype=np.int64).reshape(-1, 3)
+    positions = np.asarray(points, dtype=np.float64).reshape(-1, 3).copy()
+    source_faces = len(triangles)
+    target_faces = 0 if target_faces is None else max(int(target_faces), 0)
+
+    quadrics = vertex_quadrics(positions, triangles)
+    face_alive = np.ones(len(triangles), dtype=bool)
+    vertex_alive = np.ones(len(positions), dtype=bool)
+    stamps = [0] * len(positions)
+
+    # Vertex -> triangle sets, built from a CSR layout on first touch
+    order = np.argsort(triangles.ravel(), kind="stable")
+    bounds = np.searchsorted(triangles.ravel()[order], np.arange(len(positions) + 1))
+    star_cache: Dict[int, Set[int]] = {}
+
+    def star(vertex: int) -> Set[int]:
+        faces = star_cache.get(vertex)
+        if faces is None:
+            faces = star_cache[vertex] = set(
+                (order[bounds[vertex]:bounds[vertex + 1]] // 3).tolist())
+        return faces
+
+    def push(vertex: int, neighbours: List[int]):
+        if not neighbours:
+            return
+        others = np.asarray(neighbours)
+        costs, targets = edge_costs(quadrics, positions,
+                                    np.full(len(others), vertex), others)
+        for cost, other, target in zip(costs.tolist(), neighbours, targets.tolist()):
+            heapq.heappush(heap, (cost, vertex, other, stamps[vertex], stamps[other], target))
+
+    edges = _unique_edges(triangles, len(positions))
+    costs, targets = edge_costs(quadrics, positions, edges[:, 0], edges[:, 1])
+    heap = [(cost, a, b, 0, 0, target) for cost, (a, b), target
+            in zip(costs.tolist(), edges.tolist(), targets.tolist())]
+    heapq.heapify(heap)
+
+    faces = source_faces
+    collapses = 0
+    error = 0.0
+    while heap and faces > target_faces:
+        cost, keep, drop, keep_stamp, drop_stamp, target = heapq.heappop(heap)
+        if max_error is not None and cost > max_error:
+            break
+        if (not vertex_alive[keep] or not vertex_alive[drop]
+                or stamps[keep] != keep_stamp or stamps[drop] != drop_stamp):
+            continue  # superseded by a later push
+
+        keep_faces, drop_faces = star(keep), star(drop)
+        shared = keep_faces & drop_faces
+        # Link condition: the ends may only share the opposite corners of
+        # their shared triangles, or the collapse pinches the surface
+        shared_rows = triangles[list(shared)]
+        opposite = set(shared_rows.ravel().tolist()) - {keep, drop}
+        keep_ring = set(triangles[list(keep_faces)].ravel().tolist())
+        drop_ring = set(triangles[list(drop_faces)].ravel().tolist())
+        if (keep_ring & drop_ring) - {keep, drop} != opposite:
+            continue
+
+        moved = list((keep_faces | drop_faces) - shared)
+        rows = triangles[moved]
+        before = _normals(positions[rows])
+        after_positions = positions[rows]
+        after_positions[(rows == keep) | (rows == drop)] = target
+        after = _normals(after_positions)
+        lengths = np.sqrt(np.einsum("ij,ij->i", before, before)
+                          * np.einsum("ij,ij->i", after, after))
+        if np.any(np.einsum("ij,ij->i", before, after) < FLIP_COSINE * lengths):
+            continue
+
+        positions[keep] = target
+        quadrics[keep] += quadrics[drop]
+        vertex_alive[drop] = False
+        stamps[keep] += 1
+        rows[rows == drop] = keep
+        triangles[moved] = rows
+        face_alive[list(shared)] = False
+        for vertex in opposite:
+            star(vertex).difference_update(shared)
+        star_cache[keep] = set(moved)
+        del star_cache[drop]
+        faces -= len(shared)
+        collapses += 1
+        error = max(error, cost)
+        push(keep, sorted(set(rows.ravel().tolist()) - {keep}))
+
+    # Compact the surviving triangles and the points they use
+    triangles = triangles[face_alive]
+    used, remap = np.unique(triangles, return_inverse=True)
+    geometry = GeometryData(positions[used].astype(POINT_DTYPE),
+                            np.full(len(triangles), 3, dtype=INDEX_DTYPE),
+                            remap.astype(INDEX_DTYPE).ravel())
+    return SimplifyResult(geometry, source_faces, collapses, error)
@@ -0,0 +1,103 @@
+"""
+Bounded LRU cache for primitive topology and unit shapes
+Face topology and unit-circle trig depend only on resolution, so repeated
+requests only pay for scaling the cached unit points
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Tuple
+
+import numpy as np
+
+CachedArrays = Tuple[np.ndarray, ...]
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of cache effectiveness and footprint"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TopologyCache:
+    """LRU cache of read-only array tuples bounded by entry count and bytes
+
+    Cached arrays are marked read-only because every caller shares them;
+    copy before mutating. Entries larger than ``max_bytes`` are built and
+    returned but never cached, so they cannot flush everything else.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedArrays]" = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], CachedArrays]) -> CachedArrays:
+        """Return the arrays cached under ``key``, building them on a miss"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        arrays = tuple(build())
+        for array in arrays:
+            array.flags.writeable = False
+        size = sum(array.nbytes for array in arrays)
+
+        if size > self.max_bytes:
+            return arrays
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = arrays
+                self._nbytes += size
+                self._evict()
+            return self._entries.get(key, arrays)
+
+    def _evict(self):
+        while (len(self._entries) > self.max_entries
+               or self._nbytes > self.max_bytes):
+            _, arrays = self._entries.popitem(last=False)
+            self._nbytes -= sum(array.nbytes for array in arrays)
+            self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              len(self._entries), self._nbytes)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+
+TOPOLOGY_CACHE = TopologyCache()
+
+
+def cache_stats() -> CacheStats:
+    """Hit/miss statistics of the shared primitive topology cache"""
+    return TOPOLOGY_CACHE.stats()
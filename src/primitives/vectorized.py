@@ -0,0 +1,533 @@
+"""
+Vectorized primitive generators built on NumPy
+Points, counts and indices are produced as contiguous arrays in one pass
+"""
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+from .topology_cache import TOPOLOGY_CACHE
+
+# (points float32 (N, 3), face_vertex_counts int32, face_vertex_indices int32)
+MeshArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+POINT_DTYPE = np.float32
+INDEX_DTYPE = np.int32
+
+
+def unit_circle(resolution: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine and sine of ``resolution`` evenly spaced angles"""
+    angles = 2.0 * np.pi * np.arange(resolution) / resolution
+    return np.cos(angles), np.sin(angles)
+
+
+def _unit_cone(resolution: int, base: bool) -> Tuple[np.ndarray, ...]:
+    cos, sin = unit_circle(resolution)
+    unit = np.zeros((resolution + 1, 3))
+    unit[:resolution, 0] = cos
+    unit[:resolution, 2] = sin
+    unit[resolution, 1] = 1.0
+
+    ring = np.arange(resolution, dtype=INDEX_DTYPE)
+    sides = np.empty((resolution, 3), dtype=INDEX_DTYPE)
+    sides[:, 0] = ring
+    sides[:, 1] = np.roll(ring, -1)
+    sides[:, 2] = resolution
+
+    counts = np.full(resolution, 3, dtype=INDEX_DTYPE)
+    indices = sides.ravel()
+    if base:
+        counts = np.append(counts, INDEX_DTYPE(resolution))
+        indices = np.concatenate([indices, ring[::-1]])
+    return unit, counts, indices
+
+
+def cone_arrays(resolution: int = 16, height: float = 2.0, radius: float = 1.0,
+                base: bool = True) -> MeshArrays:
+    """Cone with ``resolution`` side triangles and an optional N-gon base
+
+    Topology arrays are shared through the topology cache and read-only.
+    """
+    if resolution < 3:
+        raise ValueError(f"Cone resolution must be at least 3, got {resolution}")
+
+    unit, counts, indices = TOPOLOGY_CACHE.get(
+        ("cone", resolution, base), lambda: _unit_cone(resolution, base))
+    points = (unit * (radius, height, radius)).astype(POINT_DTYPE)
+    return points, counts, indices
+
+
+def _unit_uv_sphere(resolution: int) -> Tuple[np.ndarray, ...]:
+    theta = np.pi * np.arange(resolution + 1) / resolution
+    cos_phi, sin_phi = unit_circle(resolution)
+    sin_theta = np.sin(theta)[:, None]
+
+    unit = np.empty((resolution + 1, resolution, 3))
+    unit[..., 0] = sin_theta * cos_phi
+    unit[..., 1] = np.cos(theta)[:, None]
+    unit[..., 2] = sin_theta * sin_phi
+
+    rows = np.arange(resolution, dtype=INDEX_DTYPE)[:, None] * resolution
+    u = np.arange(resolution, dtype=INDEX_DTYPE)
+    next_u = np.roll(u, -1)
+
+    quads = np.empty((resolution, resolution, 4), dtype=INDEX_DTYPE)
+    quads[..., 0] = rows + u
+    quads[..., 1] = rows + resolution + u
+    quads[..., 2] = rows + resolution + next_u
+    quads[..., 3] = rows + next_u
+
+    counts = np.full(resolution * resolution, 4, dtype=INDEX_DTYPE)
+    return unit.reshape(-1, 3), counts, quads.ravel()
+
+
+def uv_sphere_arrays(resolution: int = 20, radius: float = 1.0) -> MeshArrays:
+    """UV sphere with ``resolution`` rings of ``resolution`` quads"""
+    if resolution < 3:
+        raise ValueError(f"Sphere resolution must be at least 3, got {resolution}")
+
+    unit, counts, indices = TOPOLOGY_CACHE.get(
+        ("uv_sphere", resolution), lambda: _unit_uv_sphere(resolution))
+    return (unit * radius).astype(POINT_DTYPE), counts, indices
+
+
+def _unit_pole_sphere(resolution: int) -> Tuple[np.ndarray, ...]:
+    # Interior rings only; the poles become single vertices 0 and N-1
+    theta = np.pi * np.arange(1, resolution) / resolution
+    cos_phi, sin_phi = unit_circle(resolution)
+    sin_theta = np.sin(theta)[:, None]
+
+    rings = np.empty((resolution - 1, resolution, 3))
+    rings[..., 0] = sin_theta * cos_phi
+    rings[..., 1] = np.cos(theta)[:, None]
+    rings[..., 2] = sin_theta * sin_phi
+    unit = np.concatenate([[(0.0, 1.0, 0.0)], rings.reshape(-1, 3), [(0.0, -1.0, 0.0)]])
+
+    bottom = len(unit) - 1
+    u = np.arange(resolution, dtype=INDEX_DTYPE)
+    next_u = np.roll(u, -1)
+
+    # Same winding as the UV sphere quads with the collapsed pole edge dropped
+    top_fan = np.stack([np.zeros_like(u), 1 + u, 1 + next_u], axis=1)
+    last_ring = 1 + (resolution - 2) * resolution
+    bottom_fan = np.stack([last_ring + u, np.full_like(u, bottom), last_ring + next_u],
+                          axis=1)
+
+    rows = 1 + np.arange(resolution - 2, dtype=INDEX_DTYPE)[:, None] * resolution
+    quads = np.empty((resolution - 2, resolution, 4), dtype=INDEX_DTYPE)
+    quads[..., 0] = rows + u
+    quads[..., 1] = rows + resolution + u
+    quads[..., 2] = rows + resolution + next_u
+    quads[..., 3] = rows + next_u
+
+    counts = np.concatenate([
+        np.full(resolution, 3, dtype=INDEX_DTYPE),
+        np.full(quads.shape[0] * resolution, 4, dtype=INDEX_DTYPE),
+        np.full(resolution, 3, dtype=INDEX_DTYPE),
+    ])
+    indices = np.concatenate([top_fan.ravel(), quads.ravel(), bottom_fan.ravel()])
+    return unit, counts, indices.astype(INDEX_DTYPE)
+
+
+def pole_sphere_arrays(resolution: int = 20, radius: float = 1.0) -> MeshArrays:
+    """UV sphere with single pole vertices and triangle-fan caps
+
+    Same silhouette as uv_sphere_arrays() with ``2 * (resolution - 1)``
+    fewer points and no zero-area faces.
+    """
+    if resolution < 3:
+        raise ValueError(f"Sphere resolution must be at least 3, got {resolution}")
+
+    unit, counts, indices = TOPOLOGY_CACHE.get(
+        ("pole_sphere", resolution), lambda: _unit_pole_sphere(resolution))
+    return (unit * radius).astype(POINT_DTYPE), counts, indices
+
+
+# Icosahedron from the golden ratio, outward counter-clockwise faces
+_PHI = (1.0 + 5.0 ** 0.5) / 2.0
+ICOSAHEDRON_POINTS = np.array([
+    (-1, _PHI, 0), (1, _PHI, 0), (-1, -_PHI, 0), (1, -_PHI, 0),
+    (0, -1, _PHI), (0, 1, _PHI), (0, -1, -_PHI), (0, 1, -_PHI),
+    (_PHI, 0, -1), (_PHI, 0, 1), (-_PHI, 0, -1), (-_PHI, 0, 1),
+])
+ICOSAHEDRON_FACES = np.array([
+    (0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+    (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+    (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+    (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1),
+], dtype=INDEX_DTYPE)
+
+
+def _normalize(points: np.ndarray) -> np.ndarray:
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def _unit_icosphere(subdivisions: int) -> Tuple[np.ndarray, ...]:
+    points = _normalize(ICOSAHEDRON_POINTS.astype(np.float64))
+    faces = ICOSAHEDRON_FACES
+    for _ in range(subdivisions):
+        # One midpoint per unique edge, shared by both adjacent triangles
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        unique_edges, inverse = np.unique(edges, axis=0, return_inverse=True)
+        midpoints = _normalize(points[unique_edges[:, 0]] + points[unique_edges[:, 1]])
+        mid = (len(points) + inverse.reshape(-1)).reshape(-1, 3).astype(INDEX_DTYPE)
+        points = np.concatenate([points, midpoints])
+
+        a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+        ab, bc, ca = mid[:, 0], mid[:, 1], mid[:, 2]
+        faces = np.concatenate([
+            np.stack([a, ab, ca], axis=1),
+            np.stack([b, bc, ab], axis=1),
+            np.stack([c, ca, bc], axis=1),
+            np.stack([ab, bc, ca], axis=1),
+        ])
+
+    # Flip to the clockwise winding our leftHanded meshes use
+    indices = np.ascontiguousarray(faces[:, ::-1]).ravel()
+    counts = np.full(len(faces), 3, dtype=INDEX_DTYPE)
+    return points, counts, indices
+
+
+def icosphere_arrays(subdivisions: int = 2, radius: float = 1.0) -> MeshArrays:
+    """Geodesic sphere: an icosahedron split ``subdivisions`` times
+
+    Has ``10 * 4**subdivisions + 2`` points of near-uniform spacing.
+    """
+    if subdivisions < 0:
+        raise ValueError(f"Icosphere subdivisions must be >= 0, got {subdivisions}")
+
+    unit, counts, indices = TOPOLOGY_CACHE.get(
+        ("icosphere", subdivisions), lambda: _unit_icosphere(subdivisions))
+    return (unit * radius).astype(POINT_DTYPE), counts, indices
+
+
+# (normal, u, v) per cube face with u x v == normal
+_CUBE_FACES = (
+    ((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+    ((-1, 0, 0), (0, 0, 1), (0, 1, 0)),
+    ((0, 1, 0), (0, 0, 1), (1, 0, 0)),
+    ((0, -1, 0), (1, 0, 0), (0, 0, 1)),
+    ((0, 0, 1), (1, 0, 0), (0, 1, 0)),
+    ((0, 0, -1), (0, 1, 0), (1, 0, 0)),
+)
+
+
+def _unit_cube_sphere(resolution: int) -> Tuple[np.ndarray, ...]:
+    side = resolution + 1
+    s, t = np.meshgrid(np.linspace(-1.0, 1.0, side), np.linspace(-1.0, 1.0, side))
+    basis = np.array(_CUBE_FACES, dtype=np.float64)
+    cube = (basis[:, None, 0] + s.reshape(1, -1, 1) * basis[:, None, 1]
+            + t.reshape(1, -1, 1) * basis[:, None, 2]).reshape(-1, 3)
+
+    i, j = np.meshgrid(np.arange(resolution), np.arange(resolution))
+    corner = (j * side + i).ravel()
+    # Clockwise (leftHanded) winding of the outward-facing grid cells
+    quad = np.stack([corner, corner + side, corner + side + 1, corner + 1], axis=1)
+    quads = (quad[None] + (np.arange(6) * side * side)[:, None, None]).reshape(-1, 4)
+
+    # Faces share their border rows exactly, so welding is an exact unique()
+    welded, inverse = np.unique(cube, axis=0, return_inverse=True)
+    quads = inverse.reshape(-1)[quads]
+
+    # Area-preserving cube-to-sphere map; more even than plain normalization
+    x, y, z = welded[:, 0], welded[:, 1], welded[:, 2]
+    x2, y2, z2 = x * x, y * y, z * z
+    unit = np.stack([
+        x * np.sqrt(1 - y2 / 2 - z2 / 2 + y2 * z2 / 3),
+        y * np.sqrt(1 - z2 / 2 - x2 / 2 + z2 * x2 / 3),
+        z * np.sqrt(1 - x2 / 2 - y2 / 2 + x2 * y2 / 3),
+    ], axis=1)
+    counts = np.full(len(quads), 4, dtype=INDEX_DTYPE)
+    return unit, counts, quads.astype(INDEX_DTYPE).ravel()
+
+
+def cube_sphere_arrays(resolution: int = 8, radius: float = 1.0) -> MeshArrays:
+    """Quad sphere: a cube with ``resolution`` x ``resolution`` quads per side"""
+    if resolution < 1:
+        raise ValueError(f"Cube sphere resolution must be at least 1, got {resolution}")
+
+    unit, counts, indices = TOPOLOGY_CACHE.get(
+        ("cube_sphere", resolution), lambda: _unit_cube_sphere(resolution))
+    return (unit * radius).astype(POINT_DTYPE), counts, indices
+
+
+SPHERE_TOPOLOGIES = ("uv", "poles", "ico", "cube")
+
+
+def sphere_arrays(resolution: int = 20, radius: float = 1.0,
+                  topology: str = "uv") -> MeshArrays:
+    """Sphere of any topology with about ``resolution`` edges around the equator
+
+    ``uv`` is the original grid with duplicated pole vertices, ``poles``
+    collapses them into triangle fans, ``ico`` and ``cube`` are the
+    geodesic and quad spheres at comparable edge length.
+    """
+    if topology == "uv":
+        return uv_sphere_arrays(resolution, radius)
+    if topology == "poles":
+        return pole_sphere_arrays(resolution, radius)
+    if topology == "ico":
+        # Level L has 5 * 2**L edges around its equatorial band
+        subdivisions = max(0, int(np.ceil(np.log2(max(resolution, 5) / 5))))
+        return icosphere_arrays(subdivisions, radius)
+    if topology == "cube":
+        return cube_sphere_arrays(max(1, -(-resolution // 4)), radius)
+    raise ValueError(f"Unknown sphere topology {topology!r}; "
+                     f"expected one of {SPHERE_TOPOLOGIES}")
+
+
+# (u, v) -> (x, y, z) with u a (1, columns) row and v a (rows, 1) column of
+# parameters in [0, 1]; results broadcast to the (rows, columns) grid
+SurfaceFunction = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, ...]]
+
+
+def _grid_topology(u_segments: int, v_segments: int, wrap_u: bool, wrap_v: bool,
+                   pole_start: bool, pole_end: bool) -> Tuple[np.ndarray, ...]:
+    # Sample grid ids, then weld: the last column onto the first (u seam),
+    # the last row onto the first (v seam), a whole end row onto one pole
+    columns = u_segments + 1
+    ids = np.arange((v_segments + 1) * columns).reshape(v_segments + 1, columns)
+    if wrap_u:
+        ids[:, -1] = ids[:, 0]
+    if wrap_v:
+        ids[-1] = ids[0]
+    if pole_start:
+        ids[0] = ids[0, 0]
+    if pole_end:
+        ids[-1] = ids[-1, 0]
+    # Welding only ever maps onto lower ids, so a used-mask compacts them in order
+    used = np.zeros(ids.size, dtype=bool)
+    used[ids] = True
+    samples = np.flatnonzero(used)
+    vertex_grid = (np.cumsum(used, dtype=np.int64) - 1)[ids].astype(INDEX_DTYPE)
+
+    # Same corner order as the UV sphere: clockwise seen from the side the
+    # surface faces when u runs around and v runs "down"
+    quads = np.stack([vertex_grid[:-1, :-1], vertex_grid[1:, :-1],
+                      vertex_grid[1:, 1:], vertex_grid[:-1, 1:]], axis=-1).reshape(-1, 4)
+    if min(u_segments, v_segments) == 1:
+        # Tiny grids can weld any corners together: one repeat makes the
+        # quad a triangle, two leave nothing
+        repeated = quads == np.roll(quads, -1, axis=1)
+        kept = repeated.sum(axis=1) < 2
+        counts = (4 - repeated[kept].sum(axis=1)).astype(INDEX_DTYPE)
+        indices = quads[kept][~repeated[kept]]
+    else:
+        # Pole rows lose their collapsed edge: corner 3 at the start, 1 at the end
+        rows = quads.reshape(v_segments, u_segments, 4)
+        first, last = int(pole_start), v_segments - int(pole_end)
+        blocks = [rows[0, :, :3]] if pole_start else []
+        blocks.append(rows[first:last].reshape(-1, 4))
+        if pole_end:
+            blocks.append(rows[-1][:, [0, 2, 3]])
+        counts = np.concatenate([np.full(len(block), block.shape[1], dtype=INDEX_DTYPE)
+                                 for block in blocks])
+        indices = np.concatenate([block.ravel() for block in blocks])
+    return samples, counts, indices.astype(INDEX_DTYPE), vertex_grid
+
+
+def grid_topology(u_segments: int, v_segments: int, wrap_u: bool = False,
+                  wrap_v: bool = False, pole_start: bool = False,
+                  pole_end: bool = False) -> Tuple[np.ndarray, ...]:
+    """``(samples, counts, indices, vertex_grid)`` of a welded parameter grid
+
+    ``samples`` are the flat grid positions the output points come from and
+    ``vertex_grid`` maps every ``(row, column)`` sample to its point, for
+    attaching caps.
+    ``wrap_u``/``wrap_v`` weld the closing seam, ``pole_start``/``pole_end``
+    collapse the first/last row into one point with triangles around it.
+    Shared through the topology cache and read-only.
+    """
+    if u_segments < 1 or v_segments < 1:
+        raise ValueError(f"Grid needs at least one segment per direction, "
+                         f"got {u_segments} x {v_segments}")
+    key = ("grid", u_segments, v_segments, wrap_u, wrap_v, pole_start, pole_end)
+    return TOPOLOGY_CACHE.get(key, lambda: _grid_topology(
+        u_segments, v_segments, wrap_u, wrap_v, pole_start, pole_end))
+
+
+def parametric_arrays(surface: SurfaceFunction, u_segments: int, v_segments: int,
+                      wrap_u: bool = False, wrap_v: bool = False,
+                      pole_start: bool = False, pole_end: bool = False) -> MeshArrays:
+    """Quad grid of ``surface`` evaluated over the whole grid in one call
+
+    Trig and other per-row or per-column terms are computed on the 1-D
+    parameter vectors and broadcast, then welded samples are gathered.
+    Orient ``surface`` so that u runs counter-clockwise seen from outside
+    and v runs "down" (like latitude from the north pole); the quads then
+    get this library's clockwise leftHanded winding.
+    """
+    samples, counts, indices, _ = grid_topology(u_segments, v_segments, wrap_u, wrap_v,
+                                                pole_start, pole_end)
+    u = np.linspace(0.0, 1.0, u_segments + 1)[None, :]
+    v = np.linspace(0.0, 1.0, v_segments + 1)[:, None]
+    shape = (v_segments + 1, u_segments + 1)
+    points = np.empty((shape[0] * shape[1], 3), dtype=POINT_DTYPE)
+    for axis, values in enumerate(surface(u, v)):
+        points[:, axis] = np.broadcast_to(values, shape).ravel()
+    return points[samples], counts, indices
+
+
+def _around(u: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    angle = 2.0 * np.pi * u
+    return np.cos(angle), np.sin(angle)
+
+
+def _ring_caps(vertex_grid: np.ndarray, u_segments: int, top: bool,
+               bottom: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """N-gon caps on the first/last grid rows, wound like the cone base"""
+    rings = []
+    if top:
+        rings.append(vertex_grid[0, :u_segments])
+    if bottom:
+        rings.append(vertex_grid[-1, u_segments - 1::-1])
+    counts = np.full(len(rings), u_segments, dtype=INDEX_DTYPE)
+    indices = np.concatenate(rings) if rings else np.empty(0, dtype=INDEX_DTYPE)
+    return counts, indices
+
+
+def cylinder_arrays(resolution: int = 32, height: float = 2.0, radius: float = 1.0,
+                    rings: int = 1, caps: bool = True, weld_seam: bool = True) -> MeshArrays:
+    """Cylinder standing on y = 0 with ``resolution`` x ``rings`` side quads
+
+    ``caps`` adds N-gon top and bottom faces like the cone base; they need
+    the welded seam.
+    """
+    if resolution < 3 or rings < 1:
+        raise ValueError(f"Cylinder needs resolution >= 3 and rings >= 1, "
+                         f"got {resolution} and {rings}")
+    if caps and not weld_seam:
+        raise ValueError("Cylinder caps need weld_seam=True")
+
+    def surface(u, v):
+        cos, sin = _around(u)
+        return radius * cos, height * (1.0 - v), radius * sin
+
+    points, counts, indices = parametric_arrays(surface, resolution, rings, wrap_u=weld_seam)
+    if caps:
+        vertex_grid = grid_topology(resolution, rings, wrap_u=True)[3]
+        cap_counts, cap_indices = _ring_caps(vertex_grid, resolution, True, True)
+        counts = np.concatenate([counts, cap_counts])
+        indices = np.concatenate([indices, cap_indices])
+    return points, counts, indices
+
+
+def torus_arrays(resolution: int = 32, major_radius: float = 1.0,
+                 minor_radius: float = 0.25, tube_resolution: Optional[int] = None,
+                 weld_seam: bool = True) -> MeshArrays:
+    """Torus around the y axis: ``resolution`` segments around the ring,
+    ``tube_resolution`` (default ``resolution // 2``) around the tube"""
+    tube_resolution = tube_resolution or max(3, resolution // 2)
+    if resolution < 3 or tube_resolution < 3:
+        raise ValueError(f"Torus resolutions must be at least 3, "
+                         f"got {resolution} and {tube_resolution}")
+
+    def surface(u, v):
+        cos, sin = _around(u)
+        tube_cos, tube_sin = _around(v)
+        # v = 0 is the top of the tube, then outward and down like a sphere
+        distance = major_radius + minor_radius * tube_sin
+        return distance * cos, minor_radius * tube_cos, distance * sin
+
+    return parametric_arrays(surface, resolution, tube_resolution,
+                             wrap_u=weld_seam, wrap_v=weld_seam)
+
+
+def capsule_arrays(resolution: int = 32, height: float = 2.0, radius: float = 0.5,
+                   cap_rings: Optional[int] = None, rings: int = 1,
+                   weld_seam: bool = True, collapse_poles: bool = True) -> MeshArrays:
+    """Capsule centred on the origin: a cylinder of ``height`` between two
+    hemispheres of ``cap_rings`` (default ``resolution // 4``) rings each"""
+    cap_rings = cap_rings or max(2, resolution // 4)
+    if resolution < 3 or rings < 1 or cap_rings < 1:
+        raise ValueError(f"Capsule needs resolution >= 3 and at least one ring per "
+                         f"section, got {resolution}, {cap_rings} and {rings}")
+    segments = 2 * cap_rings + rings
+
+    def surface(u, v):
+        cos, sin = _around(u)
+        # Rows 0..cap_rings are the top hemisphere, then the straight side,
+        # then the bottom hemisphere; every section boundary is a grid row
+        row = v * segments
+        top = np.clip(row / cap_rings, 0.0, 1.0)
+        bottom = np.clip((row - cap_rings - rings) / cap_rings, 0.0, 1.0)
+        theta = 0.5 * np.pi * (top + bottom)
+        side = np.clip((row - cap_rings) / rings, 0.0, 1.0)
+        y = height * (0.5 - side) + radius * np.cos(theta)
+        distance = radius * np.sin(theta)
+        return distance * cos, y, distance * sin
+
+    return parametric_arrays(surface, resolution, segments, wrap_u=weld_seam,
+                             pole_start=collapse_poles, pole_end=collapse_poles)
+
+
+def disc_arrays(resolution: int = 32, radius: float = 1.0, rings: int = 1,
+                inner_radius: float = 0.0, weld_seam: bool = True,
+                collapse_center: bool = True) -> MeshArrays:
+    """Flat disc (or annulus with ``inner_radius``) facing +y
+
+    With a collapsed centre the innermost ring is a triangle fan.
+    """
+    if resolution < 3 or rings < 1:
+        raise ValueError(f"Disc needs resolution >= 3 and rings >= 1, "
+                         f"got {resolution} and {rings}")
+    if not 0.0 <= inner_radius < radius:
+        raise ValueError(f"Disc inner radius must be in [0, {radius}), got {inner_radius}")
+
+    def surface(u, v):
+        cos, sin = _around(u)
+        distance = inner_radius + (radius - inner_radius) * v
+        return distance * cos, 0.0, distance * sin
+
+    return parametric_arrays(surface, resolution, rings, wrap_u=weld_seam,
+                             pole_start=collapse_center and inner_radius == 0.0)
+
+
+def plane_arrays(resolution: int = 10, width: float = 2.0, depth: Optional[float] = None,
+                 depth_resolution: Optional[int] = None) -> MeshArrays:
+    """Subdivided plane in XZ centred on the origin, facing +y"""
+    depth = width if depth is None else depth
+    depth_resolution = depth_resolution or resolution
+    if resolution < 1 or depth_resolution < 1:
+        raise ValueError(f"Plane needs at least one segment per side, "
+                         f"got {resolution} x {depth_resolution}")
+
+    def surface(u, v):
+        return width * (u - 0.5), 0.0, depth * (0.5 - v)
+
+    return parametric_arrays(surface, resolution, depth_resolution)
+
+
+# Primitive kind -> generator, shared by the exporters
+GENERATORS = {
+    "cone": cone_arrays,
+    "sphere": sphere_arrays,
+    "cylinder": cylinder_arrays,
+    "torus": torus_arrays,
+    "capsule": capsule_arrays,
+    "disc": disc_arrays,
+    "plane": plane_arrays,
+}
+
+# Primitive kind -> subdivisionScheme every exporter authors for it. None
+# leaves the USD default (catmullClark) on the smooth closed surfaces, as
+# create_sphere always has; faceted kinds are authored as plain polygons
+SUBDIVISION_SCHEMES = {
+    "cone": "none",
+    "sphere": None,
+    "cylinder": "none",
+    "torus": None,
+    "capsule": None,
+    "disc": "none",
+    "plane": "none",
+}
+
+
+def to_vt(points: np.ndarray, counts: np.ndarray, indices: np.ndarray):
+    """Convert mesh arrays to Vt arrays through the buffer protocol"""
+    from pxr import Vt
+
+    return (
+        Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(points, dtype=POINT_DTYPE)),
+        Vt.IntArray.FromNumpy(np.ascontiguousarray(counts, dtype=INDEX_DTYPE)),
+        Vt.IntArray.FromNumpy(np.ascontiguousarray(indices, dtype=INDEX_DTYPE)),
+    )
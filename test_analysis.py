@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Stage analysis checks
+"""
+import math
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.primitives.basic_shapes import GeometryData
+from src.primitives.vectorized import cone_arrays, icosphere_arrays
+
+
+def test_streaming_reports_files_that_vanish_mid_scan():
+    from src.analysis.streaming import iter_summaries
+    from src.exporters.batch import BatchStageWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with BatchStageWriter(Path(tmp) / "cone.usda") as writer:
+            writer.add("cone", GeometryData(*cone_arrays(8)))
+        found, gone = iter_summaries([writer.report.path, Path(tmp) / "gone.usda"], jobs=1)
+    assert "error" not in found and (found["vertices"], found["faces"]) == (9, 9)
+    assert gone["size_bytes"] is None and "No such file" in gone["error"]
+
+
+def test_analysis_cache_rescans_only_changed_files():
+    import os
+    import src.analysis.cache as cache_module
+    from src.exporters.batch import BatchStageWriter
+
+    def write(path, resolution):
+        with BatchStageWriter(path) as writer:
+            writer.add("cone", GeometryData(*cone_arrays(resolution)))
+
+    hashed = []
+    original_sha256 = cache_module.file_sha256
+    cache_module.file_sha256 = lambda path, *args: (hashed.append(Path(path).name)
+                                                    or original_sha256(path, *args))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            files = [Path(tmp) / f"{name}.usda" for name in "abc"]
+            for path in files:
+                write(path, 8)
+            with cache_module.AnalysisCache(Path(tmp) / "cache.sqlite", True) as cache:
+                first = cache.scan(tmp, jobs=1)
+                assert (first.analyzed, first.unchanged) == (3, 0)
+                assert sorted(hashed) == ["a.usda", "b.usda", "c.usda"]
+                hashed.clear()
+                assert cache.scan(tmp, jobs=1).analyzed == 0 and not hashed
+
+                # A file that fails to open is not cached, so every scan retries it
+                broken = Path(tmp) / "broken.usda"
+                broken.write_text("#usda 1.0\n(")
+                for _ in range(2):
+                    retry = cache.scan(tmp, jobs=1)
+                    assert (retry.analyzed, retry.failed, retry.unchanged) == (1, 1, 3)
+                    assert cache.file_stats(broken) is None
+                broken.unlink()
+                hashed.clear()
+
+                # Touched but identical, rewritten, deleted
+                stat = files[0].stat()
+                os.utime(files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                write(files[1], 16)
+                files[2].unlink()
+                rescan = cache.scan(tmp, jobs=1)
+                assert (rescan.analyzed, rescan.unchanged, rescan.removed) == (1, 1, 1)
+                assert sorted(hashed) == ["a.usda", "b.usda"]
+                relative = os.path.relpath(files[1])
+                assert cache.file_stats(relative)["vertices"] == 17
+                assert cache.totals()["files"] == 2
+    finally:
+        cache_module.file_sha256 = original_sha256
+
+
+def test_spatial_index_queries_match_brute_force():
+    from src.analysis.spatial import SpatialIndex
+
+    rng = np.random.default_rng(7)
+    lower = rng.uniform(-50, 50, size=(400, 3))
+    bounds = np.stack([lower, lower + rng.uniform(0.5, 12, size=(400, 3))], axis=1)
+    paths = [f"/World/box_{item}" for item in range(len(bounds))]
+    built = SpatialIndex(paths, bounds, leaf_size=4)
+    with tempfile.TemporaryDirectory() as tmp:
+        loaded = SpatialIndex.load(built.save(Path(tmp) / "index.npz"))
+
+    for index in (built, loaded):
+        for _ in range(20):
+            low = rng.uniform(-60, 40, size=3)
+            high = low + rng.uniform(0, 30, size=3)
+            overlap = (np.all(bounds[:, 0] <= high, axis=1)
+                       & np.all(bounds[:, 1] >= low, axis=1))
+            assert index.query_box(low, high) == [paths[i] for i in np.flatnonzero(overlap)]
+
+            point = rng.uniform(-60, 60, size=3)
+            gap = np.maximum(np.maximum(bounds[:, 0] - point, point - bounds[:, 1]), 0)
+            distances = np.linalg.norm(gap, axis=1)
+            nearest = index.nearest(point, k=5)
+            assert [path for path, _ in nearest] == [paths[i] for i in
+                                                     np.argsort(distances)[:5]]
+            assert np.allclose([d for _, d in nearest], np.sort(distances)[:5])
+
+            direction = rng.normal(size=3)
+            direction /= np.linalg.norm(direction)
+            near = (bounds[:, 0] - point) / direction
+            far = (bounds[:, 1] - point) / direction
+            entry = np.maximum(np.minimum(near, far).max(axis=1), 0)
+            hit = entry <= np.maximum(near, far).min(axis=1)
+            expected = sorted(zip(entry[hit], np.flatnonzero(hit)))
+            ray = index.query_ray(point, direction * 3)
+            assert [path for path, _ in ray] == [paths[i] for _, i in expected]
+            assert np.allclose([d for _, d in ray], [d for d, _ in expected])
+
+
+def test_saved_spatial_index_is_rebuilt_when_a_referenced_layer_changes():
+    import os
+    from pxr import Sdf
+    from src.analysis.spatial import index_path_for, load_or_build_index
+    from src.exporters.batch import BatchStageWriter
+
+    def write_geometry(path, radius):
+        with BatchStageWriter(path) as writer:
+            writer.add("cone", GeometryData(*cone_arrays(8, 1.0, radius)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        geometry, root = Path(tmp) / "geometry.usda", Path(tmp) / "root.usda"
+        write_geometry(geometry, 1.0)
+        layer = Sdf.Layer.CreateNew(str(root))
+        prop = Sdf.CreatePrimInLayer(layer, "/Prop")
+        prop.specifier = Sdf.SpecifierDef
+        prop.referenceList.Prepend(Sdf.Reference("./geometry.usda"))
+        layer.Save()
+
+        first = load_or_build_index(root)
+        saved = index_path_for(root).stat().st_mtime_ns
+        assert load_or_build_index(root).source == first.source
+        assert index_path_for(root).stat().st_mtime_ns == saved
+
+        # Only the referenced layer changes; the root file is untouched
+        write_geometry(geometry, 3.0)
+        stat = geometry.stat()
+        os.utime(geometry, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert np.allclose(load_or_build_index(root).bounds[0][1][[0, 2]], 3.0)
+
+
+def test_crate_buffers_are_read_only_numpy_views():
+    from pxr import Usd, UsdGeom, Vt
+    from src.analysis.buffers import (
+        array_length, face_size_histogram, mesh_bounds, mesh_buffers,
+    )
+    from src.exporters.batch import BatchStageWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with BatchStageWriter(Path(tmp) / "cones.usdc") as writer:
+            writer.add("cone", GeometryData(*cone_arrays(24, 3.0, 0.5)))
+        stage = Usd.Stage.Open(str(writer.report.path))
+        mesh = UsdGeom.Mesh(stage.GetPrimAtPath("/World/cone"))
+        buffers = mesh_buffers(mesh)
+        assert (buffers.num_points, buffers.num_faces) == (25, 25)
+        assert buffers.points.dtype == np.float32 and not buffers.points.flags.writeable
+        assert face_size_histogram(buffers.counts) == {3: 24, 24: 1}
+        assert np.allclose(mesh_bounds(mesh), [[-0.5, 0.0, -0.5], [0.5, 3.0, 0.5]])
+
+    # With a default and time samples authored, the first sample is what is read
+    stage = Usd.Stage.CreateInMemory()
+    animated = UsdGeom.Mesh.Define(stage, "/Animated")
+    animated.GetPointsAttr().Set(Vt.Vec3fArray([(0, 0, 0)]))
+    animated.GetPointsAttr().Set(Vt.Vec3fArray([(1, 1, 1)] * 3), 5.0)
+    assert array_length(animated.GetPointsAttr()) == 3
+    assert mesh_buffers(animated).num_points == 3
+
+
+def test_mesh_statistics_measure_and_merge():
+    from src.analysis.mesh_stats import MeshStatistics, mesh_statistics
+
+    sphere = mesh_statistics(*icosphere_arrays(4, 2.0), orientation="leftHanded")
+    assert np.isclose(sphere.area, 16 * math.pi, rtol=2e-3)
+    assert np.isclose(sphere.volume, 32 / 3 * math.pi, rtol=3e-3)
+    assert (sphere.open_meshes, sphere.boundary_edges) == (0, 0)
+    assert sphere.to_dict()["valence"]["histogram"] == {5: 12, 6: sphere.vertices - 12}
+
+    # Unit right square pyramid, far from the origin, with an open base
+    points = np.array([(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1), (0.5, 1, 0.5)]) + 1e4
+    sides = mesh_statistics(points, [3] * 4, [0, 4, 1, 1, 4, 2, 2, 4, 3, 3, 4, 0])
+    assert sides.open_meshes == 1 and sides.boundary_edges == 4
+    assert np.isclose(sides.area, 4 * 0.5 * math.sqrt(1.25))
+    assert sides.edge_length_min == 1.0 and np.isclose(sides.edge_length_max, math.sqrt(1.5))
+
+    total = MeshStatistics.merge("both", [sphere, sides]).to_dict()
+    assert total["meshes"] == 2 and total["faces"] == sphere.faces + 4
+    assert total["edges"]["length"]["min"] == sphere.edge_length_min
+    assert total["edges"]["length"]["max"] == sides.edge_length_max
+    assert total["bounds"][1] == [1e4 + 1, 1e4 + 1, 1e4 + 1]
+
+
+def test_file_statistics_survive_bad_meshes_and_bound_in_world_space():
+    from src.analysis.mesh_stats import file_statistics, library_statistics
+
+    def mesh(name, counts, indices):
+        return (f'    def Mesh "{name}" {{\n'
+                f"        int[] faceVertexCounts = {counts}\n"
+                f"        int[] faceVertexIndices = {indices}\n"
+                f"        point3f[] points = [(0, 0, 0), (1, 0, 0), (0, 1, 0)]\n"
+                f"    }}\n")
+
+    layer = ('#usda 1.0\ndef Xform "World" {\n'
+             "    double3 xformOp:translate = (10, 0, 0)\n"
+             '    uniform token[] xformOpOrder = ["xformOp:translate"]\n'
+             + mesh("good", [3], [0, 1, 2]) + mesh("out_of_range", [3], [0, 1, 7])
+             + mesh("mismatch", [3, 3], [0, 1, 2]) + "}\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "bad.usda").write_text(layer)
+        stats = file_statistics(Path(tmp) / "bad.usda")
+        report = library_statistics(tmp, jobs=1)
+
+    good, out_of_range, mismatch = stats.meshes
+    assert good.error is None and np.isclose(good.area, 0.5)
+    assert out_of_range.error == "indices out of range: 1"
+    assert mismatch.error == "count mismatch: -3"
+    total = stats.total
+    assert (total.meshes, total.invalid_meshes, total.area) == (3, 2, good.area)
+    # Object space per mesh, world space for the file and its roll-ups
+    assert good.bounds.tolist() == [[0, 0, 0], [1, 1, 0]]
+    assert total.bounds.tolist() == [[10, 0, 0], [11, 1, 0]]
+    assert report["errors"] == 0 and report["total"]["invalid_meshes"] == 2
+    assert report["total"]["bounds"] == [[10, 0, 0], [11, 1, 0]]
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Exporter round-trip checks
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.primitives.basic_shapes import GeometryData
+from src.primitives.vectorized import cone_arrays, sphere_arrays, torus_arrays
+
+
+def _stage_mesh_arrays(stage, path):
+    from pxr import UsdGeom
+    mesh = UsdGeom.Mesh(stage.GetPrimAtPath(path))
+    assert mesh, path
+    return tuple(np.asarray(attr.Get()) for attr in (
+        mesh.GetPointsAttr(), mesh.GetFaceVertexCountsAttr(), mesh.GetFaceVertexIndicesAttr()))
+
+
+def _assert_same_mesh(arrays, geometry):
+    points, counts, indices = arrays
+    assert np.array_equal(points, geometry.points)
+    assert np.array_equal(counts, geometry.face_vertex_counts)
+    assert np.array_equal(indices, geometry.face_vertex_indices)
+
+
+def test_batch_writer_round_trips_every_mesh_and_bounds_the_root():
+    from pxr import Usd, UsdGeom
+    from src.exporters.batch import write_batch
+
+    items = [("cone 8", GeometryData(*cone_arrays(8))),
+             ("sphere", GeometryData(*sphere_arrays(8, 3.0))),
+             ("torus", GeometryData(*torus_arrays(12, 2.0, 0.5)))]
+    with tempfile.TemporaryDirectory() as tmp:
+        for output_format in ("usda", "usdc"):
+            path = write_batch(items, Path(tmp) / "props", output_format=output_format)
+            assert path.name == f"props.{output_format}"
+            stage = Usd.Stage.Open(str(path))
+            # Names become valid prim identifiers
+            assert [prim.GetName() for prim in stage.GetDefaultPrim().GetChildren()] == [
+                "cone_8", "sphere", "torus"]
+            for name, geometry in items:
+                _assert_same_mesh(_stage_mesh_arrays(
+                    stage, f"/World/{name.replace(' ', '_')}"), geometry)
+            hint = UsdGeom.ModelAPI(stage.GetDefaultPrim()).GetExtentsHint()
+            everything = np.concatenate([geometry.points for _, geometry in items])
+            assert np.allclose(hint, [everything.min(axis=0), everything.max(axis=0)])
+
+
+def test_open_batch_writer_does_not_hold_back_other_stages():
+    from pxr import Sdf, Usd
+    from src.exporters.batch import BatchStageWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with BatchStageWriter(Path(tmp) / "props.usda") as writer:
+            writer.add("cone", GeometryData(*cone_arrays(8)))
+            # Sdf.ChangeBlock is thread-global; one left open would delay this edit
+            stage = Usd.Stage.CreateInMemory()
+            Sdf.CreatePrimInLayer(stage.GetRootLayer(), "/Other").specifier = Sdf.SpecifierDef
+            assert stage.GetPrimAtPath("/Other").IsValid()
+        assert Usd.Stage.Open(str(writer.filepath)).GetPrimAtPath("/World/cone")
+
+
+def test_generic_usd_extension_is_kept_and_written_as_crate():
+    from pxr import Sdf
+    from src.exporters.formats import export_layer, resolve_format, resolve_path
+
+    assert resolve_format("usd") == "usdc"
+    assert resolve_path("asset.usd") == Path("asset.usd")
+    assert resolve_path("asset", "usd") == Path("asset.usd")
+    assert resolve_path("asset.usd", "usda") == Path("asset.usda")
+    layer = Sdf.Layer.CreateAnonymous()
+    Sdf.CreatePrimInLayer(layer, "/World").specifier = Sdf.SpecifierDef
+    with tempfile.TemporaryDirectory() as tmp:
+        report = export_layer(layer, Path(tmp) / "asset.usd")
+        assert (report.path.name, report.format) == ("asset.usd", "usdc")
+        assert report.path.read_bytes().startswith(b"PXR-USDC")
+        assert Sdf.Layer.FindOrOpen(str(report.path)).GetPrimAtPath("/World")
+
+
+def test_lod_variants_round_trip_without_repeated_levels():
+    from pxr import Usd, UsdGeom
+    from src.exporters.lod import LOD_VARIANT_SET, author_lod, lod_chain, lod_resolutions
+
+    # 4 and 3 both round to the base icosahedron, so only one of them is kept
+    assert lod_resolutions(64, levels=7) == [64, 32, 16, 8, 4, 3]
+    chain = lod_chain("sphere", lod_resolutions(64, levels=7), topology="ico")
+    assert [geometry.num_points for geometry in chain] == [2562, 642, 162, 42, 12]
+    for levels in (0, -1):
+        try:
+            lod_resolutions(64, levels)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {levels} levels")
+
+    stage = Usd.Stage.CreateInMemory()
+    prim = author_lod(stage, "/Sphere", "sphere", 64, levels=7, topology="ico")
+    assert list(prim.GetCustomDataByKey("lod")["resolutions"]) == [64, 32, 16, 8, 4]
+    variants = prim.GetVariantSets().GetVariantSet(LOD_VARIANT_SET)
+    for level, geometry in enumerate(chain):
+        variants.SetVariantSelection(f"lod{level}")
+        _assert_same_mesh(_stage_mesh_arrays(stage, "/Sphere"), geometry)
+
+    # Spheres keep the USD default scheme and cones author "none", as create_surface does
+    for kind, authored in (("sphere", []), ("cone", ["none"])):
+        for mode in ("variants", "purpose"):
+            lod = author_lod(stage, f"/{kind}_{mode}", kind, 32, mode=mode)
+            for mesh in filter(UsdGeom.Mesh, Usd.PrimRange(lod)):
+                scheme = UsdGeom.Mesh(mesh).GetSubdivisionSchemeAttr()
+                assert [scheme.Get()] * scheme.HasAuthoredValue() == authored, (kind, mode)
+
+
+def test_point_instancer_round_trip_and_rejects_bad_input_untouched():
+    from pxr import Sdf, Usd, UsdGeom
+    from src.exporters.instancer import author_point_instancer, write_point_instancer
+
+    cone = GeometryData(*cone_arrays(8))
+    positions = np.array([(0, 0, 0), (5, 0, 0), (0, 0, 5)], dtype=np.float32)
+    # 90 degrees about +y for the second instance, identity otherwise
+    orientations = np.array([(1, 0, 0, 0), (1, 0, 1, 0), (2, 0, 0, 0)], dtype=np.float64)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = write_point_instancer(Path(tmp) / "scatter.usda", cone, positions,
+                                       orientations, scales=[1.0, 2.0, 0.5])
+        stage = Usd.Stage.Open(str(report.path))
+        instancer = UsdGeom.PointInstancer(stage.GetPrimAtPath("/World/Instancer"))
+        _assert_same_mesh(_stage_mesh_arrays(
+            stage, "/World/Instancer/Prototypes/prototype_0"), cone)
+        assert np.array_equal(np.asarray(instancer.GetPositionsAttr().Get()), positions)
+        assert instancer.GetProtoIndicesAttr().Get() == [0, 0, 0]
+        transforms = instancer.ComputeInstanceTransformsAtTime(
+            Usd.TimeCode.Default(), Usd.TimeCode.Default())
+        # +x turns to -z under a quarter turn about +y, then doubles in scale
+        moved = np.array(transforms[1]).T @ (1, 0, 0, 1)
+        assert np.allclose(moved[:3], (5, 0, -2), atol=1e-2)
+        # The authored extent holds every transformed prototype point
+        homogeneous = np.hstack([cone.points, np.ones((cone.num_points, 1))])
+        placed = np.concatenate([homogeneous @ np.array(matrix) for matrix in transforms])
+        low, high = np.asarray(instancer.GetExtentAttr().Get())
+        assert instancer.GetExtentAttr().HasAuthoredValue()
+        assert np.all(placed[:, :3] >= low - 1e-3) and np.all(placed[:, :3] <= high + 1e-3)
+
+    layer = Sdf.Layer.CreateAnonymous()
+    for bad in ({"orientations": np.zeros((3, 4))},
+                {"orientations": orientations[:2]},
+                {"scales": np.ones((3, 2))}):
+        try:
+            author_point_instancer(layer, "/Instancer", [cone], positions, **bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad}")
+        assert not layer.GetPrimAtPath("/Instancer")
+
+
+def test_dedup_exports_share_one_geometry_layer():
+    from concurrent.futures import ThreadPoolExecutor
+    from pxr import Usd
+    from src.exporters.dedup import write_deduplicated
+
+    small, large = GeometryData(*cone_arrays(8)), GeometryData(*cone_arrays(32))
+    first_items = [("a", small), ("b", small), ("c", large)]
+    second_items = [("d", large), ("e", GeometryData(*cone_arrays(16)))]
+    with tempfile.TemporaryDirectory() as tmp:
+        library = Path(tmp) / "library" / "geometry.usdc"
+        first = write_deduplicated(first_items, Path(tmp) / "first.usda", geometry_path=library)
+        second = write_deduplicated(second_items, Path(tmp) / "second.usda",
+                                    geometry_path=library)
+        assert (first.meshes, first.unique, first.reused) == (3, 2, 0)
+        assert (second.unique, second.reused) == (2, 1)
+        assert second.stored_bytes == second_items[1][1].nbytes
+        for report, items in ((first, first_items), (second, second_items)):
+            stage = Usd.Stage.Open(str(report.interface.path))
+            for name, geometry in items:
+                _assert_same_mesh(_stage_mesh_arrays(stage, f"/World/{name}"), geometry)
+
+        # Nothing new to store: the shared layer is left as it is on disk
+        written = library.stat().st_mtime_ns
+        third = write_deduplicated([("f", small)], Path(tmp) / "third.usda",
+                                   geometry_path=library)
+        assert third.geometry is None and library.stat().st_mtime_ns == written
+
+        # Concurrent exports take turns, so neither loses the other's mesh
+        shared = Path(tmp) / "shared_geometry.usdc"
+        sizes = (40, 48, 56, 64)
+        with ThreadPoolExecutor(len(sizes)) as pool:
+            list(pool.map(lambda size: write_deduplicated(
+                [(f"cone_{size}", GeometryData(*cone_arrays(size)))],
+                Path(tmp) / f"cone_{size}.usda", geometry_path=shared), sizes))
+        for size in sizes:
+            stage = Usd.Stage.Open(str(Path(tmp) / f"cone_{size}.usda"))
+            _assert_same_mesh(_stage_mesh_arrays(stage, f"/World/cone_{size}"),
+                              GeometryData(*cone_arrays(size)))
+
+
+def test_animated_clips_round_trip_every_frame_and_report_each_file():
+    import contextlib
+    import io
+    from pxr import Usd, UsdGeom
+    from create_geometry import TechArtistGeometry
+
+    frames = 10
+    radius = np.concatenate([1.0 + 0.5 * np.sin(np.arange(6)), [2.0] * 4])
+    unit, counts, indices = sphere_arrays(8, 1.0)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        artist = TechArtistGeometry(tmp, output_format="usda")
+        path = artist.create_animated("sphere", frames, resolution=8, name="pulse",
+                                      clip_frames=4, radius=radius)
+        # Three clips, the manifest and the root layer
+        assert [report.path.name for report in artist.reports] == [
+            "pulse.0000.usdc", "pulse.0001.usdc", "pulse.0002.usdc",
+            "pulse.manifest.usda", "pulse.usda"]
+        assert all(report.path.is_file() and report.size_bytes for report in artist.reports)
+        stage = Usd.Stage.Open(str(path))
+        mesh = UsdGeom.Mesh(stage.GetPrimAtPath("/World/Pulse"))
+        assert np.array_equal(np.asarray(mesh.GetFaceVertexCountsAttr().Get()), counts)
+        assert np.array_equal(np.asarray(mesh.GetFaceVertexIndicesAttr().Get()), indices)
+        # Spheres leave subdivisionScheme at the USD default, as create_sphere does
+        assert not mesh.GetSubdivisionSchemeAttr().HasAuthoredValue()
+        for frame in range(frames):
+            points = np.asarray(mesh.GetPointsAttr().Get(1.0 + frame))
+            assert np.allclose(points, unit * radius[frame], atol=1e-5), frame
+
+
+def test_payload_layout_round_trips_and_hints_transformed_bounds():
+    from pxr import Usd, UsdGeom
+    from src.exporters.payload import export_with_payloads
+
+    cone = GeometryData(*cone_arrays(8))
+    stage = Usd.Stage.CreateInMemory()
+    stage.SetDefaultPrim(UsdGeom.Xform.Define(stage, "/World").GetPrim())
+    mesh = UsdGeom.Mesh.Define(stage, "/World/Cone")
+    for attr, value in zip((mesh.GetPointsAttr(), mesh.GetFaceVertexCountsAttr(),
+                            mesh.GetFaceVertexIndicesAttr()), cone.to_vt()):
+        attr.Set(value)
+    mesh.AddTranslateOp().Set((10.0, 0.0, 0.0))
+    with tempfile.TemporaryDirectory() as tmp:
+        report = export_with_payloads(stage.GetRootLayer(), Path(tmp) / "asset.usda")
+        assert [payload.path.name for payload in report.payloads] == ["Cone.usdc"]
+        interface = Usd.Stage.Open(str(report.interface.path), Usd.Stage.LoadNone)
+        hint = np.array(UsdGeom.ModelAPI(interface.GetPrimAtPath("/World/Cone"))
+                        .GetExtentsHint())
+        low, high = cone.points.min(axis=0), cone.points.max(axis=0)
+        assert np.allclose(hint, [low + (10, 0, 0), high + (10, 0, 0)])
+        assert interface.GetPrimAtPath("/World/Cone").GetCustomDataByKey(
+            "geometry") == {"points": cone.num_points, "faces": cone.num_faces}
+
+        interface.Load()
+        _assert_same_mesh(_stage_mesh_arrays(interface, "/World/Cone/Geometry"), cone)
+        world = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_])
+        loaded = world.ComputeWorldBound(interface.GetPrimAtPath("/World/Cone"))
+        assert np.allclose(np.array(loaded.ComputeAlignedRange().GetMin()), hint[0])
+
+
+def test_library_export_authors_the_same_mesh_as_create_surface():
+    import contextlib
+    import io
+    from pxr import Usd, UsdGeom
+    from create_geometry import TechArtistGeometry
+    from src.exporters.parallel import export_library, parameter_grid
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        artist = TechArtistGeometry(tmp, output_format="usda")
+        for kind, params in (("cone", {}), ("torus", {"minor_radius": 0.5}), ("plane", {})):
+            grid = parameter_grid(resolution=[8], **{key: [value] for key, value
+                                                     in params.items()})
+            result = export_library(kind, grid, Path(tmp) / "library", jobs=1,
+                                    output_format="usda", merge=False)
+            library = Usd.Stage.Open(str(result.files[0]))
+            surface = Usd.Stage.Open(str(artist.create_surface(kind, 8, normals=None,
+                                                               **params)))
+            located = ((library, f"/World/{result.names[0]}"),
+                       (surface, f"/World/{kind.title()}"))
+            for first, second in zip(*(_stage_mesh_arrays(*place) for place in located)):
+                assert np.array_equal(first, second), kind
+            schemes = [UsdGeom.Mesh(stage.GetPrimAtPath(path)).GetSubdivisionSchemeAttr()
+                       for stage, path in located]
+            assert [scheme.HasAuthoredValue() for scheme in schemes] == [kind != "torus"] * 2
+            assert schemes[0].Get() == schemes[1].Get(), kind
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Phase timing instrumentation checks
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+def test_profile_trace_nests_phases_and_sums_counters():
+    import json
+    import os
+    from src.instrumentation import Recorder
+
+    assert Recorder().phase("off") is Recorder().phase("other")
+    with tempfile.TemporaryDirectory() as tmp:
+        trace = Path(tmp) / "trace.json"
+        script = ("from create_geometry import TechArtistGeometry\n"
+                  f"artist = TechArtistGeometry({tmp!r}, output_format='usda')\n"
+                  "for resolution in (8, 16): artist.create_cone(resolution=resolution)\n")
+        # The profile setting is read at import, so it needs a fresh interpreter
+        subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent,
+                       env=dict(os.environ, USD_GEOMETRY_PROFILE=str(trace)),
+                       capture_output=True, check=True)
+        events = json.loads(trace.read_text())["traceEvents"]
+
+    cones = [event for event in events if event["name"] == "create_cone"]
+    assert [event["args"]["resolution"] for event in cones] == [8, 16]
+    assert [event["args"]["vertices"] for event in cones] == [9, 17]
+    for name in ("generate", "convert", "author", "save"):
+        inner = [event for event in events if event["name"] == name]
+        assert len(inner) == 2, name
+        for cone, event in zip(cones, inner):
+            assert cone["ts"] <= event["ts"]
+            assert event["ts"] + event["dur"] <= cone["ts"] + cone["dur"] + 1, name
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"✅ {name}")
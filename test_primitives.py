@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Vectorized primitive generator checks
+"""
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from src.primitives.basic_shapes import GeometryData, create_cone
+from src.primitives.derived import extent, face_normals, mesh_normals
+from src.primitives.processing import (
+    concave_faces, process_mesh, triangle_faces, triangulate, validate_mesh, weld, weld_map,
+)
+from src.primitives.simplify import simplify
+from src.primitives.topology_cache import TopologyCache
+from src.primitives.vectorized import (
+    SPHERE_TOPOLOGIES, capsule_arrays, cone_arrays, cylinder_arrays, disc_arrays,
+    icosphere_arrays, plane_arrays, pole_sphere_arrays, sphere_arrays, torus_arrays,
+    uv_sphere_arrays, to_vt,
+)
+
+
+def test_cone_matches_reference():
+    resolution, height, radius = 24, 3.0, 1.5
+    points, counts, indices = cone_arrays(resolution, height, radius)
+
+    expected = [
+        (radius * math.cos(2 * math.pi * i / resolution), 0,
+         radius * math.sin(2 * math.pi * i / resolution))
+        for i in range(resolution)
+    ] + [(0, height, 0)]
+    assert np.allclose(points, expected, atol=1e-6)
+    assert counts.tolist() == [3] * resolution + [resolution]
+    assert indices[:3].tolist() == [0, 1, resolution]
+    assert indices[-resolution:].tolist() == list(reversed(range(resolution)))
+
+
+def test_sphere_matches_reference():
+    resolution, radius = 8, 2.0
+    points, counts, indices = uv_sphere_arrays(resolution, radius)
+
+    assert points.shape == ((resolution + 1) * resolution, 3)
+    assert points.dtype == np.float32
+    assert np.allclose(np.linalg.norm(points, axis=1), radius, atol=1e-5)
+    assert counts.sum() == len(indices) == resolution * resolution * 4
+    # Last quad of the first ring wraps back to u = 0
+    assert indices[4 * (resolution - 1):4 * resolution].tolist() == [
+        resolution - 1, 2 * resolution - 1, resolution, 0
+    ]
+
+
+def test_basic_shapes_cone_wrapper():
+    cone = create_cone(resolution=16)
+    assert cone.num_points == 17
+    assert cone.points[-1].tolist() == [0.0, 2.0, 0.0]
+    assert cone.face_vertex_counts.tolist() == [3] * 16
+
+
+def test_geometry_data_compatible_constructor():
+    geometry = GeometryData([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [3], [0, 1, 2])
+    assert geometry.points.shape == (3, 3)
+    assert geometry.points.dtype == np.float32
+    assert geometry.face_vertex_indices.dtype == np.int32
+    assert not hasattr(geometry, "__dict__")
+
+
+def test_geometry_data_vt_round_trip_shares_memory():
+    cone = create_cone(resolution=32)
+    points, counts, indices = cone.to_vt()
+    restored = GeometryData.from_vt(points, counts, indices)
+    assert restored == cone
+    assert np.shares_memory(restored.points, np.asarray(points))
+
+
+def test_to_vt_round_trip():
+    points, counts, indices = to_vt(*cone_arrays(12))
+    assert len(points) == 13
+    assert list(counts)[-1] == 12
+    assert len(indices) == 12 * 3 + 12
+
+
+def test_topology_cache_reuses_and_evicts():
+    cache = TopologyCache(max_entries=2)
+    build = lambda: (np.arange(4, dtype=np.int32),)
+    first = cache.get("a", build)
+    assert cache.get("a", build) is first
+    assert not first[0].flags.writeable
+    cache.get("b", build)
+    cache.get("c", build)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 3, 1, 2)
+
+    # An entry over max_bytes is returned but neither cached nor evicting others
+    cache = TopologyCache(max_bytes=64)
+    small = cache.get("small", build)
+    large = cache.get("large", lambda: (np.zeros(100, dtype=np.int32),))
+    assert len(large[0]) == 100 and cache.get("small", build) is small
+    stats = cache.stats()
+    assert (stats.evictions, stats.entries, stats.nbytes) == (0, 1, 16)
+
+
+def test_cached_topology_shared_between_radii():
+    small = cone_arrays(40, radius=0.5)
+    large = cone_arrays(40, radius=2.0)
+    assert small[2] is large[2]
+    assert np.allclose(large[0][:, [0, 2]], 4 * small[0][:, [0, 2]])
+
+
+def _signed_volume(points, counts, indices):
+    """Right-handed fan volume; negative for our clockwise (leftHanded) winding"""
+    volume, offset = 0.0, 0
+    for count in counts:
+        face = points[indices[offset:offset + count]].astype(float)
+        offset += count
+        for k in range(1, count - 1):
+            volume += np.dot(face[0], np.cross(face[k], face[k + 1])) / 6
+    return volume
+
+
+def test_pole_sphere_has_single_poles_and_no_degenerate_faces():
+    resolution = 16
+    points, counts, indices = pole_sphere_arrays(resolution)
+    uv_points, _, _ = uv_sphere_arrays(resolution)
+    assert len(points) == len(uv_points) - 2 * (resolution - 1)
+    assert np.sum(np.isclose(points[:, 1], 1.0)) == 1
+    faces = np.split(indices, np.cumsum(counts)[:-1])
+    assert all(len(set(face.tolist())) == len(face) for face in faces)
+
+
+def test_sphere_topologies_are_closed_and_consistently_wound():
+    for topology in SPHERE_TOPOLOGIES[1:]:
+        points, counts, indices = sphere_arrays(16, 2.0, topology)
+        assert np.allclose(np.linalg.norm(points, axis=1), 2.0, atol=1e-5)
+        faces = np.split(indices, np.cumsum(counts)[:-1])
+        edges = {(int(f[k]), int(f[(k + 1) % len(f)])) for f in faces
+                 for k in range(len(f))}
+        assert all((b, a) in edges for a, b in edges), topology
+        assert _signed_volume(points, counts, indices) < 0, topology
+
+
+def test_icosphere_counts():
+    points, counts, _ = icosphere_arrays(3)
+    assert len(points) == 10 * 4 ** 3 + 2
+    assert len(counts) == 20 * 4 ** 3
+
+
+def test_extent_and_normals_point_outward():
+    points, counts, indices = cone_arrays(12, 3.0, 0.5)
+    assert extent(points).tolist() == [[-0.5, 0.0, -0.5], [0.5, 3.0, 0.5]]
+    faceted = face_normals(points, counts, indices)
+    assert len(faceted) == len(counts)
+    assert np.allclose(faceted[-1], (0, -1, 0))
+
+    for topology in SPHERE_TOPOLOGIES:
+        points, counts, indices = sphere_arrays(16, 2.0, topology)
+        normals, interpolation = mesh_normals(points, counts, indices, "smooth")
+        assert interpolation == "vertex"
+        assert np.allclose(np.linalg.norm(normals, axis=1), 1.0, atol=1e-5)
+        assert np.all(np.einsum("ij,ij->i", normals, points) > 0), topology
+
+
+def test_parametric_surfaces_are_welded_closed_and_outward():
+    closed = {
+        "cylinder": (cylinder_arrays(24, 2.0, 1.0, rings=3), 24 * 4),
+        "torus": (torus_arrays(24, 1.0, 0.25), 24 * 12),
+        # 2 * 6 cap rings + 1 side ring = 14 grid rows, the end rows become poles
+        "capsule": (capsule_arrays(24, 2.0, 0.5), 24 * 12 + 2),
+    }
+    for kind, ((points, counts, indices), expected_points) in closed.items():
+        assert len(points) == expected_points, kind
+        faces = np.split(indices, np.cumsum(counts)[:-1])
+        edges = {(int(f[k]), int(f[(k + 1) % len(f)])) for f in faces
+                 for k in range(len(f))}
+        assert all((b, a) in edges for a, b in edges), kind
+        assert _signed_volume(points, counts, indices) < 0, kind
+
+    points, counts, indices = disc_arrays(16, 2.0, rings=3)
+    assert counts.tolist() == [3] * 16 + [4] * 32
+    assert np.allclose(face_normals(points, counts, indices), (0, 1, 0))
+    points, counts, indices = plane_arrays(4, 2.0, 1.0, 2)
+    assert len(points) == 15 and extent(points).tolist() == [[-1, 0, -0.5], [1, 0, 0.5]]
+    assert np.allclose(face_normals(points, counts, indices), (0, 1, 0))
+    # Topology is cached per grid, only the surface is evaluated per call
+    assert torus_arrays(24, 1.0, 0.25)[2] is torus_arrays(24, 3.0, 1.0)[2]
+
+
+# Geometry modules plus the format helpers the scripts import at top level
+GEOMETRY_IMPORTS = ("src.primitives.basic_shapes", "src.primitives.derived",
+                    "src.primitives.vectorized", "src.exporters.formats",
+                    "create_geometry", "analyze_usd", "create_first_cone")
+# Measured ~0.15 s including numpy; pxr.UsdGeom alone adds ~0.2 s
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def test_geometry_imports_without_pxr_within_budget():
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {GEOMETRY_IMPORTS!r}: __import__(name)\n"
+        "print(time.perf_counter() - start)\n"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] == 'pxr'))\n"
+    )
+    # A fresh interpreter, so modules already imported by the test run don't count
+    output = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent,
+                            capture_output=True, text=True, check=True).stdout.split("\n")
+    seconds, pxr_modules = float(output[0]), output[1]
+
+    assert pxr_modules == "[]"
+    assert seconds < IMPORT_BUDGET_SECONDS, f"geometry imports took {seconds:.3f} s"
+
+
+def test_validate_mesh_flags_topology_errors():
+    points, counts, indices = cone_arrays(8)
+    assert validate_mesh(points, counts, indices).ok
+
+    bad_index = indices.copy()
+    bad_index[0] = len(points)
+    assert validate_mesh(points, counts, bad_index).out_of_range.tolist() == [0]
+    assert validate_mesh(points, counts[:-1], indices).count_mismatch == 8
+
+    repeated = indices.copy()
+    repeated[1] = repeated[0]
+    collinear = points.copy()
+    collinear[8] = (points[1] + points[2]) / 2  # apex onto the edge of side 1
+    assert validate_mesh(points, counts, repeated).degenerate_faces.tolist() == [0]
+    assert validate_mesh(collinear, counts, indices).degenerate_faces.tolist() == [1]
+    try:
+        process_mesh(points, counts, bad_index)
+    except ValueError as error:
+        assert "out of range" in str(error)
+    else:
+        raise AssertionError("invalid mesh passed process_mesh()")
+
+
+def test_triangulate_keeps_area_and_winding():
+    # L-shaped hexagon of area 3; a fan from corner 0 spills over reflex corner 2
+    points = np.array([(0, 0, 2), (1, 0, 2), (1, 0, 1), (2, 0, 1), (2, 0, 0), (0, 0, 0)],
+                      dtype=np.float32)
+    counts, indices = np.array([6]), np.arange(6)
+    assert concave_faces(points, counts, indices).tolist() == [0]
+    for method, expected in (("fan", 4.0), ("ear", 3.0), ("auto", 3.0)):
+        _, tri_counts, tri_indices = triangulate(points, counts, indices, method)
+        assert tri_counts.tolist() == [3] * 4
+        doubled = face_normals(points, tri_counts, tri_indices, normalize=False)
+        assert np.isclose(np.linalg.norm(doubled, axis=1).sum() / 2, expected), method
+
+    points, counts, indices = sphere_arrays(12)
+    _, tri_counts, tri_indices = triangulate(points, counts, indices)
+    assert len(tri_counts) == 2 * len(counts)
+    assert triangle_faces(counts).tolist() == np.repeat(np.arange(len(counts)), 2).tolist()
+    original = face_normals(points, counts, indices)
+    split = face_normals(points, tri_counts, tri_indices).reshape(-1, 2, 3)
+    # Pole quads have one zero-length edge, so one of their halves is empty
+    assert np.all(np.einsum("fij,fj->fi", split, original) >= -1e-6)
+
+
+def test_weld_matches_brute_force_and_closes_uv_seams():
+    rng = np.random.default_rng(7)
+    base = rng.random((500, 3))
+    points = np.concatenate([base, base + rng.normal(0.0, 2e-4, base.shape)])
+    remap, keep = weld_map(points, 1e-3)
+    close = np.linalg.norm(points[:, None] - points[None], axis=2) <= 1e-3
+    labels = np.arange(len(points))
+    while True:
+        lowest = np.where(close, labels[None, :], len(points)).min(axis=1)
+        if np.array_equal(lowest, labels):
+            break
+        labels = lowest
+    assert np.array_equal(keep[remap], labels)
+
+    points, counts, indices = uv_sphere_arrays(8)
+    welded, welded_counts, welded_indices = weld(points, counts, indices, 1e-5)
+    # The seam column and the duplicated pole vertices collapse
+    assert len(welded) == 8 * 7 + 2
+    assert sorted(set(welded_counts.tolist())) == [3, 4]
+    assert validate_mesh(welded, welded_counts, welded_indices).ok
+
+
+def test_simplify_reaches_target_and_keeps_surface_closed():
+    points, counts, indices = icosphere_arrays(3)
+    result = simplify(points, counts, indices, target_faces=200)
+    simplified = result.geometry
+    assert simplified.num_faces <= 200 and result.source_faces == len(counts)
+    assert validate_mesh(simplified.points, simplified.face_vertex_counts,
+                         simplified.face_vertex_indices).ok
+    # Closed and manifold: every directed edge has its reverse exactly once
+    triangles = simplified.face_vertex_indices.reshape(-1, 3)
+    edges = triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2).tolist()
+    assert sorted(map(tuple, edges)) == sorted((b, a) for a, b in edges)
+    assert np.allclose(np.linalg.norm(simplified.points, axis=1), 1.0, atol=0.05)
+    assert _signed_volume(simplified.points, simplified.face_vertex_counts,
+                          simplified.face_vertex_indices) < 0
+
+    # An error budget stops early on curved surfaces
+    bounded = simplify(points, counts, indices, max_error=1e-5)
+    assert bounded.error <= 1e-5
+    assert simplified.num_faces < bounded.geometry.num_faces < len(counts)
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"✅ {name}")
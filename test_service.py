@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Job service checks
+"""
+import tempfile
+from pathlib import Path
+
+from src.primitives.basic_shapes import GeometryData
+from src.primitives.vectorized import cone_arrays
+
+
+def test_service_survives_a_client_disconnecting_mid_job():
+    import asyncio
+    import json
+    from src.exporters.batch import BatchStageWriter
+    from usd_service import GeometryService, serve_socket
+
+    async def session(path, requests, answers):
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write("".join(json.dumps(request) + "\n" for request in requests).encode())
+        writer.write_eof()
+        responses = [json.loads(await reader.readline()) for _ in range(answers)]
+        writer.close()
+        return responses
+
+    async def scenario(tmp):
+        with BatchStageWriter(Path(tmp) / "cone.usda") as writer:
+            writer.add("cone", GeometryData(*cone_arrays(8)))
+        jobs = [{"id": n, "op": "analyze", "params": {"path": str(writer.report.path)}}
+                for n in range(4)]
+        address = str(Path(tmp) / "service.sock")
+        service = GeometryService(tmp, processes=1, threads=1)
+        await service.start()
+        server = asyncio.create_task(serve_socket(service, address))
+        try:
+            while not Path(address).exists():
+                await asyncio.sleep(0.01)
+            # Hangs up before any answer: every reply to it fails to write
+            await session(address, jobs, 0)
+            return await asyncio.wait_for(session(address, jobs, len(jobs)), 30)
+        finally:
+            server.cancel()
+            await service.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        responses = asyncio.run(scenario(tmp))
+    assert sorted(response["id"] for response in responses) == [0, 1, 2, 3]
+    assert all(response["ok"] for response in responses)
+
+
+def test_service_authors_in_worker_processes_and_rejects_path_names():
+    import asyncio
+    from usd_service import GeometryService
+
+    async def scenario(output_dir):
+        responses = []
+
+        async def reply(response):
+            responses.append(response)
+
+        service = GeometryService(str(output_dir), processes=1, threads=1)
+        await service.start()
+        try:
+            for number, name in enumerate(("cone_8", "../escaped", "nested/cone", "..")):
+                await service.submit({"id": number, "op": "create_cone",
+                                      "params": {"resolution": 8, "name": name}}, reply)
+            await service.drain()
+        finally:
+            await service.close()
+        return sorted(responses, key=lambda response: response["id"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        responses = asyncio.run(scenario(Path(tmp) / "out"))
+        assert responses[0]["ok"] and Path(responses[0]["result"]["path"]).is_file()
+        assert [response["ok"] for response in responses[1:]] == [False] * 3
+        assert all("single file name" in response["error"] for response in responses[1:])
+        assert sorted(path.name for path in Path(tmp).iterdir()) == ["out"]
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Long-running geometry and analysis job server speaking JSON lines
+
+One request per line, one response per line in completion order:
+    {"id": 1, "op": "create_cone", "params": {"resolution": 32, "name": "c32"}}
+    {"id": 1, "ok": true, "result": {"path": "my_usd_files/c32.usda", ...}}
+
+Authoring ops run on a process pool, analysis ops on a thread pool; at most
+--queue-size jobs wait, so a fast client is slowed to the workers' pace
+instead of growing memory. pxr is imported once per worker, not per job.
+
+Examples:
+    python usd_service.py < jobs.jsonl > results.jsonl
+    python usd_service.py --socket /tmp/usd_service.sock --processes 4
+
+With --call, a one-off CLI invocation hands its job to that warm server
+instead of starting pxr itself (this module imports only the stdlib):
+    python usd_service.py --socket /tmp/usd_service.sock --call create_cone resolution=32
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+AUTHORING_OPS = ("create_cone", "create_sphere", "create_surface", "create_lod",
+                 "create_animated")
+ANALYSIS_OPS = ("analyze", "query")
+CONTROL_OPS = ("ping", "stats")
+
+Reply = Callable[[Dict], Awaitable[None]]
+
+# Per-process TechArtistGeometry, keyed by its settings
+_ARTISTS: Dict[tuple, Any] = {}
+
+# One lock per source file: concurrent queries build and save its index once
+_INDEX_LOCKS: Dict[str, threading.Lock] = {}
+_INDEX_LOCKS_GUARD = threading.Lock()
+
+
+def _warm_worker():
+    """Pool initializer: pay the pxr and plugin start-up cost once per worker"""
+    from pxr import Usd, UsdGeom  # noqa: F401
+    import create_geometry  # noqa: F401
+
+
+def _check_name(name: Any):
+    """Output names become file names under output_dir; no paths allowed"""
+    if (not isinstance(name, str) or name in ("", ".", "..")
+            or os.path.basename(name) != name
+            or (os.altsep is not None and os.altsep in name)):
+        raise ValueError(f"name must be a single file name, got {name!r}")
+
+
+def _author(op: str, params: Dict, settings: Dict) -> Dict:
+    """Process-pool entry point for the TechArtistGeometry create_* methods"""
+    from create_geometry import TechArtistGeometry
+
+    if "name" in params:
+        _check_name(params["name"])
+    key = tuple(sorted(settings.items()))
+    artist = _ARTISTS.get(key)
+    if artist is None:
+        artist = _ARTISTS[key] = TechArtistGeometry(**settings)
+    before = len(artist.reports)
+    start = time.perf_counter()
+    # The create_* methods print progress; stdout may be the response stream
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = getattr(artist, op)(**params)
+    return {
+        "path": str(path),
+        "seconds": time.perf_counter() - start,
+        "files": [{"path": str(report.path), "format": report.format,
+                   "size_bytes": report.size_bytes}
+                  for report in artist.reports[before:]],
+        "pid": os.getpid(),
+    }
+
+
+def _analyze(params: Dict) -> Dict:
+    """Thread-pool entry point: structural summary of one file"""
+    from src.analysis.streaming import summarize_stage
+    return summarize_stage(params["path"], params.get("load_payloads", False),
+                           params.get("mask"), params.get("hierarchy", False))
+
+
+def _index_lock(path: str) -> threading.Lock:
+    with _INDEX_LOCKS_GUARD:
+        return _INDEX_LOCKS.setdefault(os.path.realpath(path), threading.Lock())
+
+
+def _query(params: Dict) -> Dict:
+    """Thread-pool entry point: box / ray / nearest against a file's index"""
+    from src.analysis.spatial import load_or_build_index
+    with _index_lock(params["path"]):
+        index = load_or_build_index(params["path"],
+                                    load_payloads=params.get("load_payloads", True),
+                                    mask=params.get("mask"))
+    result: Dict[str, Any] = {"path": params["path"], "prims": len(index)}
+    if "box" in params:
+        lower, upper = params["box"][:3], params["box"][3:]
+        result["box"] = index.query_box(lower, upper)
+    if "ray" in params:
+        origin, direction = params["ray"][:3], params["ray"][3:]
+        result["ray"] = index.query_ray(origin, direction)
+    if "nearest" in params:
+        result["nearest"] = index.nearest(params["nearest"], params.get("k", 1))
+    return result
+
+
+@dataclass
+class Job:
+    id: Any
+    op: str
+    params: Dict
+    reply: Reply
+    queued_at: float
+
+
+class GeometryService:
+    """Bounded job queue in front of a process pool and a thread pool
+
+    ``submit()`` waits while the queue is full, which is what pushes back on
+    clients: their reader stops consuming input until a worker frees a slot.
+    """
+
+    def __init__(self, output_dir: str = "my_usd_files", output_format: str = "auto",
+                 payloads: bool = False, processes: Optional[int] = None,
+                 threads: int = 4, queue_size: int = 64):
+        self.settings = {"output_dir": output_dir, "output_format": output_format,
+                         "payloads": payloads}
+        self.processes = processes or os.cpu_count() or 1
+        self.threads = threads
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.counts = {"submitted": 0, "succeeded": 0, "failed": 0}
+        self._process_pool: Optional[Executor] = None
+        self._thread_pool: Optional[Executor] = None
+        self._workers = []
+
+    async def start(self):
+        self._process_pool = self._new_process_pool()
+        self._thread_pool = ThreadPoolExecutor(max_workers=self.threads,
+                                               thread_name_prefix="usd-io")
+        # Enough consumers to keep both pools busy, never more jobs in flight
+        self._workers = [asyncio.create_task(self._worker())
+                         for _ in range(self.processes + self.threads)]
+
+    def _new_process_pool(self) -> Executor:
+        # Forking would copy the event loop and the I/O threads into each worker
+        method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                  else "spawn")
+        return ProcessPoolExecutor(max_workers=self.processes, initializer=_warm_worker,
+                                   mp_context=multiprocessing.get_context(method))
+
+    def _replace_process_pool(self, broken: Executor):
+        """Swap in a fresh pool after a worker process died (crash, OOM kill)
+
+        Only the first job to notice replaces it; the others saw the same pool.
+        """
+        if self._process_pool is broken:
+            broken.shutdown(wait=False)
+            self._process_pool = self._new_process_pool()
+
+    async def submit(self, request: Dict, reply: Reply):
+        """Queue one request; waits (backpressure) while the queue is full"""
+        op = request.get("op")
+        job = Job(request.get("id"), op, request.get("params") or {}, reply,
+                  time.perf_counter())
+        if op in CONTROL_OPS:
+            await reply(self._control(job))
+            return
+        if op not in AUTHORING_OPS + ANALYSIS_OPS:
+            await reply({"id": job.id, "ok": False,
+                         "error": f"Unknown op {op!r}; expected one of "
+                                  f"{AUTHORING_OPS + ANALYSIS_OPS + CONTROL_OPS}"})
+            return
+        self.counts["submitted"] += 1
+        await self.queue.put(job)
+
+    def _control(self, job: Job) -> Dict:
+        if job.op == "ping":
+            return {"id": job.id, "ok": True, "result": "pong"}
+        return {"id": job.id, "ok": True,
+                "result": dict(self.counts, queued=self.queue.qsize(),
+                               processes=self.processes, threads=self.threads)}
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            pool = self._process_pool
+            try:
+                if job.op in AUTHORING_OPS:
+                    result = await loop.run_in_executor(
+                        pool, _author, job.op, job.params, self.settings)
+                else:
+                    handler = _analyze if job.op == "analyze" else _query
+                    result = await loop.run_in_executor(self._thread_pool, handler,
+                                                        job.params)
+                response = {"id": job.id, "ok": True, "result": result}
+                self.counts["succeeded"] += 1
+            except Exception as error:  # reported to the client, not fatal
+                if isinstance(error, BrokenProcessPool):
+                    self._replace_process_pool(pool)
+                response = {"id": job.id, "ok": False,
+                            "error": f"{type(error).__name__}: {error}"}
+                self.counts["failed"] += 1
+            response["seconds"] = time.perf_counter() - job.queued_at
+            try:
+                await job.reply(response)
+            except Exception as error:  # the client went away; keep serving the rest
+                print(f"⚠️  Could not answer job {job.id!r}: {type(error).__name__}: {error}",
+                      file=sys.stderr)
+            finally:
+                self.queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued job has been answered"""
+        await self.queue.join()
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._process_pool.shutdown()
+        self._thread_pool.shutdown()
+
+
+def _decode(line: bytes) -> Optional[Dict]:
+    line = line.strip()
+    if not line:
+        return None
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    return request
+
+
+async def _serve_lines(service: GeometryService, readline: Callable[[], Awaitable[bytes]],
+                       write: Callable[[bytes], Awaitable[None]]):
+    """Read requests until EOF, then wait for this client's jobs to finish"""
+    pending = 0
+    finished = asyncio.Event()
+    finished.set()
+
+    async def reply(response: Dict):
+        # Every submitted request is answered exactly once
+        nonlocal pending
+        try:
+            await write((json.dumps(response, default=str) + "\n").encode())
+        finally:
+            pending -= 1
+            if pending == 0:
+                finished.set()
+
+    while True:
+        line = await readline()
+        if not line:
+            break
+        try:
+            request = _decode(line)
+        except ValueError as error:
+            await write((json.dumps({"id": None, "ok": False,
+                                     "error": f"Invalid request: {error}"}) + "\n").encode())
+            continue
+        if request is None:
+            continue
+        pending += 1
+        finished.clear()
+        await service.submit(request, reply)
+    await finished.wait()
+
+
+async def serve_stdio(service: GeometryService):
+    """JSON lines on stdin/stdout; exits once stdin closes and jobs finish"""
+    loop = asyncio.get_running_loop()
+    lock = asyncio.Lock()
+    # A dedicated thread keeps blocking reads off the pools and the event loop
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stdin")
+
+    async def readline() -> bytes:
+        return await loop.run_in_executor(reader, sys.stdin.buffer.readline)
+
+    async def write(data: bytes):
+        async with lock:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+
+    try:
+        await _serve_lines(service, readline, write)
+    finally:
+        reader.shutdown(wait=False)
+
+
+async def serve_socket(service: GeometryService, path: str):
+    """JSON lines over a Unix domain socket, one session per connection"""
+    async def session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+
+        async def write(data: bytes):
+            async with lock:
+                writer.write(data)
+                await writer.drain()
+
+        try:
+            await _serve_lines(service, reader.readline, write)
+        finally:
+            writer.close()
+
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(session, path=path)
+    print(f"🛰️  Listening on {path}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def _parse_value(text: str) -> Any:
+    """JSON where it parses (numbers, lists, true), otherwise the raw string"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def call(path: str, op: str, **params) -> Dict:
+    """Send one request to a running server and return its response"""
+    request = json.dumps({"id": os.getpid(), "op": op, "params": params}) + "\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(request.encode())
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise RuntimeError(f"No response from the server on {path}")
+    return json.loads(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="USD geometry job server (JSON lines)")
+    parser.add_argument("--socket", default=None, metavar="PATH",
+                        help="listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--call", nargs="+", default=None, metavar="OP_OR_KEY=VALUE",
+                        help="OP KEY=VALUE ...: send one job to the server on --socket and print the reply")
+    parser.add_argument("--output-dir", default="my_usd_files")
+    parser.add_argument("--format", default="auto", help="usda/usdc/usdz or auto")
+    parser.add_argument("--payloads", action="store_true",
+                        help="write meshes as payloads under an interface layer")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="authoring processes (default: all cores)")
+    parser.add_argument("--threads", type=int, default=4, help="analysis threads")
+    parser.add_argument("--queue-size", type=int, default=64,
+                        help="jobs allowed to wait before input is throttled")
+    return parser.parse_args(argv)
+
+
+async def run(args) -> int:
+    service = GeometryService(args.output_dir, args.format, args.payloads,
+                              args.processes, args.threads, args.queue_size)
+    await service.start()
+    try:
+        if args.socket:
+            await serve_socket(service, args.socket)
+        else:
+            await serve_stdio(service)
+            await service.drain()
+    finally:
+        await service.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.call:
+        if not args.socket:
+            print("--call needs the --socket of a running server", file=sys.stderr)
+            return 2
+        op, *pairs = args.call
+        params = {}
+        for pair in pairs:
+            key, sep, value = pair.partition("=")
+            if not sep:
+                print(f"Expected KEY=VALUE, got {pair!r}", file=sys.stderr)
+                return 2
+            params[key] = _parse_value(value)
+        response = call(args.socket, op, **params)
+        print(json.dumps(response, default=str))
+        return 0 if response.get("ok") else 1
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())